@@ -0,0 +1,217 @@
+"""Asset manifest: logical asset names -> files, built once and cached as JSON.
+
+Building walks the asset directories (ASSET_DIRS, hidden directories and __pycache__ skipped)
+and the files directly in the project root a single time, so tests/ or a virtualenv are never
+listed. It applies the lookup rules the loaders used to run on every start (case-insensitive
+names, decoration/ before the project root, numbered animation frames, ...) and stores the
+result in .asset_cache/manifest.json together with the mtime of every directory it saw.
+
+On later starts each recorded directory is stat()ed once. If a directory's mtime moved (the
+project root does whenever best_score.txt is rewritten), only that directory is listed again;
+the manifest is rebuilt only when its image/font entries or subdirectories actually changed.
+"""
+import json
+import os
+import re
+
+from atomic_file import atomic_write_text
+
+MANIFEST_VERSION = 3
+CACHE_DIR = ".asset_cache"
+# Directories under the project root that hold assets; the root itself is listed for its files only
+ASSET_DIRS = ("decoration", "dungeonbackground", "cloaked char", "fonts", "sounds", "sound", "audio")
+ASSET_EXTS = (".png", ".jpg", ".jpeg", ".ttf", ".otf", ".wav", ".ogg", ".mp3")
+SKIP_DIRS = {"__pycache__"}
+IMAGE_EXTS = (".png", ".jpg", ".jpeg")
+SOUND_EXTS = (".wav", ".ogg", ".mp3")
+
+# Single images: name -> (directories in priority order, file name matched case-insensitively)
+SINGLE_FILES = {
+    "arrow": (["decoration", ""], "arrow.png"),
+    "gold": (["decoration", ""], "gold.png"),
+    "diamond": (["decoration", ""], "diamondjump.png"),
+    "ground_tile": (["dungeonbackground"], "ground.png"),
+    "bg_far": (["", "decoration"], "bg_far.png"),
+    "bg_mid": (["", "decoration"], "bg_mid.png"),
+    "bg_near": (["", "decoration"], "bg_near.png"),
+    "bg_layer": (["", "decoration"], "background.png"),
+}
+# Name prefixes: name -> (directories, lower-case prefix)
+PREFIXED_IMAGES = {
+    "menu_bg": (["decoration", ""], "mainmenubg"),
+    "background": (["", "decoration"], "background"),
+}
+# 'background (1).png' style user drop-ins; searched in these directories, then in every asset directory
+NEW_BACKGROUND_RE = re.compile(r"^background\s*[\(（]1[\)）]\.(png|jpg|jpeg)$", re.IGNORECASE)
+NEW_BACKGROUND_DIRS = ["", "decoration"]
+TITLE_FONT_DIRS = ["decoration", "fonts", ""]
+TITLE_FONT_NAMES = ["MainMenuTitle.ttf", "Title.ttf", "menu-title.ttf", "Fancy.ttf"]
+# Sound effects: 'sound/<event>' -> <event>.wav/.ogg/.mp3, searched in these directories
+SOUND_DIRS = ["sounds", "sound", "audio", "decoration"]
+SOUND_NAMES = ["jump", "double_jump", "gold", "diamond", "arrow", "death"]
+# Player animations: name -> (directory, file name pattern, frame numbers)
+ANIMATION_FRAMES = {
+    "player/idle": ("cloaked char/idle", "idle_{:05d}.png", range(1, 25)),
+    "player/run": ("cloaked char/run/runloop", "run_{:05d}.png", range(6, 19)),
+    "player/jump": ("cloaked char/jump", "jump_{:05d}.png", range(1, 13)),
+    "player/fall": ("cloaked char/fall", "fall_{:05d}.png", range(12, 25)),
+}
+
+
+def _list_dir(path, root=False):
+    """(asset file names, subdirectory names) of one directory, hidden entries and caches skipped.
+    In the project root only the ASSET_DIRS count as subdirectories."""
+    files, dirs = [], []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.name.startswith(".") or entry.name in SKIP_DIRS:
+                continue
+            if entry.is_dir():
+                if not root or entry.name in ASSET_DIRS:
+                    dirs.append(entry.name)
+            elif entry.name.lower().endswith(ASSET_EXTS):
+                files.append(entry.name)
+    return sorted(files), sorted(dirs)
+
+
+def _png_size(path):
+    """(width, height) from a PNG's IHDR chunk without decoding it, or None."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(24)
+    except OSError:
+        return None
+    if len(head) < 24 or head[:8] != b"\x89PNG\r\n\x1a\n" or head[12:16] != b"IHDR":
+        return None
+    return [int.from_bytes(head[16:20], "big"), int.from_bytes(head[20:24], "big")]
+
+
+class AssetManifest:
+    def __init__(self, root, log=print):
+        self.root = root
+        self._log = log
+        self.path_on_disk = os.path.join(root, CACHE_DIR, "manifest.json")
+        self.dirs = {}
+        self.assets = {}
+        self.rebuilt = False
+        if not self._load():
+            self.build()
+
+    # -- cache -------------------------------------------------------------------------
+    def _abs(self, rel):
+        return os.path.join(self.root, *rel.split("/")) if rel else self.root
+
+    def _load(self):
+        try:
+            with open(self.path_on_disk, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != MANIFEST_VERSION:
+            return False
+        dirs = data.get("dirs", {})
+        refreshed = False
+        for rel, info in dirs.items():
+            try:
+                mtime = os.stat(self._abs(rel)).st_mtime_ns
+            except OSError:
+                return False
+            if mtime == info["mtime"]:
+                continue
+            # the directory changed; it only matters if its asset entries did
+            files, subdirs = _list_dir(self._abs(rel), root=not rel)
+            if files != info["files"] or subdirs != info["dirs"]:
+                return False
+            info["mtime"] = mtime
+            refreshed = True
+        self.dirs = dirs
+        self.assets = data.get("assets", {})
+        if refreshed:
+            self._save()
+        self._log(f"[assets] manifest up to date ({len(dirs)} directories checked)")
+        return True
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path_on_disk), exist_ok=True)
+            atomic_write_text(self.path_on_disk, json.dumps(
+                {"version": MANIFEST_VERSION, "dirs": self.dirs, "assets": self.assets}, indent=1))
+        except OSError as e:
+            self._log(f"[assets] could not write manifest: {e}")
+
+    # -- build -------------------------------------------------------------------------
+    def _entry(self, rel_dir, name):
+        rel = f"{rel_dir}/{name}" if rel_dir else name
+        path = self._abs(rel)
+        entry = {"path": rel, "bytes": os.path.getsize(path)}
+        if name.lower().endswith(".png"):
+            entry["size"] = _png_size(path)
+        return entry
+
+    def _find(self, dirs, match):
+        for rel_dir in dirs:
+            info = self.dirs.get(rel_dir)
+            if info is None:
+                continue
+            for name in info["files"]:
+                if match(name):
+                    return self._entry(rel_dir, name)
+        return None
+
+    def build(self):
+        """Walk the asset directories once and resolve every logical asset name."""
+        # create the cache directory first so the root mtime recorded below already includes it
+        os.makedirs(os.path.dirname(self.path_on_disk), exist_ok=True)
+        self.dirs = {}
+        pending = [""]
+        while pending:
+            rel = pending.pop()
+            try:
+                mtime = os.stat(self._abs(rel)).st_mtime_ns
+                files, subdirs = _list_dir(self._abs(rel), root=not rel)
+            except OSError:
+                continue
+            self.dirs[rel] = {"mtime": mtime, "files": files, "dirs": subdirs}
+            pending.extend(f"{rel}/{d}" if rel else d for d in reversed(subdirs))
+
+        assets = {}
+        for name, (dirs, fname) in SINGLE_FILES.items():
+            assets[name] = self._find(dirs, lambda f, fname=fname: f.lower() == fname)
+        for name, (dirs, prefix) in PREFIXED_IMAGES.items():
+            assets[name] = self._find(dirs, lambda f, p=prefix: f.lower().startswith(p) and f.lower().endswith(IMAGE_EXTS))
+        assets["background_new"] = (self._find(NEW_BACKGROUND_DIRS, NEW_BACKGROUND_RE.match)
+                                    or self._find(sorted(self.dirs), NEW_BACKGROUND_RE.match))
+        assets["title_font"] = None
+        for rel_dir in TITLE_FONT_DIRS:
+            for ttf in TITLE_FONT_NAMES:
+                found = self._find([rel_dir], lambda f, t=ttf.lower(): f.lower() == t)
+                if found:
+                    assets["title_font"] = found
+                    break
+            if assets["title_font"]:
+                break
+        for stem in SOUND_NAMES:
+            names = {stem + ext for ext in SOUND_EXTS}
+            assets["sound/" + stem] = self._find(SOUND_DIRS, lambda f, names=names: f.lower() in names)
+        for name, (rel_dir, pattern, numbers) in ANIMATION_FRAMES.items():
+            present = set(self.dirs.get(rel_dir, {}).get("files", ()))
+            assets[name] = [self._entry(rel_dir, pattern.format(i)) for i in numbers if pattern.format(i) in present]
+        self.assets = assets
+        self.rebuilt = True
+        self._save()
+        found = sum(1 for v in assets.values() if v)
+        self._log(f"[assets] rebuilt manifest: {len(self.dirs)} directories, {found}/{len(assets)} assets found")
+
+    # -- lookups -----------------------------------------------------------------------
+    def path(self, name):
+        """Absolute path of a single asset, or None if it is not present."""
+        entry = self.assets.get(name)
+        return self._abs(entry["path"]) if entry else None
+
+    def paths(self, name):
+        """Absolute paths of a multi-file asset (animation frames), in order."""
+        return [self._abs(e["path"]) for e in self.assets.get(name) or ()]
+
+    def meta(self, name):
+        """Manifest entry (path, bytes, size for PNGs) of a single asset, or None."""
+        return self.assets.get(name)
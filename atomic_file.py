@@ -0,0 +1,12 @@
+"""Crash-safe file writes, shared by the score store and the asset manifest."""
+import os
+
+
+def atomic_write_text(path, text):
+    """Write text to path through a temp file + rename so a crash never leaves a half-written file."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb" if isinstance(text, bytes) else "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
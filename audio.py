@@ -0,0 +1,87 @@
+"""Sound effects, decoded once at start-up and played without stalling the frame.
+
+    audio = AudioEngine(assets)      # loads every sound the manifest found
+    audio.play("gold")               # from collision / jump code, any number of times
+    audio.frame()                    # once per rendered frame
+
+Every event belongs to a category with its own reserved mixer channels, so a burst of coin
+pickups can only cut off older coin sounds, never the jump. play() picks an idle channel of
+the category (or the one that started longest ago), skips an event already triggered this
+frame, and does nothing at all when the mixer or the sound is missing.
+"""
+import pygame
+
+# event -> category
+SOUND_EVENTS = {
+    "jump": "player",
+    "double_jump": "player",
+    "gold": "pickup",
+    "diamond": "pickup",
+    "arrow": "hazard",
+    "death": "player",
+}
+# category -> number of reserved channels
+CHANNELS = {"player": 2, "pickup": 4, "hazard": 2}
+DEFAULT_VOLUME = 0.6
+
+
+class AudioEngine:
+    def __init__(self, assets, volume=DEFAULT_VOLUME, log=print):
+        self.sounds = {}
+        self._channels = {}   # category -> [Channel]
+        self._started = {}    # Channel -> frame it was started on
+        self._played = set()  # events triggered this frame
+        self._frame = 0
+        self.enabled = False
+        paths = {event: assets.path("sound/" + event) for event in SOUND_EVENTS}
+        if not any(paths.values()):
+            log("[audio] no sound files found; audio disabled")
+            return
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+        except pygame.error as e:
+            log(f"[audio] mixer unavailable ({e}); audio disabled")
+            return
+        # reserve the first channels for the categories, in a fixed order
+        total = sum(CHANNELS.values())
+        if pygame.mixer.get_num_channels() < total:
+            pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+        index = 0
+        for category, count in CHANNELS.items():
+            self._channels[category] = [pygame.mixer.Channel(index + i) for i in range(count)]
+            index += count
+        for event, path in paths.items():
+            if path is None:
+                continue
+            try:
+                sound = pygame.mixer.Sound(path)
+            except pygame.error as e:
+                log(f"[audio] could not load {path}: {e}")
+                continue
+            sound.set_volume(volume)
+            self.sounds[event] = sound
+        self.enabled = bool(self.sounds)
+        log(f"[audio] {len(self.sounds)}/{len(SOUND_EVENTS)} sounds loaded, {total} channels reserved")
+
+    def play(self, event):
+        """Start the event's sound on a channel of its category. Never blocks, never loads."""
+        sound = self.sounds.get(event)
+        if sound is None or event in self._played:
+            return
+        self._played.add(event)
+        channels = self._channels[SOUND_EVENTS[event]]
+        for channel in channels:
+            if not channel.get_busy():
+                break
+        else:
+            # all busy: cut off the sound that started longest ago
+            channel = min(channels, key=lambda c: self._started.get(c, -1))
+        channel.play(sound)
+        self._started[channel] = self._frame
+
+    def frame(self):
+        """Call once per rendered frame; re-arms the same-frame throttle."""
+        self._frame += 1
+        self._played.clear()
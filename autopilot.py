@@ -0,0 +1,336 @@
+"""Planning input provider used for unattended soak and performance runs.
+
+decide(session) looks at the same state the renderer sees (a GameSession, with tuning constants
+read from the game module) and returns (jump_pressed, move_dir), exactly what the keyboard
+handler produces, so the game loop treats both inputs the same way.
+"""
+import os
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class Autopilot:
+    """Short-horizon planner. Each tick it rolls the player's own physics forward against the
+    scrolling platforms and the flying arrows for a handful of plans (when to jump, which way
+    to move in the air, when to double jump), commits to the best plan that survives and
+    re-checks it every tick; it only searches again when the plan fails or an arrow appears.
+    """
+
+    JUMP_TICKS = (0, 1, 2, 3, 4, 6, 8, 11, 15, 20, 26, 33, 40)  # ground: ticks until the jump
+    DOUBLE_TICKS = (6, 12, 18, 24)     # ticks after the jump (or from now, in the air)
+    POST_LANDING = 40       # ticks after a landing that are checked for arrows
+    DOUBLE_PENALTY = 150.0  # keep the double jump for when nothing else works
+    HOME_WEIGHT = 0.3       # landing score lost per pixel away from the preferred spot
+
+    def __init__(self, game, home_frac=0.3, horizon=45, arrow_margin=6):
+        self.game = game                  # module with the tuning constants (endlessrunner)
+        self.home_frac = home_frac        # preferred horizontal screen position
+        self.horizon = horizon            # ticks the player must survive without a jump
+        self.arrow_margin = arrow_margin  # pixels added around arrows, for what the model misses
+        self._plan = None                 # (planned at, jump in, ground move, air move, double in, clear ticks)
+        self._arrows = 0
+
+    def decide(self, session):
+        g = self.game
+        s = session
+        w, state = self._world(g, s)
+        new_arrow = len(s.arrows) > self._arrows
+        self._arrows = len(s.arrows)
+        can_jump = state[3] or state[4] > 0
+        move = self._home_move(g, s)
+        if can_jump:
+            # walk to the preferred spot when nothing forces a jump within the horizon
+            if self._rollout(w, state, 0, None, move, move, None, self.horizon)[0] is None:
+                self._plan = None
+                return False, move
+        plan = self._current_plan(s, w, state) if not new_arrow else None
+        if plan is None:
+            plan = self._search(w, state, can_jump, move)
+            self._plan = (s.scheduler.now,) + plan
+        jump_in, move_ground, move_air, double_in, _clear = plan
+        if jump_in == 0:
+            return True, move_air
+        if double_in == 0 and not s.on_ground:
+            return True, move_air
+        return False, move_ground if jump_in is not None else move_air
+
+    # -- planning ------------------------------------------------------------------------
+    def _current_plan(self, s, w, state):
+        """The committed plan, shifted to now, if it still lands safely and stays as clear of
+        arrows after the landing as when it was chosen."""
+        if self._plan is None:
+            return None
+        planned, jump_in, move_ground, move_air, double_in, clear = self._plan
+        elapsed = int(round((s.scheduler.now - planned) * self.game.FPS / 1000.0))
+        if elapsed <= 0:
+            return None  # new run, or nothing happened since
+        if jump_in is not None:
+            jump_in -= elapsed
+            if jump_in < 0:
+                jump_in = None  # the jump happened; what is left is the air part
+        if double_in is not None:
+            double_in -= elapsed
+            if double_in < 0:
+                double_in = None
+        if jump_in is not None and not (state[3] or state[4] > 0):
+            return None  # meant to jump from the ground but we are in the air
+        death, now_clear, _score = self._rollout(w, state, 0, jump_in, move_ground, move_air, double_in,
+                                                 self._limit(jump_in))
+        if death is not None or now_clear < clear:
+            return None
+        return jump_in, move_ground, move_air, double_in, clear
+
+    def _search(self, w, state, can_jump, ground):
+        """Best (jump in, ground move, air move, double in, clear ticks) from state. Plans that
+        land safely come first, then the longest clear of arrows after landing, then the landing
+        score; if none lands, the plan that dies last. Double jumps are only tried when no
+        single jump comes out fully clear.
+        """
+        moves = (1, 0, -1)
+        if can_jump:
+            # the walk up to the jump is shared by every plan with that ground move: simulate it once
+            starts = []
+            for move in (ground,) + tuple(m for m in moves if m != ground):
+                walk = []
+                self._rollout(w, state, 0, None, move, move, None, self.JUMP_TICKS[-1] + 1, walk)
+                starts += [(j, walk[j], move) for j in self.JUMP_TICKS if j < len(walk)]
+        else:
+            starts = [(0, state, m) for m in moves]  # in the air the ground move is the walk after landing
+        best = None
+        best_key = None
+        for doubles in ((None,), self.DOUBLE_TICKS if can_jump else (0,) + self.DOUBLE_TICKS):
+            if doubles[0] is not None and ((best_key[0] and best_key[1] == self.POST_LANDING) or not state[5]):
+                break
+            for t0, start, move_ground in starts:
+                if doubles[0] is not None and can_jump and move_ground != ground:
+                    continue  # doubles only off the preferred walk: they are the slow part
+                jump_in = t0 if can_jump else None
+                for move_air in moves:
+                    for double_in in doubles:
+                        if double_in is not None:
+                            double_in += t0
+                        death, clear, score = self._rollout(w, start, t0, jump_in, move_ground, move_air, double_in,
+                                                            self._limit(jump_in))
+                        key = (1, clear, score) if death is None else (0, death, 0.0)
+                        if best_key is None or key > best_key:
+                            best, best_key = (jump_in, move_ground, move_air, double_in, clear), key
+        if not best_key[0] and can_jump:
+            # nothing lands safely: try walking it out in either direction
+            for move in moves:
+                death, clear, _score = self._rollout(w, state, 0, None, move, move, None, self.horizon)
+                key = (1, -1, 0.0) if death is None else (0, death, 0.0)
+                if key > best_key:
+                    best, best_key = (None, move, move, None, clear), key
+        return best
+
+    def _limit(self, jump_in):
+        return (jump_in or 0) + 4 * self.game.FPS + self.POST_LANDING
+
+    def _world(self, g, s):
+        """(world, player state) for the rollouts, as plain numbers. The world is what stays
+        fixed over a plan: platforms, arrows, scroll, collision box; the state is
+        (x, y, vel_y, on ground, coyote ticks left, double jump ready).
+        """
+        scroll = s.scroll_pps / float(g.FPS)
+        step = 1.0 / g.FPS
+        cx, cy, cw, ch = s.player_collision_rect()
+        reach = (scroll + g.PLAYER_MOVE_SPEED) * 4 * g.FPS
+        segs = [(seg[0], seg[1], seg[2]) for seg in s.ground_segments
+                if seg[0] + seg[2] > cx - g.PLAYER_MOVE_SPEED * g.FPS and seg[0] < cx + reach]
+        m = self.arrow_margin
+        arrows = []
+        for a in s.arrows:
+            aw, ah = a['img'].get_size()
+            arrows.append((a['x'], a['y'], a['vx'] * step, a['vy'] * step, aw // 2 + m, ah // 2 + m, aw + 2 * m, ah + 2 * m))
+        coyote = 0
+        if not s.on_ground and s.scheduler.now <= s.coyote_until:
+            coyote = int((s.coyote_until - s.scheduler.now) * g.FPS / 1000.0) + 1
+        has_double = s.double_jump_available
+        world = (has_double, scroll, segs, arrows, (cx - s.player_x, cy - s.player_y, cw, ch))
+        state = (s.player_x, s.player_y, s.player_vel_y, s.on_ground, coyote, has_double and not s.double_jump_used)
+        return world, state
+
+    def _rollout(self, w, state, t0, jump_in, move_ground, move_air, double_in, limit, walk=None):
+        """Play a plan on the model of the game from `state` at tick t0 (ticks count from now).
+        Returns (tick of death or None, clear ticks, landing score).
+
+        A plan with a jump survives once it has landed; it then walks with move_ground for up
+        to POST_LANDING ticks, and the ticks until an arrow would hit it there are the clear
+        ticks. Walking off the far end is left to the next plan. walk, if given, collects the
+        state before every tick.
+        """
+        g = self.game
+        has_double, scroll, segs, arrows, box = w
+        x, y, vy, on_ground, coyote, double_ok = state
+        dx, dy, cw, ch = box
+        speed = g.PLAYER_MOVE_SPEED
+        right = g.WIDTH - g.player_width
+        jp = g.jump_power
+        grav = g.gravity
+        ph = g.player_height
+        foot = g.player_sprites.ground_foot_offset()
+        coyote_ticks = int(g.COYOTE_MS * g.FPS / 1000.0)
+        home = g.WIDTH * self.home_frac
+        airborne = not on_ground
+        landed_at = None
+        score = 0.0
+        for t in range(t0, limit):
+            if walk is not None:
+                walk.append((x, y, vy, on_ground, coyote, double_ok))
+            # the same presses decide() makes, with the effect GameSession.apply_jump gives them
+            if t == jump_in or (t == double_in and not on_ground):
+                if on_ground or coyote > 0:
+                    vy = jp
+                    on_ground = False
+                    coyote = 0
+                    airborne = True
+                elif double_ok:
+                    vy = jp
+                    double_ok = False
+                    score -= self.DOUBLE_PENALTY
+            if landed_at is not None or (jump_in is not None and t < jump_in):
+                move = move_ground
+            else:
+                move = move_air
+            x += move * speed
+            if x < 0:
+                x = 0
+            elif x > right:
+                x = right
+            vy += grav
+            y += vy
+            off = scroll * (t + 1)
+            cx = x + dx
+            was_on_ground = on_ground
+            on_ground = False
+            if vy >= 0:
+                cy = y + dy
+                bottom = cy + ch
+                for sx, top, sw in segs:
+                    sx -= off
+                    if cx + cw > sx and cx < sx + sw and bottom >= top and cy < top:
+                        y = top - ph + foot
+                        vy = 0
+                        on_ground = True
+                        if airborne and landed_at is None and t != jump_in:
+                            landed_at = t
+                            overlap = min(cx + cw, sx + sw) - max(cx, sx)
+                            runway = sx + sw - cx
+                            score += (min(overlap, cw) + 0.5 * min(runway, 400.0)
+                                      - self.HOME_WEIGHT * abs(cx + cw / 2.0 - home))
+                        break
+            if on_ground:
+                double_ok = has_double
+            elif landed_at is not None:
+                # walked off after landing: the next jump is the next plan's problem, but only
+                # the ticks on the platform count as clear
+                return None, t - landed_at, score
+            elif was_on_ground and vy >= 0:
+                coyote = coyote_ticks
+            elif coyote:
+                coyote -= 1
+            # arrows move before they are tested, as in GameSession.step
+            px, py = int(cx), int(y + dy)
+            n = t + 1
+            for ax, ay, avx, avy, hw, hh, aw, ah in arrows:
+                rx = int(ax + avx * n) - hw
+                ry = int(ay + avy * n) - hh
+                if rx < px + cw and px < rx + aw and ry < py + ch and py < ry + ah:
+                    if landed_at is None:
+                        return t, 0, 0.0
+                    return None, t - landed_at, score
+            if y > g.HEIGHT:
+                return t, 0, 0.0
+            if landed_at is not None and t - landed_at >= self.POST_LANDING:
+                break
+        else:
+            if landed_at is None and (jump_in is not None or airborne):
+                return limit, 0, 0.0  # never came down on anything
+        return None, self.POST_LANDING, score
+
+    # -- where to stand --------------------------------------------------------------------
+    def _home_move(self, g, s):
+        """Move toward the preferred spot (a coin on this platform, else home_frac of the screen)."""
+        cx, _cy, cw, _ch = s.player_collision_rect()
+        center = cx + cw / 2.0
+        target = g.WIDTH * self.home_frac
+        for seg in s.ground_segments:
+            if seg[0] < cx + cw and cx < seg[0] + seg[2]:
+                gold = self._gold_on_path(s, center, seg)
+                if gold is not None:
+                    target = gold
+                break
+        if target > center + g.PLAYER_MOVE_SPEED:
+            return 1
+        if target < center - g.PLAYER_MOVE_SPEED:
+            return -1
+        return 0
+
+    def _gold_on_path(self, s, center, current):
+        """x of a coin reachable without leaving the current platform, if any."""
+        left, right = current[0], current[0] + current[2]
+        for c in s.golds:
+            if left <= c['x'] <= right and abs(c['x'] - center) < 400:
+                return c['x']
+        return None
+
+
+def rss_kb():
+    """Current resident set size in KiB (falls back to the peak where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError, AttributeError):
+        if resource is None:
+            return 0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class SoakMonitor:
+    """Periodic report of frame-time drift, memory and deaths during unattended runs."""
+
+    def __init__(self, interval_s=60.0, log=print, render_stats=None):
+        self.interval_s = interval_s
+        self._log = log
+        # optional callable returning {layer: (drawn, culled)} for the last frame
+        self._render_stats = render_stats
+        self.start = time.perf_counter()
+        self._last_report = self.start
+        self.frames = 0
+        self.deaths = 0
+        self.best = 0
+        self._sum_ms = 0.0
+        self._max_ms = 0.0
+        self.rss_start = rss_kb()
+
+    def frame(self, work_ms):
+        self.frames += 1
+        self._sum_ms += work_ms
+        if work_ms > self._max_ms:
+            self._max_ms = work_ms
+        now = time.perf_counter()
+        if now - self._last_report >= self.interval_s:
+            self.report(now)
+
+    def death(self, final_score):
+        self.deaths += 1
+        self.best = max(self.best, final_score)
+
+    def report(self, now=None):
+        now = time.perf_counter() if now is None else now
+        window = max(1, self.frames)
+        rss = rss_kb()
+        self._log(f"[soak] {(now - self.start) / 60.0:.1f} min: avg frame {self._sum_ms / window:.2f} ms, "
+                  f"max {self._max_ms:.2f} ms, rss {rss} KiB ({rss - self.rss_start:+d}), "
+                  f"deaths {self.deaths}, best {self.best}")
+        if self._render_stats is not None:
+            layers = ", ".join(f"{name} {d}/{c}" for name, (d, c) in self._render_stats().items())
+            self._log(f"[soak] render drawn/culled: {layers}")
+        self._last_report = now
+        self.frames = 0
+        self._sum_ms = 0.0
+        self._max_ms = 0.0
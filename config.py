@@ -0,0 +1,64 @@
+"""Tuning profiles loaded from a JSON file, with hot reload.
+
+The file maps profile names to {constant: value} tables. Every profile except "default"
+starts from "default" (or from the profile named in its "extends" key) and overrides some
+of its values. poll() looks at the file's mtime at most every check_every_s seconds and
+returns only the constants whose value changed, so the game can apply them between frames
+and rebuild just what depends on them.
+"""
+import json
+import os
+import time
+
+DEFAULT_PROFILE = "default"
+
+
+class ConfigProfiles:
+    def __init__(self, path, profile=DEFAULT_PROFILE, check_every_s=1.0, log=print):
+        self.path = path
+        self.profile = profile
+        self.check_every_s = check_every_s
+        self._log = log
+        self.values = {}
+        self._mtime = None
+        self._next_check = 0.0
+        self.reload()
+
+    def _resolve(self, data, name, chain=()):
+        if name in chain:
+            raise ValueError(f"profile inheritance loop: {' -> '.join(chain + (name,))}")
+        if name not in data:
+            raise KeyError(f"no profile named {name!r} (have: {', '.join(sorted(data))})")
+        table = dict(data[name])
+        parent = table.pop("extends", None if name == DEFAULT_PROFILE else DEFAULT_PROFILE)
+        values = self._resolve(data, parent, chain + (name,)) if parent else {}
+        values.update(table)
+        return values
+
+    def reload(self):
+        """Re-read the file; returns {name: value} of the constants that changed ({} on error)."""
+        try:
+            self._mtime = os.stat(self.path).st_mtime_ns
+            with open(self.path, "r", encoding="utf-8") as f:
+                values = self._resolve(json.load(f), self.profile)
+        except (OSError, ValueError, KeyError) as e:
+            # keep running on the last good values; a half-saved file is common while editing
+            self._log(f"[config] {self.path}: {e}")
+            return {}
+        changed = {k: v for k, v in values.items() if self.values.get(k, object()) != v}
+        self.values = values
+        return changed
+
+    def poll(self):
+        """Cheap per-frame check; reloads only when the file was modified."""
+        now = time.perf_counter()
+        if now < self._next_check:
+            return {}
+        self._next_check = now + self.check_every_s
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return {}
+        if mtime == self._mtime:
+            return {}
+        return self.reload()
@@ -0,0 +1,90 @@
+"""Difficulty ramp from tabulated curves.
+
+Each curve maps score (or elapsed seconds) to a multiplier of one tuning constant, given as
+piecewise-linear control points in the config file:
+
+    "DIFFICULTY_RAMP": {
+        "GROUND_SCROLL_PPS": [[0, 1.0], [120, 1.35]],
+        "GOLD_SPAWN_MAX_MS": {"by": "seconds", "points": [[0, 1.0], [300, 0.6]]}
+    }
+
+The curves are sampled once per whole score point / second into flat tables, so looking up
+the current values is a list index; past the last point the last value holds. The game reads
+them when the score changes, never per tick.
+
+    python difficulty.py [profile] [--config FILE]   # print the ramp of a profile
+"""
+
+AXES = ("score", "seconds")
+
+
+def _sample(points, length):
+    """Linear interpolation of sorted (x, y) points at x = 0..length-1."""
+    table = []
+    i = 0
+    for x in range(length):
+        while i + 1 < len(points) and points[i + 1][0] <= x:
+            i += 1
+        x0, y0 = points[i]
+        if x <= x0 or i + 1 == len(points):
+            table.append(float(y0))
+            continue
+        x1, y1 = points[i + 1]
+        table.append(y0 + (y1 - y0) * (x - x0) / float(x1 - x0))
+    return table
+
+
+class DifficultyRamp:
+    def __init__(self, curves):
+        self.curves = {}  # name -> (axis index, table of multipliers)
+        for name, spec in (curves or {}).items():
+            if isinstance(spec, dict):
+                axis, points = spec.get("by", "score"), spec["points"]
+            else:
+                axis, points = "score", spec
+            if axis not in AXES:
+                raise ValueError(f"{name}: 'by' must be one of {AXES}, not {axis!r}")
+            points = sorted((int(x), float(y)) for x, y in points)
+            if not points:
+                raise ValueError(f"{name}: curve has no points")
+            if not all(y > 0 for _x, y in points):
+                raise ValueError(f"{name}: multipliers must be greater than 0")
+            self.curves[name] = (AXES.index(axis), _sample(points, max(0, points[-1][0]) + 1))
+
+    def factor(self, name, score, seconds):
+        """Multiplier for `name` at this score / elapsed time (1.0 without a curve)."""
+        curve = self.curves.get(name)
+        if curve is None:
+            return 1.0
+        axis, table = curve
+        at = int(score if axis == 0 else seconds)
+        return table[min(max(at, 0), len(table) - 1)]
+
+    def value(self, name, base, score, seconds):
+        """base scaled by the curve, keeping ints as ints."""
+        scaled = base * self.factor(name, score, seconds)
+        return int(round(scaled)) if isinstance(base, int) else scaled
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    from config import ConfigProfiles
+
+    parser = argparse.ArgumentParser(description="Print a profile's difficulty ramp")
+    parser.add_argument("profile", nargs="?", default="default")
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles.json"))
+    parser.add_argument("--step", type=int, default=20, help="score / seconds between rows")
+    args = parser.parse_args()
+    values = ConfigProfiles(args.config, args.profile).values
+    ramp = DifficultyRamp(values.get("DIFFICULTY_RAMP"))
+    names = sorted(ramp.curves)
+    last = max((len(t) for _a, t in ramp.curves.values()), default=1)
+    print("at     " + "  ".join(f"{n:>20}" for n in names))
+    for at in range(0, last + args.step, args.step):
+        cells = []
+        for n in names:
+            base = values.get(n, 1.0)
+            cells.append(f"{ramp.value(n, base, at, at):>20}")
+        print(f"{at:<6} " + "  ".join(cells))
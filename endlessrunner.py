@@ -1,24 +1,49 @@
 # Step 1: Basic Pygame window and main loop
 
-import pygame
+from startup_profile import StartupProfiler
+# Start-up phase timings (printed with --startup-profile)
+startup = StartupProfiler()
+
+with startup.phase("import pygame"):
+    import pygame
 import sys
+import argparse
 import random
 import os
 import math
-import re
-
-# Initialize Pygame
-pygame.init()
-
-# Set up display
-# Increased resolution
+import contextlib
+from collections import deque, namedtuple
+from scheduler import TimerScheduler
+from score_store import ScoreStore
+from pacing import FramePacer
+from input_system import InputState
+from difficulty import DifficultyRamp
+from asset_manifest import AssetManifest
+from surfaces import normalize
+from ghost import GhostPlayer, GhostRecorder
+from audio import AudioEngine
+from particles import ParticleSystem
+
+# Display size (increased resolution); pygame and the window are started by setup()
 WIDTH, HEIGHT = 1920, 1080
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Endless Runner")
+screen = None
 
 # Set up clock
 clock = pygame.time.Clock()
 FPS = 60
+# Fixed simulation tick (physics constants are tuned per 60 Hz tick)
+SIM_STEP_MS = 1000.0 / 60
+# After a longer stall, drop the backlog instead of running more ticks than this in one frame
+MAX_SIM_STEPS_PER_FRAME = 5
+
+# Adaptive quality under sustained overload; each level keeps the reductions of the ones before it
+QUALITY_LEVELS = ["full", "no_parallax", "no_outline"]
+QUALITY_NO_PARALLAX = 1
+QUALITY_NO_OUTLINE = 2
+pacer = None  # FramePacer, created with the window
+
+# Where every asset lives; one stat per asset directory instead of scanning them in each loader
+assets = None
 
 # Utility: scale an image to cover the target area while maintaining aspect ratio
 def _scale_image_cover(img, target_w, target_h):
@@ -40,9 +65,6 @@ def _scale_image_cover(img, target_w, target_h):
 class PlayerSprites:
     def __init__(self):
         self.animations = {}
-        self.current_animation = 'idle'
-        self.frame_index = 0
-        self.animation_speed = 0.15
         # Per-frame foot baseline storage (transparent pixels below feet)
         self.frame_foot = {}
         # Baseline used when standing on ground (stable across frames)
@@ -54,100 +76,156 @@ class PlayerSprites:
         self.load_sprites()
     
     def load_sprites(self):
-        # Load idle animation - Increase character size further
-        self.animations['idle'] = []
-        self.frame_foot['idle'] = []
-        for i in range(1, 25):  # idle_00001.png to idle_00024.png
-            try:
-                img = pygame.image.load(f"cloaked char/idle/idle_{i:05d}.png").convert_alpha()
-                img = pygame.transform.scale(img, (150, 200))  # Larger size
-                # Compute bottom transparent pixels to estimate foot baseline
-                bbox = img.get_bounding_rect(min_alpha=1)
-                bottom_transparent = img.get_height() - (bbox.y + bbox.height)
-                self.animations['idle'].append(img)
-                self.frame_foot['idle'].append(bottom_transparent)
-            except:
-                pass
-        
-        # Load run animation
-        self.animations['run'] = []
-        self.frame_foot['run'] = []
-        for i in range(6, 19):  # run_00006.png to run_00018.png
-            try:
-                img = pygame.image.load(f"cloaked char/run/runloop/run_{i:05d}.png").convert_alpha()
-                img = pygame.transform.scale(img, (150, 200))  # Larger size
-                bbox = img.get_bounding_rect(min_alpha=1)
-                bottom_transparent = img.get_height() - (bbox.y + bbox.height)
-                self.animations['run'].append(img)
-                self.frame_foot['run'].append(bottom_transparent)
-            except:
-                pass
+        for name in ('idle', 'run', 'jump', 'fall'):
+            self.load_animation(name)
         # Establish a stable ground baseline using the max across run frames
         if self.frame_foot.get('run'):
             self.run_foot_baseline = max(self.frame_foot['run'])
         else:
             self.run_foot_baseline = 14
-        
-        # Load jump animation
-        self.animations['jump'] = []
-        self.frame_foot['jump'] = []
-        for i in range(1, 13):  # jump_00001.png to jump_00012.png
-            try:
-                img = pygame.image.load(f"cloaked char/jump/jump_{i:05d}.png").convert_alpha()
-                img = pygame.transform.scale(img, (150, 200))  # Larger size
-                bbox = img.get_bounding_rect(min_alpha=1)
-                bottom_transparent = img.get_height() - (bbox.y + bbox.height)
-                self.animations['jump'].append(img)
-                self.frame_foot['jump'].append(bottom_transparent)
-            except:
-                pass
-        
-        # Load fall animation
-        self.animations['fall'] = []
-        self.frame_foot['fall'] = []
-        for i in range(12, 25):  # fall_00012.png to fall_00024.png
+
+    def load_animation(self, name):
+        """Load the frames listed for player/<name> in the asset manifest."""
+        self.animations[name] = []
+        self.frame_foot[name] = []
+        for path in assets.paths('player/' + name):
             try:
-                img = pygame.image.load(f"cloaked char/fall/fall_{i:05d}.png").convert_alpha()
+                img = pygame.image.load(path).convert_alpha()
                 img = pygame.transform.scale(img, (150, 200))  # Larger size
+                # Compute bottom transparent pixels to estimate foot baseline
                 bbox = img.get_bounding_rect(min_alpha=1)
                 bottom_transparent = img.get_height() - (bbox.y + bbox.height)
-                self.animations['fall'].append(img)
-                self.frame_foot['fall'].append(bottom_transparent)
-            except:
+                self.animations[name].append(normalize(img, f"player/{name}[{len(self.animations[name]):02d}]"))
+                self.frame_foot[name].append(bottom_transparent)
+            except Exception:
                 pass
 
     def ground_foot_offset(self):
         # Use a stable baseline (run animation) plus a small base tweak
         base = self.run_foot_baseline if self.run_foot_baseline is not None else 14
         return int(base + self.foot_offset_base)
+
+    def draw_shift(self, foot):
+        """Pixels to draw a frame lower so its own feet (foot = its frame_foot) sit where the
+        physics puts the stable baseline, instead of sinking into the platform."""
+        base = self.run_foot_baseline if self.run_foot_baseline is not None else 14
+        return self.draw_offset_down + foot - base
     
-    def set_animation(self, animation_name):
-        if animation_name != self.current_animation and animation_name in self.animations:
+
+# Animation clips: playback is driven by simulation time, so it looks the same at any render rate.
+# ANIM_FRAME_MS matches the old 0.15 frames per 60 Hz tick; a clip may list per-frame durations instead.
+ANIM_FRAME_MS = 1000.0 / 60 / 0.15
+ANIM_CLIPS = {
+    'idle': {'frame_ms': ANIM_FRAME_MS, 'loop': True},
+    'run': {'frame_ms': ANIM_FRAME_MS, 'loop': True},
+    'jump': {'frame_ms': ANIM_FRAME_MS, 'loop': True},
+    'fall': {'frame_ms': ANIM_FRAME_MS, 'loop': True},
+}
+# Declared transitions: state -> [(condition, next state)], checked in order, first match wins
+ANIM_CONDITIONS = {
+    'rising': lambda vel_y, on_ground: vel_y < -2,
+    'falling': lambda vel_y, on_ground: vel_y > 2,
+    'grounded': lambda vel_y, on_ground: on_ground and -2 <= vel_y <= 2,
+    'hovering': lambda vel_y, on_ground: not on_ground and -2 <= vel_y <= 2,
+}
+ANIM_TRANSITIONS = {
+    'idle': [('rising', 'jump'), ('falling', 'fall'), ('grounded', 'run')],
+    'run': [('rising', 'jump'), ('falling', 'fall'), ('hovering', 'idle')],
+    'jump': [('falling', 'fall'), ('grounded', 'run'), ('hovering', 'idle')],
+    'fall': [('rising', 'jump'), ('grounded', 'run'), ('hovering', 'idle')],
+}
+
+class AnimationClip:
+    """Frames of one animation with a precomputed millisecond -> frame index table."""
+    def __init__(self, frames, feet, durations_ms, loop=True):
+        self.frames = frames
+        self.feet = feet
+        self.loop = loop
+        # one entry per whole millisecond of the clip, so a lookup is a single index
+        self._index = []
+        for i, ms in enumerate(durations_ms):
+            self._index.extend([i] * max(1, int(round(ms))))
+        self.length_ms = len(self._index)
+
+    def index_at(self, t_ms):
+        t = int(t_ms)
+        if self.loop:
+            t %= self.length_ms
+        elif t >= self.length_ms:
+            t = self.length_ms - 1
+        return self._index[max(0, t)]
+
+    def frame_at(self, t_ms):
+        """(frame, frame_foot baseline) shown t_ms into the clip."""
+        i = self.index_at(t_ms)
+        return self.frames[i], self.feet[i]
+
+def build_player_clips(sprites, specs=ANIM_CLIPS):
+    """Clips for every loaded animation; durations come from specs (per-frame list or one frame_ms)."""
+    clips = {}
+    for name, frames in sprites.animations.items():
+        if not frames:
+            continue
+        spec = specs.get(name, {})
+        durations = spec.get('durations') or [spec.get('frame_ms', ANIM_FRAME_MS)] * len(frames)
+        clips[name] = AnimationClip(frames, sprites.frame_foot.get(name, [0] * len(frames)),
+                                    durations, spec.get('loop', True))
+    return clips
+
+class PlayerAnimation:
+    """Animation state of one player: current clip and the simulation time it started.
+    Frames are shared through the clips; nothing advances per frame, the frame shown is
+    looked up from the elapsed time when the player is drawn.
+    """
+    def __init__(self, clips, transitions=ANIM_TRANSITIONS):
+        self.clips = clips
+        self.transitions = transitions
+        self.current_animation = 'idle'
+        self.started_ms = 0.0
+
+    def set_animation(self, animation_name, now_ms):
+        if animation_name != self.current_animation and animation_name in self.clips:
             self.current_animation = animation_name
-            self.frame_index = 0
-    
-    def update(self):
-        if self.current_animation in self.animations and len(self.animations[self.current_animation]) > 0:
-            self.frame_index += self.animation_speed
-            if self.frame_index >= len(self.animations[self.current_animation]):
-                self.frame_index = 0
-    
-    def get_current_sprite(self):
-        if self.current_animation in self.animations and len(self.animations[self.current_animation]) > 0:
-            return self.animations[self.current_animation][int(self.frame_index)]
-        return None
+            self.started_ms = now_ms
 
-# Initialize player sprites
-player_sprites = PlayerSprites()
+    def reset(self, now_ms=0.0):
+        self.current_animation = 'idle'
+        self.started_ms = now_ms
+
+    def update(self, vel_y, on_ground, now_ms):
+        """Follow the first declared transition out of the current state whose condition holds."""
+        for cond, target in self.transitions.get(self.current_animation, ()):
+            if ANIM_CONDITIONS[cond](vel_y, on_ground):
+                self.set_animation(target, now_ms)
+                return
+
+    def current_frame(self, now_ms):
+        """(sprite, frame_foot baseline) of the frame shown at now_ms, or (None, 0) without a clip."""
+        clip = self.clips.get(self.current_animation)
+        if clip is None:
+            return None, 0
+        return clip.frame_at(now_ms - self.started_ms)
+
+# Player sprites and their clips (shared by every session), loaded by setup()
+player_sprites = None
+player_clips = None
 
 # Parallax background system (infinite scrolling)
+# Stitched mode: each layer is pre-rendered into one wide strip and drawn with at most two
+# area blits from a single scroll offset, instead of moving and blitting every tile.
+PARALLAX_STITCHED = True
+
 class ParallaxLayer:
-    def __init__(self, image_path, speed_factor):
+    def __init__(self, image_path, speed_factor, stitched=None):
         self.enabled = False
         self.speed_factor = speed_factor
+        self.stitched = PARALLAX_STITCHED if stitched is None else stitched
         self.img = None
         self.positions = []
         self.y = 0
+        self.strip = None
+        self.strip_w = 0
+        self.offset = 0.0
         if os.path.exists(image_path):
             try:
                 img = pygame.image.load(image_path).convert_alpha()
@@ -157,20 +235,40 @@ class ParallaxLayer:
                 scale = HEIGHT / ih
                 new_w = max(1, int(iw * scale))
                 new_h = HEIGHT
-                self.img = pygame.transform.smoothscale(img, (new_w, new_h))
+                # opaque art is blitted without per-pixel alpha
+                self.img = normalize(pygame.transform.smoothscale(img, (new_w, new_h)),
+                                     None if self.stitched else "background/" + os.path.basename(image_path))
                 tile_w = self.img.get_width()
                 # Create enough tiles to cover width plus buffer
                 tile_count = max(3, math.ceil(WIDTH / tile_w) + 2)
                 self.positions = [i * tile_w for i in range(tile_count)]
                 self.y = 0  # align to top; adjust if your art needs bottom align
+                if self.stitched:
+                    self._build_strip()
                 self.enabled = True
             except Exception:
                 self.enabled = False
 
-    def update(self, dt):
+    def _build_strip(self):
+        """Stitch whole tiles into a strip at least twice the screen width (periodic in tile width)."""
+        tile_w = self.img.get_width()
+        count = max(2, math.ceil(2 * WIDTH / tile_w))
+        self.strip_w = tile_w * count
+        self.strip = pygame.Surface((self.strip_w, self.img.get_height()), pygame.SRCALPHA).convert_alpha()
+        for i in range(count):
+            self.strip.blit(self.img, (i * tile_w, 0))
+        self.strip = normalize(self.strip, "background/strip")
+        self.offset = 0.0
+
+    def update(self, dt, scroll_pps=None):
         if not self.enabled:
             return
-        dx = GROUND_SCROLL_PPS * self.speed_factor * (dt / 1000.0)
+        if scroll_pps is None:
+            scroll_pps = GROUND_SCROLL_PPS
+        dx = scroll_pps * self.speed_factor * (dt / 1000.0)
+        if self.strip is not None:
+            self.offset = (self.offset + dx) % self.strip_w
+            return
         # Move tiles left
         for i in range(len(self.positions)):
             self.positions[i] -= dx
@@ -180,147 +278,93 @@ class ParallaxLayer:
             _ = self.positions.pop(0)
             self.positions.append(self.positions[-1] + w)
 
+    def blit_commands(self):
+        """(surface, dest, area) tuples that draw this layer, for Surface.blits."""
+        if not self.enabled:
+            return []
+        if self.strip is not None:
+            # one area blit, plus a second one when the visible window wraps past the strip end
+            ox = int(self.offset)
+            first_w = min(WIDTH, self.strip_w - ox)
+            h = self.strip.get_height()
+            cmds = [(self.strip, (0, int(self.y)), (ox, 0, first_w, h))]
+            if first_w < WIDTH:
+                cmds.append((self.strip, (first_w, int(self.y)), (0, 0, WIDTH - first_w, h)))
+            return cmds
+        return [(self.img, (int(x), int(self.y)), None) for x in self.positions]
+
     def draw(self, surface):
         if not self.enabled:
             return
-        for x in self.positions:
-            surface.blit(self.img, (int(x), int(self.y)))
+        surface.blits(self.blit_commands(), doreturn=False)
 
 
 class ParallaxBackground:
     def __init__(self, layers):
         self.layers = [l for l in layers if l and l.enabled]
 
-    def update(self, dt):
+    def update(self, dt, scroll_pps=None):
         for l in self.layers:
-            l.update(dt)
+            l.update(dt, scroll_pps)
 
     def draw(self, surface):
         for l in self.layers:
             l.draw(surface)
 
+    def blit_commands(self):
+        cmds = []
+        for l in self.layers:
+            cmds.extend(l.blit_commands())
+        return cmds
+
+def _load_image_asset(name):
+    """Load a manifest image with per-pixel alpha, or None if it is missing or unreadable."""
+    path = assets.path(name)
+    if path is None:
+        return None
+    try:
+        return pygame.image.load(path).convert_alpha()
+    except Exception:
+        return None
+
 def _load_arrow_image():
     """Load arrow image from decoration/arrow.png (case-insensitive), fallback to root."""
-    candidates = [
-        os.path.join(os.path.dirname(__file__), "decoration"),
-        os.path.dirname(__file__),
-    ]
-    for base in candidates:
-        try:
-            for fname in os.listdir(base):
-                if fname.lower() == "arrow.png":
-                    path = os.path.join(base, fname)
-                    img = pygame.image.load(path).convert_alpha()
-                    return img
-        except Exception:
-            pass
-    return None
+    return _load_image_asset("arrow")
 
 def _load_gold_image():
     """Load gold coin image from decoration/gold.png (case-insensitive), fallback to root."""
-    candidates = [
-        os.path.join(os.path.dirname(__file__), "decoration"),
-        os.path.dirname(__file__),
-    ]
-    for base in candidates:
-        try:
-            for fname in os.listdir(base):
-                if fname.lower() == "gold.png":
-                    path = os.path.join(base, fname)
-                    img = pygame.image.load(path).convert_alpha()
-                    return img
-        except Exception:
-            pass
-    return None
+    return _load_image_asset("gold")
 
 def _load_diamond_image():
     """Load double-jump pickup image from decoration/diamondjump.png (case-insensitive), fallback to root."""
-    candidates = [
-        os.path.join(os.path.dirname(__file__), "decoration"),
-        os.path.dirname(__file__),
-    ]
-    for base in candidates:
-        try:
-            for fname in os.listdir(base):
-                if fname.lower() == "diamondjump.png":
-                    path = os.path.join(base, fname)
-                    img = pygame.image.load(path).convert_alpha()
-                    return img
-        except Exception:
-            pass
-    return None
+    return _load_image_asset("diamond")
 
 
 def _find_new_background_path():
     """Find a user-added background image like 'background (1).png', 'background(1).png' or 'background（1）.png'."""
-    bases = [
-        os.path.dirname(__file__),
-        os.getcwd(),
-        os.path.join(os.path.dirname(__file__), "decoration"),
-    ]
-    # Match: background[optional space][( or （]1[) or ）].(png|jpg|jpeg), case-insensitive
-    pat = re.compile(r"^background\s*[\(（]1[\)）]\.(png|jpg|jpeg)$", re.IGNORECASE)
-    for base in bases:
-        try:
-            for fname in os.listdir(base):
-                if pat.match(fname):
-                    return os.path.join(base, fname)
-        except Exception:
-            continue
-    # Fallback: recursive search under the script directory
-    root = os.path.dirname(__file__)
-    try:
-        for dirpath, _dirs, files in os.walk(root):
-            for fname in files:
-                if pat.match(fname):
-                    return os.path.join(dirpath, fname)
-    except Exception:
-        pass
-    return None
+    return assets.path("background_new")
 
 def _find_generic_background_path():
     """Find 'background.png/jpg/jpeg' in root or decoration folders, case-insensitive (e.g., Background.png)."""
-    exts = (".png", ".jpg", ".jpeg")
-    bases = [os.path.dirname(__file__), os.path.join(os.path.dirname(__file__), "decoration")]
-    for base in bases:
-        try:
-            for fname in os.listdir(base):
-                lower = fname.lower()
-                if lower.startswith("background") and lower.endswith(exts):
-                    return os.path.join(base, fname)
-        except Exception:
-            continue
-    return None
+    return assets.path("background")
 
 def _load_menu_background_image():
     """Look for a 'MainMenuBG' image (png/jpg/jpeg) in decoration or root, case-insensitive."""
-    exts = (".png", ".jpg", ".jpeg")
-    bases = [os.path.join(os.path.dirname(__file__), "decoration"), os.path.dirname(__file__)]
-    for base in bases:
-        try:
-            for fname in os.listdir(base):
-                lower = fname.lower()
-                if lower.startswith("mainmenubg") and lower.endswith(exts):
-                    path = os.path.join(base, fname)
-                    try:
-                        img = pygame.image.load(path).convert_alpha()
-                        return img
-                    except Exception:
-                        pass
-        except Exception:
-            continue
-    return None
+    return _load_image_asset("menu_bg")
 
-# Prepare Main Menu background surface if available (after loader is defined)
+# Main Menu background surface if available (scaled to the window by setup())
 MENU_BG_SURF = None
 MENU_BG_POS = (0, 0)
-try:
-    _raw_menu_bg = _load_menu_background_image()
-except Exception:
-    _raw_menu_bg = None
-if _raw_menu_bg is not None:
+_raw_menu_bg = None
+
+def scale_menu_background():
+    """Cover the window with the menu background image, if there is one."""
+    global MENU_BG_SURF, MENU_BG_POS
+    if _raw_menu_bg is None:
+        return
     try:
         MENU_BG_SURF, MENU_BG_POS = _scale_image_cover(_raw_menu_bg, WIDTH, HEIGHT)
+        MENU_BG_SURF = normalize(MENU_BG_SURF, "menu_bg")
     except Exception:
         try:
             MENU_BG_SURF = pygame.transform.smoothscale(_raw_menu_bg, (WIDTH, HEIGHT))
@@ -340,30 +384,9 @@ def create_background():
         return ParallaxBackground([l for l in [ParallaxLayer(nb, 0.6)] if l and l.enabled])
 
     # Otherwise, try layered backgrounds
-    names = ["bg_far.png", "bg_mid.png", "bg_near.png", "background.png"]
     candidates = []
-    for nm, spd in zip(names, [0.2, 0.45, 0.75, 0.6]):
-        # check both root and decoration folder, case-insensitive
-        paths = [
-            os.path.join(os.path.dirname(__file__), nm),
-            os.path.join(os.path.dirname(__file__), "decoration", nm),
-        ]
-        found = None
-        for p in paths:
-            if os.path.exists(p):
-                found = p
-                break
-            # try case-insensitive scan in the directory containing p
-            d = os.path.dirname(p)
-            try:
-                for f in os.listdir(d):
-                    if f.lower() == nm.lower():
-                        found = os.path.join(d, f)
-                        break
-            except Exception:
-                pass
-            if found:
-                break
+    for name, spd in zip(["bg_far", "bg_mid", "bg_near", "bg_layer"], [0.2, 0.45, 0.75, 0.6]):
+        found = assets.path(name)
         if found:
             candidates.append((found, spd))
     layers = []
@@ -374,12 +397,12 @@ def create_background():
     return ParallaxBackground(layers)
 
 
-background = create_background()
+background = None
 
 # Load and scale dungeon ground tile
 def load_ground_tile():
-    path = os.path.join("dungeonbackground", "Ground.png")
-    if os.path.exists(path):
+    path = assets.path("ground_tile")
+    if path is not None:
         try:
             img = pygame.image.load(path).convert_alpha()
             # Do not scale to preserve original appearance
@@ -388,10 +411,9 @@ def load_ground_tile():
             return None
     return None
 
-GROUND_TILE_IMG = load_ground_tile()
+GROUND_TILE_IMG = None
 
 # Arrow settings and assets
-ARROW_IMG = _load_arrow_image()
 ARROW_SPEED = 700.0  # pixels per second
 ARROW_SPAWN_SCORE_THRESHOLD = 30
 ARROW_SPAWN_MIN_MS = 1200
@@ -402,114 +424,72 @@ ARROW_TARGET_LONG = 64  # target length (max(width,height)) in pixels
 # Base direction of the sprite art: 'left' or 'right'
 ARROW_BASE_DIRECTION = 'left'
 
-# Scale arrow image down if needed
-if ARROW_IMG is not None:
-    try:
-        aw, ah = ARROW_IMG.get_width(), ARROW_IMG.get_height()
-        long_edge = max(aw, ah)
-        if long_edge > ARROW_TARGET_LONG:
-            scale = ARROW_TARGET_LONG / float(max(1, long_edge))
-            nw = max(1, int(round(aw * scale)))
-            nh = max(1, int(round(ah * scale)))
-            try:
-                ARROW_IMG = pygame.transform.smoothscale(ARROW_IMG, (nw, nh))
-            except Exception:
-                ARROW_IMG = pygame.transform.scale(ARROW_IMG, (nw, nh))
-    except Exception:
-        pass
-
 # Gold coin settings and assets
-GOLD_IMG = _load_gold_image()
 GOLD_TARGET_LONG = 32  # smaller coin per request
 GOLD_OFFSCREEN_MARGIN = 120
 GOLD_SPAWN_MIN_MS = 900
 GOLD_SPAWN_MAX_MS = 1800
 GOLD_MAX_ACTIVE = 5
-golds = []  # list of dicts: {x,y}
-gold_spawn_timer = 0
-gold_next_spawn = random.randint(GOLD_SPAWN_MIN_MS, GOLD_SPAWN_MAX_MS)
-
-# Scale gold coin image to target long edge
-if GOLD_IMG is not None:
-    try:
-        gw, gh = GOLD_IMG.get_width(), GOLD_IMG.get_height()
-        glong = max(gw, gh)
-        target = max(1, GOLD_TARGET_LONG)
-        # Always scale to target long edge (up or down)
-        if abs(glong - target) > 1:
-            gscale = target / float(glong)
-            gnw = max(1, int(round(gw * gscale)))
-            gnh = max(1, int(round(gh * gscale)))
-            try:
-                GOLD_IMG = pygame.transform.smoothscale(GOLD_IMG, (gnw, gnh))
-            except Exception:
-                GOLD_IMG = pygame.transform.scale(GOLD_IMG, (gnw, gnh))
-    except Exception:
-        pass
 
 # Diamond pickup (double-jump) asset
-DIAMOND_IMG = _load_diamond_image()
 DIAMOND_TARGET_LONG = 48  # slightly larger than old circle (diameter 36)
-if DIAMOND_IMG is not None:
-    try:
-        dw, dh = DIAMOND_IMG.get_width(), DIAMOND_IMG.get_height()
-        dlong = max(dw, dh)
-        target = max(1, DIAMOND_TARGET_LONG)
-        if abs(dlong - target) > 1:
-            dscale = target / float(dlong)
-            dnw = max(1, int(round(dw * dscale)))
-            dnh = max(1, int(round(dh * dscale)))
-            try:
-                DIAMOND_IMG = pygame.transform.smoothscale(DIAMOND_IMG, (dnw, dnh))
-            except Exception:
-                DIAMOND_IMG = pygame.transform.scale(DIAMOND_IMG, (dnw, dnh))
-        # set pickup radius from the final image size (half of max dimension)
-        try:
-            d_final_w, d_final_h = DIAMOND_IMG.get_width(), DIAMOND_IMG.get_height()
-            globals()['pickup_radius'] = max(8, int(round(max(d_final_w, d_final_h) / 2)))
-        except Exception:
-            pass
-    except Exception:
-        pass
-
 # HUD-sized diamond (top-left indicator when double jump available)
-DIAMOND_HUD_IMG = None
 DIAMOND_HUD_LONG = 28  # small UI variant
-if DIAMOND_IMG is not None:
-    try:
-        dw, dh = DIAMOND_IMG.get_width(), DIAMOND_IMG.get_height()
-        dlong = max(dw, dh)
-        if abs(dlong - DIAMOND_HUD_LONG) > 1:
-            dscale = DIAMOND_HUD_LONG / float(dlong)
-            dnw = max(1, int(round(dw * dscale)))
-            dnh = max(1, int(round(dh * dscale)))
-            try:
-                DIAMOND_HUD_IMG = pygame.transform.smoothscale(DIAMOND_IMG, (dnw, dnh))
-            except Exception:
-                DIAMOND_HUD_IMG = pygame.transform.scale(DIAMOND_IMG, (dnw, dnh))
-        else:
-            DIAMOND_HUD_IMG = DIAMOND_IMG.copy()
-    except Exception:
-        DIAMOND_HUD_IMG = None
-arrows = []  # list of dicts: {x,y,vx,vy,angle}
-arrow_spawn_timer = 0
-arrow_next_spawn = random.randint(ARROW_SPAWN_MIN_MS, ARROW_SPAWN_MAX_MS)
 
 # Platform sprite size (scaled down proportionally to make platforms shorter)
-PLATFORM_IMG = None
-if GROUND_TILE_IMG is not None:
-    _ow, _oh = GROUND_TILE_IMG.get_width(), GROUND_TILE_IMG.get_height()
-    PLATFORM_TARGET_HEIGHT = 48  # shrink a bit; preserves aspect ratio
-    _scale = PLATFORM_TARGET_HEIGHT / max(1, _oh)
-    PLATFORM_W = max(16, int(_ow * _scale))
-    PLATFORM_H = PLATFORM_TARGET_HEIGHT
+PLATFORM_TARGET_HEIGHT = 48  # shrink a bit; preserves aspect ratio
+
+# Unscaled sources, kept so a config reload can rescale a single asset without reloading files
+_ARROW_SRC = _GOLD_SRC = _DIAMOND_SRC = None
+# Scaled sprites, built from the sources by rescale_assets()
+ARROW_IMG = GOLD_IMG = DIAMOND_IMG = DIAMOND_HUD_IMG = PLATFORM_IMG = None
+PLATFORM_W, PLATFORM_H = 120, 40
+
+def _fit_long_edge(img, target, shrink_only=False):
+    """Scale img so its long edge is `target` pixels (within 1px); returns img itself if already there."""
+    w, h = img.get_width(), img.get_height()
+    long_edge = max(w, h)
+    target = max(1, target)
+    if abs(long_edge - target) <= 1 or (shrink_only and long_edge <= target):
+        return img
+    scale = target / float(max(1, long_edge))
+    size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
     try:
-        PLATFORM_IMG = pygame.transform.smoothscale(GROUND_TILE_IMG, (PLATFORM_W, PLATFORM_H))
+        return pygame.transform.smoothscale(img, size)
     except Exception:
-        PLATFORM_IMG = pygame.transform.scale(GROUND_TILE_IMG, (PLATFORM_W, PLATFORM_H))
-else:
-    PLATFORM_W = 120
-    PLATFORM_H = 40
+        return pygame.transform.scale(img, size)
+
+def rescale_assets(names=("arrow", "gold", "diamond", "platform")):
+    """(Re)build the scaled sprites named in `names` from their sources and the *_TARGET_* sizes."""
+    global ARROW_IMG, GOLD_IMG, DIAMOND_IMG, DIAMOND_HUD_IMG, PLATFORM_IMG, PLATFORM_W, PLATFORM_H
+    # Scaling always works on the alpha sources; only the final sprites are normalized
+    if "arrow" in names:
+        # Scale arrow image down if needed
+        ARROW_IMG = normalize(_fit_long_edge(_ARROW_SRC, ARROW_TARGET_LONG, shrink_only=True), "arrow") if _ARROW_SRC is not None else None
+    if "gold" in names:
+        # Always scale to target long edge (up or down)
+        GOLD_IMG = normalize(_fit_long_edge(_GOLD_SRC, GOLD_TARGET_LONG), "gold") if _GOLD_SRC is not None else None
+    if "diamond" in names:
+        DIAMOND_IMG = DIAMOND_HUD_IMG = None
+        if _DIAMOND_SRC is not None:
+            diamond = _fit_long_edge(_DIAMOND_SRC, DIAMOND_TARGET_LONG)
+            DIAMOND_HUD_IMG = normalize(_fit_long_edge(diamond, DIAMOND_HUD_LONG), "diamond_hud")
+            DIAMOND_IMG = normalize(diamond, "diamond")
+    if "platform" in names:
+        if GROUND_TILE_IMG is not None:
+            ow, oh = GROUND_TILE_IMG.get_width(), GROUND_TILE_IMG.get_height()
+            scale = PLATFORM_TARGET_HEIGHT / max(1, oh)
+            PLATFORM_W = max(16, int(ow * scale))
+            PLATFORM_H = PLATFORM_TARGET_HEIGHT
+            try:
+                PLATFORM_IMG = pygame.transform.smoothscale(GROUND_TILE_IMG, (PLATFORM_W, PLATFORM_H))
+            except Exception:
+                PLATFORM_IMG = pygame.transform.scale(GROUND_TILE_IMG, (PLATFORM_W, PLATFORM_H))
+            PLATFORM_IMG = normalize(PLATFORM_IMG, "platform")
+        else:
+            PLATFORM_IMG = None
+            PLATFORM_W = 120
+            PLATFORM_H = 40
 
 # Vertical band for floating platforms (lower overall)
 PLATFORM_Y_MIN = int(HEIGHT * 0.66)
@@ -530,13 +510,21 @@ def draw_ground_tiled(surface, img, seg_x, seg_top, seg_w, seg_h):
     - If seg_w >= sprite width: draw the whole sprite normally.
     - If seg_w < sprite width: draw left head and right tail parts, skipping the middle.
     """
+    cmds = platform_blit_commands(img, seg_x, seg_top, seg_w)
+    if cmds:
+        surface.blits(cmds, doreturn=False)
+    else:
+        pygame.draw.rect(surface, (50, 205, 50), (int(seg_x), int(seg_top), int(seg_w), int(seg_h)))
+
+def platform_blit_commands(img, seg_x, seg_top, seg_w):
+    """(surface, dest, area) tuples for one platform (see draw_ground_tiled); empty without a sprite."""
     use_img = PLATFORM_IMG if PLATFORM_IMG is not None else img
     if use_img is not None:
         src_w = use_img.get_width()
         src_h = use_img.get_height()
         w = int(seg_w)
         if w >= src_w:
-            surface.blit(use_img, (int(seg_x), int(seg_top)))
+            return [(use_img, (int(seg_x), int(seg_top)), None)]
         else:
             # compute head/tail crop sizes in source space
             head_px = max(1, int(src_w * HEAD_CROP_FRAC))
@@ -579,23 +567,28 @@ def draw_ground_tiled(surface, img, seg_x, seg_top, seg_w, seg_h):
                         head_draw_w -= reduce_head
                         diff += reduce_head
             # ensure final non-overlapping coverage
-            head_src = pygame.Rect(0, 0, head_draw_w, src_h)
-            surface.blit(use_img, (int(seg_x), int(seg_top)), head_src)
-            tail_src = pygame.Rect(src_w - tail_draw_w, 0, tail_draw_w, src_h)
+            head_src = (0, 0, head_draw_w, src_h)
+            tail_src = (src_w - tail_draw_w, 0, tail_draw_w, src_h)
             tail_dest_x = int(seg_x + w - tail_draw_w)
-            surface.blit(use_img, (tail_dest_x, int(seg_top)), tail_src)
-    else:
-        pygame.draw.rect(surface, (50, 205, 50), (int(seg_x), int(seg_top), int(seg_w), int(seg_h)))
+            return [(use_img, (int(seg_x), int(seg_top)), head_src),
+                    (use_img, (tail_dest_x, int(seg_top)), tail_src)]
+    return []
 
 # Font for score
 def get_font():
     return pygame.font.SysFont(None, 36)
-font = get_font()
+font = None
 
 def draw_text_with_outline(surface, text, font, pos, color=(255,255,255), outline_color=(0,0,0), outline=2, bg_alpha=120):
     """Draw text with a subtle translucent background and an outline so it's always visible on any background."""
+    cmds = text_with_outline_blits(text, font, pos, color, outline_color, outline, bg_alpha)
+    if cmds:
+        surface.blits(cmds, doreturn=False)
+
+def text_with_outline_blits(text, font, pos, color=(255,255,255), outline_color=(0,0,0), outline=2, bg_alpha=120):
+    """(surface, dest) tuples for draw_text_with_outline: background, outline copies, then the text."""
     if not text:
-        return
+        return []
     # render main and outline
     main = font.render(text, True, color)
     if outline > 0:
@@ -607,37 +600,96 @@ def draw_text_with_outline(surface, text, font, pos, color=(255,255,255), outlin
     pad_x, pad_y = 8, 4
     bg = pygame.Surface((main.get_width() + pad_x*2, main.get_height() + pad_y*2), pygame.SRCALPHA)
     bg.fill((0,0,0,bg_alpha))
-    surface.blit(bg, (x - pad_x, y - pad_y))
+    cmds = [(bg, (x - pad_x, y - pad_y))]
     # outline (simple 8-direction) then main
     if out:
         for ox, oy in [(-outline,0),(outline,0),(0,-outline),(0,outline),(-outline,-outline),(-outline,outline),(outline,-outline),(outline,outline)]:
-            surface.blit(out, (x+ox, y+oy))
-    surface.blit(main, (x, y))
+            cmds.append((out, (x+ox, y+oy)))
+    cmds.append((main, (x, y)))
+    return cmds
+
+# Render graph layers, submitted back to front
+LAYER_BACKGROUND, LAYER_PLATFORMS, LAYER_PICKUPS, LAYER_HAZARDS, LAYER_PLAYER, LAYER_EFFECTS, LAYER_HUD = range(7)
+LAYER_NAMES = ["background", "platforms", "pickups", "hazards", "player", "effects", "HUD"]
+
+class RenderGraph:
+    """One frame's draw commands in ordered layers, culled against the viewport.
+    Visible blits are issued with a single Surface.blits call per layer; primitive fallbacks
+    (pygame.draw calls for missing sprites) run right after their layer's blits.
+    Per-layer drawn/culled counts of the last submitted frame are kept in last_stats.
+    """
+    def __init__(self, view_size, layer_names=LAYER_NAMES):
+        self.view_w, self.view_h = view_size
+        self.layer_names = list(layer_names)
+        count = len(self.layer_names)
+        self.blits = [[] for _ in range(count)]
+        self.primitives = [[] for _ in range(count)]
+        self.drawn = [0] * count
+        self.culled = [0] * count
+        self.last_stats = {}
+
+    def visible(self, layer, x, y, w, h):
+        """True if the rect touches the viewport; otherwise count it as culled for this layer."""
+        if x >= self.view_w or y >= self.view_h or x + w <= 0 or y + h <= 0:
+            self.culled[layer] += 1
+            return False
+        return True
+
+    def add(self, layer, surf, dest, area=None):
+        x, y = dest
+        if area is not None:
+            w, h = area[2], area[3]
+        else:
+            w, h = surf.get_size()
+        if not self.visible(layer, x, y, w, h):
+            return False
+        self.blits[layer].append((surf, dest, area) if area is not None else (surf, dest))
+        self.drawn[layer] += 1
+        return True
+
+    def extend(self, layer, cmds):
+        for cmd in cmds:
+            self.add(layer, *cmd)
+
+    def add_batch(self, layer, cmds):
+        """Queue blit commands the caller already culled (e.g. particles), without per-item checks."""
+        self.blits[layer].extend(cmds)
+        self.drawn[layer] += len(cmds)
+
+    def add_primitive(self, layer, fn, *args):
+        """Queue fn(surface, *args), e.g. pygame.draw.rect, for this layer (not culled)."""
+        self.primitives[layer].append((fn, args))
+        self.drawn[layer] += 1
+
+    def commands(self):
+        """Flattened (layer, command) list in submission order, for inspection and tests."""
+        return [(i, cmd) for i, layer in enumerate(self.blits) for cmd in layer]
+
+    def submit(self, surface):
+        for blits, prims in zip(self.blits, self.primitives):
+            if blits:
+                surface.blits(blits, doreturn=False)
+                blits.clear()
+            for fn, args in prims:
+                fn(surface, *args)
+            prims.clear()
+        self.last_stats = {name: (self.drawn[i], self.culled[i]) for i, name in enumerate(self.layer_names)}
+        for i in range(len(self.layer_names)):
+            self.drawn[i] = 0
+            self.culled[i] = 0
 
 # Menu / Dead menu fonts
 def get_title_font(size=56):
     """Load a fancier title font if available; fallback to a system fancy font, else default.
     Search for TTFs in decoration/ and fonts/ first.
     """
-    # 1) Try bundled TTFs
-    ttf_names = [
-        "MainMenuTitle.ttf", "Title.ttf", "menu-title.ttf", "Fancy.ttf",
-    ]
-    bases = [os.path.join(os.path.dirname(__file__), "decoration"),
-             os.path.join(os.path.dirname(__file__), "fonts"),
-             os.path.dirname(__file__)]
-    for base in bases:
+    # 1) Try the bundled TTF from the asset manifest
+    path = assets.path("title_font")
+    if path is not None:
         try:
-            files = set(os.listdir(base))
+            return pygame.font.Font(path, size)
         except Exception:
-            files = set()
-        for ttf in ttf_names:
-            for f in files:
-                if f.lower() == ttf.lower():
-                    try:
-                        return pygame.font.Font(os.path.join(base, f), size)
-                    except Exception:
-                        pass
+            pass
     # 2) Try some fancy system fonts
     fancy_candidates = [
         "Papyrus", "Chiller", "Gabriola", "Harlow Solid Italic", "Vivaldi",
@@ -656,37 +708,29 @@ def get_title_font(size=56):
     # 3) Fallback
     return pygame.font.SysFont(None, size)
 
-title_font = get_title_font(56)
-button_font = pygame.font.SysFont(None, 36)
+title_font = None
+button_font = None
 
 # Base safe-ground height (used for player start and safe area)
 GROUND_BASE_HEIGHT = 80
 
 # Player properties
-def reset_player():
-    global player_x, player_y, player_vel_y, player_vel_x, on_ground
-    player_x = 100
-    player_y = HEIGHT - player_height - GROUND_BASE_HEIGHT
-    player_vel_y = 0
-    player_vel_x = 0
-    on_ground = True
-
 player_width, player_height = 150, 200  # Updated to match larger sprite size
-reset_player()
+PLAYER_START_X = 100
 gravity = 1
 jump_power = -18
-# Double-jump pickup state
-double_jump_available = False   # player has pickup and can double-jump
-double_jump_used = False        # whether double jump used during current airtime
-pickup_spawned = False
-pickup_x = 0.0
-pickup_y = 0.0
+# Double-jump pickup
 pickup_radius = 18
-next_spawn_score = 10  # spawn first at score 10; if missed, set to 20
+FIRST_PICKUP_SCORE = 10  # spawn first at score 10; if missed, set to 20
 
 # How high above the base ground line the double-jump pickup spawns (larger = higher on screen)
 PICKUP_ABOVE_BASE = 300
 
+# Jump forgiveness: a press this long before landing still jumps, and walking off an edge
+# still allows a normal jump for COYOTE_MS
+JUMP_BUFFER_MS = 120
+COYOTE_MS = 100
+
 # Ground segment properties
 # Ground scroll speed in pixels per second (time-based)
 GROUND_SCROLL_PPS = 360
@@ -698,6 +742,78 @@ GROUND_WIDTH = 120
 START_GROUND_PIXELS = max(GROUND_WIDTH * 3, int(WIDTH * 0.6))
 GAP_MIN = 180  # Larger minimum gap for higher challenge
 GAP_MAX = 360  # Larger maximum gap
+# Horizontal player speed from A/D, in pixels per frame
+PLAYER_MOVE_SPEED = 7
+
+# Reachability envelope: for every vertical step between platforms (dy = next top - previous top,
+# positive = lower on screen) the widest gap a jump can still clear. Airtimes are simulated once
+# from the per-frame jump physics; the gap table per scroll speed is derived from them and cached,
+# so the generator only needs a table lookup per platform.
+ENVELOPE_SAFETY = 0.8  # keep some headroom for human timing
+
+def _jump_airtime(target_dy, double_jump):
+    """Frames until a jump from rest comes back down through target_dy, or None if it never gets that high.
+    With double_jump the second jump is taken at the apex, which gives the longest airtime.
+    """
+    vel = 0
+    disp = 0
+    apex = 0
+    jumps_left = 2 if double_jump else 1
+    for frame in range(1, 10 * FPS):
+        if jumps_left and (frame == 1 or vel >= 0):
+            vel = jump_power
+            jumps_left -= 1
+        vel += gravity
+        disp += vel
+        apex = min(apex, disp)
+        if vel >= 0 and not jumps_left:
+            # coming down: a target above the highest point was never reached
+            if target_dy < apex:
+                return None
+            if disp >= target_dy:
+                return frame
+    return None
+
+def _jump_airtimes(double_jump):
+    """Airtime in frames for every dy of the platform band, indexed by dy + span (None = unreachable)."""
+    span = PLATFORM_Y_MAX - PLATFORM_Y_MIN
+    foot = player_sprites.ground_foot_offset()
+    return [_jump_airtime(dy - foot, double_jump) for dy in range(-span, span + 1)]
+
+# simulated by setup() once the player sprites (and their foot offset) are loaded
+JUMP_AIRTIME_SINGLE = JUMP_AIRTIME_DOUBLE = None
+
+def build_jump_envelope(double_jump=False, scroll_pps=None):
+    """Return a list indexed by dy + (PLATFORM_Y_MAX - PLATFORM_Y_MIN) holding the max reachable gap (0 = unreachable)."""
+    if scroll_pps is None:
+        scroll_pps = GROUND_SCROLL_PPS
+    # world scrolls towards the player while they hold D
+    rel_speed = scroll_pps / float(FPS) + PLAYER_MOVE_SPEED
+    # the collision box reaches the next platform before the sprite origin does
+    reach_x = int(player_width * 0.7)
+    airtimes = JUMP_AIRTIME_DOUBLE if double_jump else JUMP_AIRTIME_SINGLE
+    return [0 if frames is None else int((rel_speed * frames + reach_x) * ENVELOPE_SAFETY) for frames in airtimes]
+
+def _envelope_min_dy(table, gap_min=None):
+    """Smallest dy (highest step up) whose reachable gap still allows gap_min (GAP_MIN by default)."""
+    if gap_min is None:
+        gap_min = GAP_MIN
+    span = PLATFORM_Y_MAX - PLATFORM_Y_MIN
+    for i, cap in enumerate(table):
+        if cap >= gap_min:
+            return i - span
+    return 0
+
+_jump_envelopes = {}
+
+def jump_envelope(double_jump, scroll_pps, gap_min):
+    """(gap table, min dy) for one scroll speed and minimum gap; cached, since the ramp revisits them."""
+    key = (double_jump, scroll_pps, gap_min)
+    envelope = _jump_envelopes.get(key)
+    if envelope is None:
+        table = build_jump_envelope(double_jump, scroll_pps)
+        envelope = _jump_envelopes[key] = (table, _envelope_min_dy(table, gap_min))
+    return envelope
 
 # Level generation mode: finite vs endless
 LEVEL_ENDLESS = True  # Enable infinite generation so platforms continue beyond early scores
@@ -705,59 +821,481 @@ LEVEL_ENDLESS = True  # Enable infinite generation so platforms continue beyond
 LEVEL_LENGTH_PIXELS = int(WIDTH * 6)
 
 # Score system
-score = 0
-score_timer = 0  # milliseconds
+SCORE_TICK_MS = 1000  # add 1 point every second
+
+# Difficulty ramp: curves of multipliers for GROUND_SCROLL_PPS, GAP_MIN/GAP_MAX and the arrow/gold
+# spawn intervals, by score or elapsed seconds (see difficulty.py); set from the config profile
+DIFFICULTY_RAMP = {}
+difficulty = DifficultyRamp(DIFFICULTY_RAMP)
 
 safe_area_segments = int(WIDTH // GROUND_WIDTH) + 1
 GEN_BUFFER = WIDTH  # extra pixels to generate ahead to avoid popping
 
-# Ground generation
-def reset_ground():
-    """Generate floating platforms using a fixed-size sprite (no tiling).
-    Each platform is an individual sprite at a chosen (x, y), with width/height from the sprite.
-    If LEVEL_ENDLESS is False, platforms are pre-generated up to LEVEL_LENGTH_PIXELS.
-    Structure per segment: [x, y, w, h].
+
+class GameSession:
+    """All state of one run: player, platforms, pickups, arrows, golds and its event queue.
+    Several sessions can live in one process (bots racing, benchmarks); assets, fonts and the
+    renderer stay module-level and are shared. Each session draws from its own RNG, so two
+    sessions started with the same seed generate the same level.
     """
-    global ground_segments, ground_y_base
-    ground_segments = []
-    ground_y_base = HEIGHT
-
-    # 1) Starting platform: a long strip made of multiple short sprites
-    start_y = int((PLATFORM_Y_MIN + PLATFORM_Y_MAX) / 2)
-    current_x = 0
-    while current_x < START_GROUND_PIXELS:
-        ground_segments.append([current_x, start_y, PLATFORM_W, PLATFORM_H])
-        current_x += PLATFORM_W
-
-    # 2) Generate the rest along X with gaps, Y within band (very short platforms via crop)
-    limit_x = LEVEL_LENGTH_PIXELS if not LEVEL_ENDLESS else (WIDTH + PLATFORM_W + GEN_BUFFER)
-    while current_x < limit_x:
-        gap = random.randint(GAP_MIN, GAP_MAX)
-        current_x += gap
-        y = random.randint(PLATFORM_Y_MIN, PLATFORM_Y_MAX)
-        # Choose a short platform width as a fraction of the base sprite width
-        seg_w = max(8, int(PLATFORM_W * random.uniform(SHORT_PLATFORM_MIN_FRAC, SHORT_PLATFORM_MAX_FRAC)))
-        ground_segments.append([current_x, y, seg_w, PLATFORM_H])
-        current_x += seg_w
-
-reset_ground()
-
-# Align player start height to the first platform
-if ground_segments:
-    first_top = ground_segments[0][1]
-    player_y = first_top - player_height + (player_sprites.ground_foot_offset() if hasattr(player_sprites, 'ground_foot_offset') else 0)
+    def __init__(self, seed=None):
+        self.rng = random.Random()
+        # Simulation-time event queue for score ticks and spawns (milliseconds since run start)
+        self.scheduler = TimerScheduler()
+        self.anim = PlayerAnimation(player_clips)
+        self.arrows = []  # list of dicts: {x,y,vx,vy,angle,img}
+        self.golds = []  # list of dicts: {x,y}
+        self.ground_segments = []
+        # fn(event, x, y) called for jumps, pickups, arrow spawns and death (sound, effects)
+        self.listeners = []
+        self.reset_run(seed)
+
+    def emit(self, event, x=0.0, y=0.0):
+        for listener in self.listeners:
+            listener(event, x, y)
+
+    # Player properties
+    def reset_player(self):
+        self.player_x = PLAYER_START_X
+        self.player_y = HEIGHT - player_height - GROUND_BASE_HEIGHT
+        self.player_vel_y = 0
+        self.player_vel_x = 0
+        self.on_ground = True
+
+    def begin_run(self, seed=None):
+        """Pick and apply the RNG seed for a new run; call before reset_ground()."""
+        self.run_seed = random.randrange(1 << 32) if seed is None else int(seed)
+        self.rng.seed(self.run_seed)
+
+    # Ground generation
+    def reset_ground(self):
+        """Generate floating platforms using a fixed-size sprite (no tiling).
+        Each platform is an individual sprite at a chosen (x, y), with width/height from the sprite.
+        If LEVEL_ENDLESS is False, platforms are pre-generated up to LEVEL_LENGTH_PIXELS.
+        Structure per segment: [x, y, w, h].
+        """
+        ground_segments = self.ground_segments = []
+        self.ground_y_base = HEIGHT
+
+        # 1) Starting platform: a long strip made of multiple short sprites
+        start_y = int((PLATFORM_Y_MIN + PLATFORM_Y_MAX) / 2)
+        current_x = 0
+        while current_x < START_GROUND_PIXELS:
+            ground_segments.append([current_x, start_y, PLATFORM_W, PLATFORM_H])
+            current_x += PLATFORM_W
+
+        # 2) Generate the rest along X with gaps, Y within band (very short platforms via crop)
+        limit_x = LEVEL_LENGTH_PIXELS if not LEVEL_ENDLESS else (WIDTH + PLATFORM_W + GEN_BUFFER)
+        while ground_segments[-1][0] + ground_segments[-1][2] < limit_x:
+            ground_segments.append(self.next_platform(ground_segments[-1]))
+
+    def next_platform(self, prev_seg):
+        """Return the segment following prev_seg, with gap and height kept inside the jump envelope.
+        The double-jump table is only used once the pickup is held (it is kept for the rest of the run).
+        """
+        rng = self.rng
+        prev_x, prev_y, prev_w, _prev_h = prev_seg
+        table, min_dy = self.envelope_double if self.double_jump_available else self.envelope_single
+        span = PLATFORM_Y_MAX - PLATFORM_Y_MIN
+        y = rng.randint(PLATFORM_Y_MIN, PLATFORM_Y_MAX)
+        # Lower a platform that is too high to reach with the gap range we use, staying in the band
+        y = max(y, int(prev_y) + min_dy)
+        y = max(PLATFORM_Y_MIN, min(PLATFORM_Y_MAX, y))
+        dy = max(-span, min(span, y - int(prev_y)))
+        cap = min(self.gap_max, table[dy + span])
+        gap = rng.randint(self.gap_min, max(self.gap_min, cap))
+        # Short platform width (single segment); head/tail drawn via cropping
+        seg_w = max(8, int(PLATFORM_W * rng.uniform(SHORT_PLATFORM_MIN_FRAC, SHORT_PLATFORM_MAX_FRAC)))
+        return [prev_x + prev_w + gap, y, seg_w, PLATFORM_H]
+
+    def _on_score_tick(self):
+        self.score += 1
+        self.on_score_changed()
+        self.scheduler.schedule_in(SCORE_TICK_MS, self._on_score_tick)
+
+    def update_difficulty(self):
+        """Look up the ramped tuning values for the current score and run time (table lookups only)."""
+        score, seconds = self.score, self.scheduler.now / 1000.0
+        ramp = difficulty
+        self.scroll_pps = ramp.value("GROUND_SCROLL_PPS", GROUND_SCROLL_PPS, score, seconds)
+        self.gap_min = ramp.value("GAP_MIN", GAP_MIN, score, seconds)
+        self.gap_max = max(self.gap_min, ramp.value("GAP_MAX", GAP_MAX, score, seconds))
+        # at least 1 ms: a scaled interval that rounds to 0 would reschedule a spawn forever at `now`
+        lo = max(1, ramp.value("ARROW_SPAWN_MIN_MS", ARROW_SPAWN_MIN_MS, score, seconds))
+        self.arrow_spawn_ms = (lo, max(lo, ramp.value("ARROW_SPAWN_MAX_MS", ARROW_SPAWN_MAX_MS, score, seconds)))
+        lo = max(1, ramp.value("GOLD_SPAWN_MIN_MS", GOLD_SPAWN_MIN_MS, score, seconds))
+        self.gold_spawn_ms = (lo, max(lo, ramp.value("GOLD_SPAWN_MAX_MS", GOLD_SPAWN_MAX_MS, score, seconds)))
+        self.envelope_single = jump_envelope(False, self.scroll_pps, self.gap_min)
+        self.envelope_double = jump_envelope(True, self.scroll_pps, self.gap_min)
+
+    def on_score_changed(self):
+        """Check score thresholds; called whenever score changes instead of polling every frame."""
+        self.update_difficulty()
+        # Spawn pickup when score reaches next_spawn_score if not already spawned
+        if not self.pickup_spawned and not self.double_jump_available and self.score >= self.next_spawn_score:
+            self.pickup_spawned = True
+            # place pickup somewhere ahead (e.g., middle-right area)
+            self.pickup_x = WIDTH + 200
+            self.pickup_y = HEIGHT - GROUND_BASE_HEIGHT - PICKUP_ABOVE_BASE
+        # Arrows start once the threshold is reached (and the asset is available)
+        if not self.arrows_active and ARROW_IMG is not None and self.score >= ARROW_SPAWN_SCORE_THRESHOLD:
+            self.arrows_active = True
+            self.scheduler.schedule_in(self.rng.randint(*self.arrow_spawn_ms), self._spawn_arrow)
+
+    def _spawn_arrow(self):
+        rng = self.rng
+        # spawn off the right side, random height
+        spawn_side = 'right'  # can extend to random left/right later
+        if spawn_side == 'right':
+            sx = WIDTH + ARROW_OFFSCREEN_MARGIN
+            sy = rng.randint(60, HEIGHT - 120)
+        else:
+            sx = -ARROW_OFFSCREEN_MARGIN
+            sy = rng.randint(60, HEIGHT - 120)
+        # aim at player's current center
+        px = int(self.player_x + player_width/2)
+        py = int(self.player_y + player_height/2)
+        dx = px - sx
+        dy = py - sy
+        dist = math.hypot(dx, dy)
+        if dist <= 0:
+            dist = 1
+        vx = (dx / dist) * ARROW_SPEED
+        vy = (dy / dist) * ARROW_SPEED
+        angle = math.degrees(math.atan2(-vy, vx))
+        if ARROW_BASE_DIRECTION.lower() == 'left':
+            angle += 180.0
+        # the angle never changes, so rotate once here instead of every frame
+        img = pygame.transform.rotate(ARROW_IMG, angle)
+        self.arrows.append({'x': float(sx), 'y': float(sy), 'vx': vx, 'vy': vy, 'angle': angle, 'img': img})
+        self.emit('arrow', sx, sy)
+        self.scheduler.schedule_in(rng.randint(*self.arrow_spawn_ms), self._spawn_arrow)
+
+    def _spawn_gold(self):
+        if len(self.golds) >= GOLD_MAX_ACTIVE:
+            # wait for a free slot; release_gold_slot() spawns it then
+            self.gold_spawn_pending = True
+            return
+        self.gold_spawn_pending = False
+        gx = WIDTH + GOLD_OFFSCREEN_MARGIN
+        # pick a vertical band that is generally near player path
+        gy = self.rng.randint(int(HEIGHT * 0.4), int(HEIGHT * 0.75))
+        self.golds.append({'x': float(gx), 'y': float(gy)})
+        self.scheduler.schedule_in(self.rng.randint(*self.gold_spawn_ms), self._spawn_gold)
+
+    def release_gold_slot(self):
+        """Run a gold spawn that was held back because too many coins were active."""
+        if self.gold_spawn_pending and len(self.golds) < GOLD_MAX_ACTIVE:
+            self._spawn_gold()
+
+    def schedule_run_events(self):
+        """Reset the simulation clock and queue the recurring events of a fresh run."""
+        self.scheduler.clear()
+        self.arrows_active = False
+        self.gold_spawn_pending = False
+        self.scheduler.schedule_in(SCORE_TICK_MS, self._on_score_tick)
+        if GOLD_IMG is not None:
+            self.scheduler.schedule_in(self.rng.randint(*self.gold_spawn_ms), self._spawn_gold)
+
+    def reset_run(self, seed=None):
+        """Reset all per-run state (player, platforms, pickups, arrows, golds, events) for a fresh run."""
+        self.score = 0
+        self.alive = True
+        # simulation time until which a normal jump is still allowed in the air
+        self.coyote_until = -1.0
+        # reset pickup/double-jump state for new run
+        self.double_jump_available = False   # player has pickup and can double-jump
+        self.double_jump_used = False        # whether double jump used during current airtime
+        self.pickup_spawned = False
+        self.pickup_x = 0.0
+        self.pickup_y = 0.0
+        self.next_spawn_score = FIRST_PICKUP_SCORE
+        # per-run counters for telemetry
+        self.golds_collected = 0
+        self.pickups_collected = 0
+        # run time restarts at 0; the ramp starts from its first values
+        self.scheduler.clear()
+        self.update_difficulty()
+        self.anim.reset()
+        self.reset_player()
+        self.begin_run(seed)
+        self.reset_ground()
+        # Align player start height to the first platform
+        if self.ground_segments:
+            first_top = self.ground_segments[0][1]
+            self.player_y = first_top - player_height + player_sprites.ground_foot_offset()
+        # reset arrows and golds
+        self.arrows.clear()
+        self.golds.clear()
+        self.schedule_run_events()
+
+    def player_collision_rect(self):
+        """Reduced collision box used for platforms, arrows and golds: (x, y, w, h)."""
+        collision_width = int(player_width * 0.7)
+        collision_height = int(player_height * 0.8)
+        collision_x = self.player_x + (player_width - collision_width) // 2
+        collision_y = self.player_y + (player_height - collision_height)
+        return collision_x, collision_y, collision_width, collision_height
+
+    def apply_jump(self):
+        """Space pressed: normal jump on the ground (or within coyote time), otherwise the double jump.
+        Returns True if a jump happened.
+        """
+        # Normal jump
+        if self.on_ground or self.scheduler.now <= self.coyote_until:
+            self.player_vel_y = jump_power
+            self.on_ground = False
+            self.double_jump_used = False
+            self.coyote_until = -1.0
+            self.emit('jump', self.player_x + player_width / 2, self.player_y + player_height)
+            return True
+        # Double jump if pickup available and not yet used in this airtime
+        elif self.double_jump_available and not self.double_jump_used:
+            self.player_vel_y = jump_power
+            self.double_jump_used = True
+            self.emit('double_jump', self.player_x + player_width / 2, self.player_y + player_height)
+            return True
+        return False
+
+    def step(self, dt, move_dir=0):
+        """Advance the game simulation by one tick of dt milliseconds.
+        move_dir is -1/0/1 for A/D. Jumps are applied beforehand through apply_jump().
+        Returns 'arrow' or 'fall' when the player died this tick, otherwise None.
+        """
+        ground_segments = self.ground_segments
+        scroll = self.scroll_pps * (dt / 1000.0)
+        foot = player_sprites.ground_foot_offset()
+        was_on_ground = self.on_ground
+        self.player_vel_x = move_dir * PLAYER_MOVE_SPEED
+
+        # Apply horizontal movement
+        player_x = self.player_x + self.player_vel_x
+        # Keep player within screen bounds
+        if player_x < 0:
+            player_x = 0
+        if player_x > WIDTH - player_width:
+            player_x = WIDTH - player_width
+        self.player_x = player_x
+
+        # Apply gravity
+        self.player_vel_y += gravity
+        self.player_y += self.player_vel_y
+
+        # Scroll ground segments (time-based)
+        for seg in ground_segments:
+            seg[0] -= scroll
+
+        # Remove off-screen segments (with buffer)
+        while ground_segments and ground_segments[0][0] + ground_segments[0][2] < -GEN_BUFFER:
+            ground_segments.pop(0)
+
+        # Add new segments if needed (only in endless mode)
+        if LEVEL_ENDLESS:
+            while ground_segments and ground_segments[-1][0] < WIDTH + GEN_BUFFER:
+                ground_segments.append(self.next_platform(ground_segments[-1]))
+
+        # Find platform under the player (if any) - using smaller collision box
+        collision_x, collision_y, collision_width, collision_height = self.player_collision_rect()
+
+        player_bottom = collision_y + collision_height
+        player_on_ground = False
+        if self.player_vel_y >= 0:  # Only check collision if falling
+            for seg in ground_segments:
+                seg_x, seg_y, seg_w, seg_h = seg
+                seg_top = seg_y
+                if collision_x + collision_width > seg_x and collision_x < seg_x + seg_w:
+                    # Player is above this platform
+                    if player_bottom >= seg_top and collision_y < seg_top:
+                        self.player_y = seg_top - player_height + foot
+                        self.player_vel_y = 0
+                        player_on_ground = True
+                        break
+        self.on_ground = player_on_ground
+        # Reset double-jump usage when player lands
+        if self.on_ground:
+            self.double_jump_used = False
+            # Snap feet to ground each frame to avoid any tiny air gap due to rounding
+            for seg in ground_segments:
+                seg_x, seg_y, seg_w, seg_h = seg
+                seg_top = seg_y
+                if collision_x + collision_width > seg_x and collision_x < seg_x + seg_w:
+                    self.player_y = seg_top - player_height + foot
+                    break
+
+        # Update player animation state (jump/fall/run/idle); the frame is looked up when drawn
+        self.anim.update(self.player_vel_y, self.on_ground, self.scheduler.now + dt)
+
+        # Run due score ticks and spawns (arrows, golds, pickup threshold)
+        self.scheduler.advance(dt)
+        # Walked off an edge (no jump): open the coyote window
+        if was_on_ground and not self.on_ground and self.player_vel_y >= 0:
+            self.coyote_until = self.scheduler.now + COYOTE_MS
+
+        # Move pickup with world (same rate as ground)
+        if self.pickup_spawned:
+            self.pickup_x -= scroll
+
+            # If pickup goes off-screen without being collected, schedule next spawn at +10 score
+            if self.pickup_x + pickup_radius < -GEN_BUFFER:
+                self.pickup_spawned = False
+                self.next_spawn_score += 10
+                self.on_score_changed()
+
+            # Collision with player (simple circle-rect overlap)
+            if self.pickup_spawned:
+                px = int(self.player_x + player_width/2)
+                py = int(self.player_y + player_height/2)
+                dx = px - int(self.pickup_x)
+                dy = py - int(self.pickup_y)
+                if dx*dx + dy*dy <= (pickup_radius + max(player_width, player_height)/2)**2:
+                    self.double_jump_available = True
+                    self.pickup_spawned = False
+                    self.pickups_collected += 1
+                    self.emit('diamond', self.pickup_x, self.pickup_y)
+
+        arrows = self.arrows
+        # Arrow updates (spawning is scheduled once the score threshold is reached)
+        if self.arrows_active:
+            # update arrows
+            to_remove = []
+            for i, a in enumerate(arrows):
+                a['x'] += a['vx'] * (dt / 1000.0)
+                a['y'] += a['vy'] * (dt / 1000.0)
+                # remove if far off-screen
+                if (a['x'] < -ARROW_OFFSCREEN_MARGIN*2 or a['x'] > WIDTH + ARROW_OFFSCREEN_MARGIN*2 or
+                    a['y'] < -ARROW_OFFSCREEN_MARGIN*2 or a['y'] > HEIGHT + ARROW_OFFSCREEN_MARGIN*2):
+                    to_remove.append(i)
+            if to_remove:
+                for idx in reversed(to_remove):
+                    arrows.pop(idx)
+
+            # collision with player (use reduced collision rect as above)
+            player_rect = pygame.Rect(*(int(v) for v in self.player_collision_rect()))
+            for a in arrows:
+                # Rotated image gives the proper rect size
+                rect = a['img'].get_rect(center=(int(a['x']), int(a['y'])))
+                if rect.colliderect(player_rect):
+                    self.alive = False
+                    self.emit('death', self.player_x + player_width / 2, self.player_y + player_height / 2)
+                    return 'arrow'
+
+        # Player falls off (dead zone)
+        if self.player_y > HEIGHT:
+            self.alive = False
+            self.emit('death', self.player_x + player_width / 2, HEIGHT)
+            return 'fall'
+
+        golds = self.golds
+        # Gold coin updates (spawning is scheduled)
+        if GOLD_IMG is not None:
+            # move with world and cull
+            to_remove = []
+            for i, g in enumerate(golds):
+                g['x'] -= scroll
+                if g['x'] < -GOLD_OFFSCREEN_MARGIN * 2:
+                    to_remove.append(i)
+            if to_remove:
+                for idx in reversed(to_remove):
+                    golds.pop(idx)
+                self.release_gold_slot()
+
+            # collision with player
+            player_rect = pygame.Rect(*(int(v) for v in self.player_collision_rect()))
+            to_remove = []
+            for i, g in enumerate(golds):
+                rect = GOLD_IMG.get_rect(center=(int(g['x']), int(g['y'])))
+                if rect.colliderect(player_rect):
+                    to_remove.append(i)
+                    # increment score when collected
+                    self.score += 1
+                    self.golds_collected += 1
+                    self.emit('gold', g['x'], g['y'])
+            if to_remove:
+                for idx in reversed(to_remove):
+                    golds.pop(idx)
+                self.on_score_changed()
+                self.release_gold_slot()
+        return None
+
+# Immutable copy of what drawing needs from a session, published by the simulation thread
+SessionSnapshot = namedtuple("SessionSnapshot", "wall now alive score player_x player_y anim anim_started "
+                             "platforms arrows golds pickup double_jump_available scroll_pps")
+
+def session_snapshot(session, wall):
+    """Snapshot of session at wall-clock time `wall` (tuples only; shares no mutable state)."""
+    return SessionSnapshot(wall, session.scheduler.now, session.alive, session.score,
+                           session.player_x, session.player_y,
+                           session.anim.current_animation, session.anim.started_ms,
+                           tuple(tuple(seg) for seg in session.ground_segments),
+                           tuple((a['x'], a['y'], a['vx'], a['vy'], a['img']) for a in session.arrows),
+                           tuple((g['x'], g['y']) for g in session.golds),
+                           (session.pickup_x, session.pickup_y) if session.pickup_spawned else None,
+                           session.double_jump_available, session.scroll_pps)
+
+class _Clock:
+    __slots__ = ("now",)
+
+    def __init__(self, now):
+        self.now = now
+
+class SessionView:
+    """What draw_frame() reads from a session, interpolated between two snapshots.
+    alpha 0 is `prev`, 1 is `cur`. World objects are moved back from their `cur` position by
+    the part of the last tick not yet shown; only the player is blended between both.
+    """
+    def __init__(self, prev, cur, alpha):
+        if prev is None or cur.now < prev.now:
+            # first snapshot of a run: nothing to blend with
+            prev, alpha = cur, 1.0
+        back = 1.0 - alpha
+        tick_s = (cur.now - prev.now) / 1000.0
+        shift = cur.scroll_pps * tick_s * back
+        self.scheduler = _Clock(prev.now + (cur.now - prev.now) * alpha)
+        self.alive = cur.alive
+        self.score = cur.score
+        self.player_x = prev.player_x + (cur.player_x - prev.player_x) * alpha
+        self.player_y = prev.player_y + (cur.player_y - prev.player_y) * alpha
+        self.anim = PlayerAnimation(player_clips)
+        self.anim.current_animation = cur.anim
+        self.anim.started_ms = cur.anim_started
+        self.ground_segments = [(x + shift, y, w, h) for x, y, w, h in cur.platforms]
+        self.arrows = [{'x': x - vx * tick_s * back, 'y': y - vy * tick_s * back, 'img': img}
+                       for x, y, vx, vy, img in cur.arrows]
+        self.golds = [{'x': x + shift, 'y': y} for x, y in cur.golds]
+        self.pickup_spawned = cur.pickup is not None
+        self.pickup_x, self.pickup_y = (cur.pickup[0] + shift, cur.pickup[1]) if cur.pickup else (0.0, 0.0)
+        self.double_jump_available = cur.double_jump_available
+        self.scroll_pps = cur.scroll_pps
 
 BEST_SCORE_FILE = "best_score.txt"
+LEADERBOARD_FILE = "leaderboard.log"
+LEADERBOARD_SIZE = 10
+TELEMETRY_FILE = "telemetry.bin"
+GHOST_FILE = "best_ghost.bin"
+# Scores live in memory; disk writes happen on the store's background thread (set by setup())
+score_store = None
+# Sound effects are decoded once by setup(); play() during the game never touches the disk
+audio = None
+
 def get_best_score():
-    try:
-        with open(BEST_SCORE_FILE, "r") as f:
-            return int(f.read().strip())
-    except Exception:
-        return 0
+    return score_store.best_score
+
+def record_run_score(session):
+    """Add the session's finished run to the leaderboard and return the best score."""
+    return score_store.record_run(session.score, seed=session.run_seed, duration_ms=session.scheduler.now)
 
-def set_best_score(new_score):
-    with open(BEST_SCORE_FILE, "w") as f:
-        f.write(str(new_score))
+
+def save_ghost(session, recorder, ghost):
+    """Keep the finished run as the ghost if it beat the current one; returns the ghost to show.
+    The file is written on the score store's thread.
+    """
+    if session.score > (ghost.score if ghost is not None else 0):
+        data = recorder.finish(session.score, session.run_seed)
+        score_store.write_file(GHOST_FILE, data)
+        print(f"[ghost] new best run ({session.score}): {recorder.samples} ticks in {len(data)} bytes")
+        ghost = GhostPlayer(data)
+    recorder.reset()
+    return ghost
 
 
 def show_menu():
@@ -841,383 +1379,666 @@ def show_dead_menu(current_score, best_score):
         pygame.display.flip()
         clock.tick(FPS)
 
-def handle_death():
+def handle_death(session):
     """Handle player's death (arrow hit or fall). Returns action to continue or quit the loop."""
-    global score, score_timer, double_jump_available, double_jump_used, pickup_spawned, next_spawn_score
-    best_score = get_best_score()
-    if score > best_score:
-        set_best_score(score)
-        best_score = score
-    choice = show_dead_menu(score, best_score)
+    best_score = record_run_score(session)
+    play_death_effect(session)
+    choice = show_dead_menu(session.score, best_score)
     if choice == 'restart':
-        # reset game state
-        score = 0
-        score_timer = 0
-        reset_player()
-        reset_ground()
-        if ground_segments:
-            first_top = ground_segments[0][1]
-            player_y_local = first_top - player_height + (player_sprites.ground_foot_offset() if hasattr(player_sprites, 'ground_foot_offset') else 0)
-            globals()['player_y'] = player_y_local
-        # reset pickup/double-jump state for new run
-        double_jump_available = False
-        double_jump_used = False
-        pickup_spawned = False
-        next_spawn_score = 10
-        # reset arrows and golds
-        globals()['arrows'].clear()
-        globals()['arrow_spawn_timer'] = 0
-        globals()['arrow_next_spawn'] = random.randint(ARROW_SPAWN_MIN_MS, ARROW_SPAWN_MAX_MS)
-        globals()['golds'].clear()
-        globals()['gold_spawn_timer'] = 0
-        globals()['gold_next_spawn'] = random.randint(GOLD_SPAWN_MIN_MS, GOLD_SPAWN_MAX_MS)
+        session.reset_run()
         return 'continue'
     elif choice == 'menu':
         go_start = show_menu()
         if go_start:
-            score = 0
-            score_timer = 0
-            reset_player()
-            reset_ground()
-            if ground_segments:
-                first_top = ground_segments[0][1]
-                globals()['player_y'] = first_top - player_height + (player_sprites.ground_foot_offset() if hasattr(player_sprites, 'ground_foot_offset') else 0)
-            double_jump_available = False
-            double_jump_used = False
-            pickup_spawned = False
-            next_spawn_score = 10
-            globals()['arrows'].clear()
-            globals()['arrow_spawn_timer'] = 0
-            globals()['arrow_next_spawn'] = random.randint(ARROW_SPAWN_MIN_MS, ARROW_SPAWN_MAX_MS)
-            globals()['golds'].clear()
-            globals()['gold_spawn_timer'] = 0
-            globals()['gold_next_spawn'] = random.randint(GOLD_SPAWN_MIN_MS, GOLD_SPAWN_MAX_MS)
+            session.reset_run()
             return 'continue'
         else:
             return 'quit'
     else:
         return 'quit'
 
-# Main game loop
-# Show start menu first
-start = show_menu()
-if not start:
-    pygame.quit()
-    sys.exit()
-
-running = True
-while running:
-    dt = clock.tick(FPS)  # milliseconds since last frame
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_SPACE:
-                # Normal jump
-                if on_ground:
-                    player_vel_y = jump_power
-                    on_ground = False
-                    double_jump_used = False
-                # Double jump if pickup available and not yet used in this airtime
-                elif double_jump_available and not double_jump_used:
-                    player_vel_y = jump_power
-                    double_jump_used = True
-
-    # Get pressed keys
-    keys = pygame.key.get_pressed()
-    player_vel_x = 0
-    if keys[pygame.K_a]:
-        player_vel_x = -7
-    if keys[pygame.K_d]:
-        player_vel_x = 7
-
-    # Apply horizontal movement
-    player_x += player_vel_x
-    # Keep player within screen bounds
-    if player_x < 0:
-        player_x = 0
-    if player_x > WIDTH - player_width:
-        player_x = WIDTH - player_width
-
-    # Apply gravity
-    player_vel_y += gravity
-    player_y += player_vel_y
-
-    # Scroll ground segments (time-based)
-    for seg in ground_segments:
-        seg[0] -= GROUND_SCROLL_PPS * (dt / 1000.0)
-
-    # Remove off-screen segments (with buffer)
-    while ground_segments and ground_segments[0][0] + ground_segments[0][2] < -GEN_BUFFER:
-        ground_segments.pop(0)
-
-    # Add new segments if needed (only in endless mode)
-    if LEVEL_ENDLESS:
-        while ground_segments and ground_segments[-1][0] < WIDTH + GEN_BUFFER:
-            gap = random.randint(GAP_MIN, GAP_MAX)
-            new_x = ground_segments[-1][0] + ground_segments[-1][2] + gap
-            new_y = random.randint(PLATFORM_Y_MIN, PLATFORM_Y_MAX)
-            # Short platform width (single segment); head/tail drawn via cropping
-            seg_w = max(8, int(PLATFORM_W * random.uniform(SHORT_PLATFORM_MIN_FRAC, SHORT_PLATFORM_MAX_FRAC)))
-            ground_segments.append([new_x, new_y, seg_w, PLATFORM_H])
-
-    # Find platform under the player (if any) - using smaller collision box
-    collision_width = int(player_width * 0.7)
-    collision_height = int(player_height * 0.8)
-    collision_x = player_x + (player_width - collision_width) // 2
-    collision_y = player_y + (player_height - collision_height)
-
-    player_bottom = collision_y + collision_height
-    player_on_ground = False
-    if player_vel_y >= 0:  # Only check collision if falling
-        for seg in ground_segments:
-            seg_x, seg_y, seg_w, seg_h = seg
-            seg_top = seg_y
-            if collision_x + collision_width > seg_x and collision_x < seg_x + seg_w:
-                # Player is above this platform
-                if player_bottom >= seg_top and collision_y < seg_top:
-                    player_y = seg_top - player_height + player_sprites.ground_foot_offset()
-                    player_vel_y = 0
-                    player_on_ground = True
-                    break
-    on_ground = player_on_ground
-    # Reset double-jump usage when player lands
-    if on_ground:
-        double_jump_used = False
-        # Snap feet to ground each frame to avoid any tiny air gap due to rounding
-        for seg in ground_segments:
-            seg_x, seg_y, seg_w, seg_h = seg
-            seg_top = seg_y
-            if collision_x + collision_width > seg_x and collision_x < seg_x + seg_w:
-                player_y = seg_top - player_height + player_sprites.ground_foot_offset()
-                break
-    
-    # Update player animation based on state
-    if player_vel_y < -2:  # Jumping up
-        player_sprites.set_animation('jump')
-    elif player_vel_y > 2:  # Falling down
-        player_sprites.set_animation('fall')
-    elif on_ground:  # On ground - running
-        player_sprites.set_animation('run')
-    else:  # Default to idle
-        player_sprites.set_animation('idle')
-    
-    # Update sprite animation
-    player_sprites.update()
-
-    # Score: add 1 point every second
-    score_timer += dt
-    if score_timer >= 1000:
-        score += 1
-        score_timer -= 1000
-
-    # Spawn pickup logic: spawn when score reaches next_spawn_score if not already spawned
-    if not pickup_spawned and not double_jump_available and score >= next_spawn_score:
-        # spawn pickup ahead of player
-        pickup_spawned = True
-        # place pickup somewhere ahead (e.g., middle-right area)
-        pickup_x = WIDTH + 200
-        pickup_y = HEIGHT - GROUND_BASE_HEIGHT - PICKUP_ABOVE_BASE
-
-    # Move pickup with world (same rate as ground)
-    if pickup_spawned:
-        pickup_x -= GROUND_SCROLL_PPS * (dt / 1000.0)
-
-        # If pickup goes off-screen without being collected, schedule next spawn at +10 score
-        if pickup_x + pickup_radius < -GEN_BUFFER:
-            pickup_spawned = False
-            next_spawn_score += 10
-
-        # Collision with player (simple circle-rect overlap)
-        if pickup_spawned:
-            px = int(player_x + player_width/2)
-            py = int(player_y + player_height/2)
-            dx = px - int(pickup_x)
-            dy = py - int(pickup_y)
-            if dx*dx + dy*dy <= (pickup_radius + max(player_width, player_height)/2)**2:
-                double_jump_available = True
-                pickup_spawned = False
-
-    # Arrow spawning and updates (active when score threshold reached and asset available)
-    if ARROW_IMG is not None and score >= ARROW_SPAWN_SCORE_THRESHOLD:
-        arrow_spawn_timer += dt
-        if arrow_spawn_timer >= arrow_next_spawn:
-            arrow_spawn_timer -= arrow_next_spawn
-            arrow_next_spawn = random.randint(ARROW_SPAWN_MIN_MS, ARROW_SPAWN_MAX_MS)
-            # spawn off the right side, random height
-            spawn_side = 'right'  # can extend to random left/right later
-            if spawn_side == 'right':
-                sx = WIDTH + ARROW_OFFSCREEN_MARGIN
-                sy = random.randint(60, HEIGHT - 120)
-            else:
-                sx = -ARROW_OFFSCREEN_MARGIN
-                sy = random.randint(60, HEIGHT - 120)
-            # aim at player's current center
-            px = int(player_x + player_width/2)
-            py = int(player_y + player_height/2)
-            dx = px - sx
-            dy = py - sy
-            dist = math.hypot(dx, dy)
-            if dist <= 0:
-                dist = 1
-            vx = (dx / dist) * ARROW_SPEED
-            vy = (dy / dist) * ARROW_SPEED
-            angle = math.degrees(math.atan2(-vy, vx))
-            if ARROW_BASE_DIRECTION.lower() == 'left':
-                angle += 180.0
-            arrows.append({'x': float(sx), 'y': float(sy), 'vx': vx, 'vy': vy, 'angle': angle})
-
-        # update arrows
-        to_remove = []
-        for i, a in enumerate(arrows):
-            a['x'] += a['vx'] * (dt / 1000.0)
-            a['y'] += a['vy'] * (dt / 1000.0)
-            # remove if far off-screen
-            if (a['x'] < -ARROW_OFFSCREEN_MARGIN*2 or a['x'] > WIDTH + ARROW_OFFSCREEN_MARGIN*2 or
-                a['y'] < -ARROW_OFFSCREEN_MARGIN*2 or a['y'] > HEIGHT + ARROW_OFFSCREEN_MARGIN*2):
-                to_remove.append(i)
-        if to_remove:
-            for idx in reversed(to_remove):
-                arrows.pop(idx)
-
-        # collision with player (use reduced collision rect as above)
-        collision_width = int(player_width * 0.7)
-        collision_height = int(player_height * 0.8)
-        collision_x = player_x + (player_width - collision_width) // 2
-        collision_y = player_y + (player_height - collision_height)
-        player_rect = pygame.Rect(int(collision_x), int(collision_y), int(collision_width), int(collision_height))
-        hit = False
-        for a in arrows:
-            # Rotate image for proper rect size
-            rotated = pygame.transform.rotate(ARROW_IMG, a['angle'])
-            rect = rotated.get_rect(center=(int(a['x']), int(a['y'])))
-            if rect.colliderect(player_rect):
-                hit = True
-                break
-        if hit:
-            act = handle_death()
-            if act == 'continue':
-                # start next loop iteration cleanly
-                continue
-            else:
-                running = False
-                break
-
-    # Restart game if player falls off (dead zone)
-    if player_y > HEIGHT:
-        act = handle_death()
-        if act == 'continue':
-            continue
-        else:
-            running = False
-            break
+render_graph = RenderGraph((WIDTH, HEIGHT))
+# Coin, diamond, double-jump and death bursts (None without NumPy or a window)
+particles = None
+DEATH_EFFECT_MS = 600
 
+def play_death_effect(session, duration_ms=DEATH_EFFECT_MS):
+    """Hold the last frame for a moment while the death burst plays out."""
+    if particles is None:
+        return
+    end = pygame.time.get_ticks() + duration_ms
+    while pygame.time.get_ticks() < end:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                # leave it for the dead menu
+                pygame.event.post(event)
+                return
+        particles.update(clock.tick(FPS))
+        draw_frame(session, 0)
+        pygame.display.flip()
+    particles.clear()
+
+# Other racers are drawn as translucent copies of the shared player frames
+OTHER_PLAYER_ALPHA = 90
+# the ghost shares the translucent copies of the racers instead of caching a second set
+GHOST_ALPHA = OTHER_PLAYER_ALPHA
+_translucent_frames = {}
+
+def translucent_frame(surf, alpha=OTHER_PLAYER_ALPHA):
+    """Cached copy of a player frame with a surface alpha applied (built once per frame image)."""
+    key = (surf, alpha)
+    faded = _translucent_frames.get(key)
+    if faded is None:
+        faded = surf.copy()
+        faded.set_alpha(alpha)
+        _translucent_frames[key] = faded
+    return faded
+
+def draw_frame(session, dt, others=(), ghost=None):
+    """Draw background, platforms, pickups, arrows, golds, player and HUD to the screen (no flip).
+    The world is the one of `session`; players of the `others` sessions are drawn translucent,
+    and so is the `ghost` (a GhostPlayer) at the same run time.
+    """
     # Draw background (fill if no layers present)
-    if background and background.layers:
+    if background and background.layers and pacer.level < QUALITY_NO_PARALLAX:
         # Update before drawing so it moves every frame
-        background.update(dt)
+        background.update(dt, session.scroll_pps)
         # Optional: base fill behind translucent images
         screen.fill((135, 206, 235))
-        background.draw(screen)
+        render_graph.extend(LAYER_BACKGROUND, background.blit_commands())
     else:
         # Fallback sky color if no background image provided yet
         screen.fill((135, 206, 235))
 
-    # Draw platforms (single-sprite floating platforms)
-    for seg in ground_segments:
+    # Platforms (single-sprite floating platforms)
+    for seg in session.ground_segments:
         seg_x, seg_y, seg_w, seg_h = seg
-        if GROUND_TILE_IMG is not None or PLATFORM_IMG is not None:
-            draw_ground_tiled(screen, GROUND_TILE_IMG, seg_x, seg_y, seg_w, seg_h)
+        # skip the crop maths for platforms in the off-screen generation buffer
+        if not render_graph.visible(LAYER_PLATFORMS, seg_x, seg_y, seg_w, max(seg_h, PLATFORM_H)):
+            continue
+        cmds = platform_blit_commands(GROUND_TILE_IMG, seg_x, seg_y, seg_w)
+        if cmds:
+            render_graph.extend(LAYER_PLATFORMS, cmds)
         else:
-            pygame.draw.rect(screen, (50, 205, 50), (int(seg_x), int(seg_y), seg_w, seg_h))
+            render_graph.add_primitive(LAYER_PLATFORMS, pygame.draw.rect, (50, 205, 50), (int(seg_x), int(seg_y), seg_w, seg_h))
 
-    # Draw pickup if spawned (use diamond sprite if available)
-    if pickup_spawned:
-        if 'DIAMOND_IMG' in globals() and DIAMOND_IMG is not None:
-            rect = DIAMOND_IMG.get_rect(center=(int(pickup_x), int(pickup_y)))
-            screen.blit(DIAMOND_IMG, rect.topleft)
+    # Pickup if spawned (use diamond sprite if available)
+    if session.pickup_spawned:
+        if DIAMOND_IMG is not None:
+            rect = DIAMOND_IMG.get_rect(center=(int(session.pickup_x), int(session.pickup_y)))
+            render_graph.add(LAYER_PICKUPS, DIAMOND_IMG, rect.topleft)
         else:
-            pygame.draw.circle(screen, (255, 215, 0), (int(pickup_x), int(pickup_y)), pickup_radius)
+            render_graph.add_primitive(LAYER_PICKUPS, pygame.draw.circle, (255, 215, 0), (int(session.pickup_x), int(session.pickup_y)), pickup_radius)
 
-    # Gold coin spawning and updates
+    # Golds (below player)
     if GOLD_IMG is not None:
-        # spawn
-        gold_spawn_timer += dt
-        if len(golds) < GOLD_MAX_ACTIVE and gold_spawn_timer >= gold_next_spawn:
-            gold_spawn_timer -= gold_next_spawn
-            gold_next_spawn = random.randint(GOLD_SPAWN_MIN_MS, GOLD_SPAWN_MAX_MS)
-            gx = WIDTH + GOLD_OFFSCREEN_MARGIN
-            # pick a vertical band that is generally near player path
-            gy = random.randint(int(HEIGHT * 0.4), int(HEIGHT * 0.75))
-            golds.append({'x': float(gx), 'y': float(gy)})
-        # move with world and cull
-        to_remove = []
-        for i, g in enumerate(golds):
-            g['x'] -= GROUND_SCROLL_PPS * (dt / 1000.0)
-            if g['x'] < -GOLD_OFFSCREEN_MARGIN * 2:
-                to_remove.append(i)
-        if to_remove:
-            for idx in reversed(to_remove):
-                golds.pop(idx)
-
-        # collision with player
-        collision_width = int(player_width * 0.7)
-        collision_height = int(player_height * 0.8)
-        collision_x = player_x + (player_width - collision_width) // 2
-        collision_y = player_y + (player_height - collision_height)
-        player_rect = pygame.Rect(int(collision_x), int(collision_y), int(collision_width), int(collision_height))
-        to_remove = []
-        for i, g in enumerate(golds):
-            rect = GOLD_IMG.get_rect(center=(int(g['x']), int(g['y'])))
-            if rect.colliderect(player_rect):
-                to_remove.append(i)
-                # increment score when collected
-                score += 1
-        if to_remove:
-            for idx in reversed(to_remove):
-                golds.pop(idx)
-
-    # Draw arrows above platforms and pickup, below the player
-    if ARROW_IMG is not None and arrows:
-        for a in arrows:
-            rotated = pygame.transform.rotate(ARROW_IMG, a['angle'])
-            rect = rotated.get_rect(center=(int(a['x']), int(a['y'])))
-            screen.blit(rotated, rect.topleft)
-
-    # Draw indicator if player has double-jump available (use diamond HUD sprite if available)
-    if double_jump_available:
-        if DIAMOND_HUD_IMG is not None:
-            rect = DIAMOND_HUD_IMG.get_rect(center=(28, 60))
-            screen.blit(DIAMOND_HUD_IMG, rect.topleft)
-        else:
-            pygame.draw.circle(screen, (30, 144, 255), (20, 60), 12)
-
-    # Draw golds (below player)
-    if GOLD_IMG is not None and golds:
-        for g in golds:
+        for g in session.golds:
             rect = GOLD_IMG.get_rect(center=(int(g['x']), int(g['y'])))
-            screen.blit(GOLD_IMG, rect.topleft)
-
-    # Draw player sprite
-    current_sprite = player_sprites.get_current_sprite()
+            render_graph.add(LAYER_PICKUPS, GOLD_IMG, rect.topleft)
+
+    # Arrows above platforms and pickups, below the player
+    for a in session.arrows:
+        rect = a['img'].get_rect(center=(int(a['x']), int(a['y'])))
+        render_graph.add(LAYER_HAZARDS, a['img'], rect.topleft)
+
+    # Best run's ghost, at the tick this run has reached
+    if ghost is not None and ghost.seek(int(round(session.scheduler.now / ghost.tick_ms)) - 1):
+        clip = player_clips.get(ghost.anim)
+        if clip is not None:
+            frame, foot = clip.frame_at(ghost.anim_ms)
+            render_graph.add(LAYER_PLAYER, translucent_frame(frame, GHOST_ALPHA),
+                             (ghost.x, ghost.y + player_sprites.draw_shift(foot)))
+
+    # Other racers behind the followed player
+    for other in others:
+        sprite, foot = other.anim.current_frame(other.scheduler.now)
+        if sprite:
+            render_graph.add(LAYER_PLAYER, translucent_frame(sprite), (int(other.player_x), int(other.player_y + player_sprites.draw_shift(foot))))
+
+    # Player sprite
+    current_sprite, foot = session.anim.current_frame(session.scheduler.now)
     if current_sprite:
-        # Draw a couple pixels lower to visually close any tiny residual gap
-        screen.blit(current_sprite, (player_x, int(player_y + player_sprites.draw_offset_down)))
+        # Line this frame's feet up with the ground baseline (plus the small visual nudge)
+        render_graph.add(LAYER_PLAYER, current_sprite, (int(session.player_x), int(session.player_y + player_sprites.draw_shift(foot))))
     else:
         # Fallback to rectangle if sprites fail to load
-        pygame.draw.rect(screen, (255, 100, 100), (player_x, int(player_y), player_width, player_height))
+        render_graph.add_primitive(LAYER_PLAYER, pygame.draw.rect, (255, 100, 100), (int(session.player_x), int(session.player_y), player_width, player_height))
+
+    # Particles over the players, below the HUD
+    if particles is not None:
+        particles.update(dt, session.scroll_pps)
+        particles.draw(render_graph, LAYER_EFFECTS)
+
+    # Indicator if player has double-jump available (use diamond HUD sprite if available)
+    if session.double_jump_available:
+        if DIAMOND_HUD_IMG is not None:
+            rect = DIAMOND_HUD_IMG.get_rect(center=(28, 60))
+            render_graph.add(LAYER_HUD, DIAMOND_HUD_IMG, rect.topleft)
+        else:
+            render_graph.add_primitive(LAYER_HUD, pygame.draw.circle, (30, 144, 255), (20, 60), 12)
 
-    # Draw score (top-right), on top of everything with outline and bg
-    text_str = f"Score: {score}"
+    # Score (top-right), on top of everything with outline and bg
+    text_str = f"Score: {session.score}"
     # Measure to right-align
-    tmp = font.render(text_str, True, (255,255,255))
-    tx = WIDTH - tmp.get_width() - 20
+    tx = WIDTH - font.size(text_str)[0] - 20
     ty = 20
-    draw_text_with_outline(screen, text_str, font, (tx, ty), color=(255,255,255), outline_color=(0,0,0), outline=2, bg_alpha=120)
+    hud_outline = 2 if pacer.level < QUALITY_NO_OUTLINE else 0
+    render_graph.extend(LAYER_HUD, text_with_outline_blits(text_str, font, (tx, ty), color=(255,255,255), outline_color=(0,0,0), outline=hud_outline, bg_alpha=120))
 
     # No around frame overlay
+    render_graph.submit(screen)
+
+# Constants a config profile may set, grouped by what has to be rebuilt when they change
+CONFIG_LAYOUT = ("WIDTH", "HEIGHT")
+CONFIG_PHYSICS = ("GROUND_SCROLL_PPS", "GAP_MIN", "GAP_MAX", "PLAYER_MOVE_SPEED", "gravity", "jump_power")
+CONFIG_ASSETS = {
+    "ARROW_TARGET_LONG": "arrow",
+    "GOLD_TARGET_LONG": "gold",
+    "DIAMOND_TARGET_LONG": "diamond",
+    "DIAMOND_HUD_LONG": "diamond",
+    "PLATFORM_TARGET_HEIGHT": "platform",
+}
+# read when the next spawn is scheduled or the next frame runs; nothing to rebuild
+CONFIG_TUNING = ("ARROW_SPEED", "ARROW_SPAWN_SCORE_THRESHOLD", "ARROW_SPAWN_MIN_MS", "ARROW_SPAWN_MAX_MS",
+                 "GOLD_SPAWN_MIN_MS", "GOLD_SPAWN_MAX_MS", "GOLD_MAX_ACTIVE", "SCORE_TICK_MS", "COYOTE_MS")
+# intervals the scheduler repeats and sizes things are laid out with; 0 or less would make the
+# event queue spin forever or set_mode fail
+CONFIG_POSITIVE = CONFIG_LAYOUT + tuple(CONFIG_ASSETS) + ("SCORE_TICK_MS", "ARROW_SPAWN_MIN_MS", "ARROW_SPAWN_MAX_MS",
+                                                          "GOLD_SPAWN_MIN_MS", "GOLD_SPAWN_MAX_MS")
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles.json")
+
+def apply_config(changed, allow_resize=True):
+    """Apply changed tuning constants between frames, rebuilding only what depends on them.
+    Returns True when the screen size changed, in which case runs in progress must restart
+    (platform heights and spawn positions are laid out for the old size).
+    """
+    global screen, background
+    global PLATFORM_Y_MIN, PLATFORM_Y_MAX, START_GROUND_PIXELS, LEVEL_LENGTH_PIXELS, GEN_BUFFER, safe_area_segments
+    global JUMP_AIRTIME_SINGLE, JUMP_AIRTIME_DOUBLE, difficulty
+    known = set(CONFIG_LAYOUT) | set(CONFIG_PHYSICS) | set(CONFIG_ASSETS) | set(CONFIG_TUNING) | {"DIFFICULTY_RAMP"}
+    g = globals()
+    # convert and validate everything before touching a global, so a bad value in the file
+    # is skipped instead of crashing the game or leaving half of a reload applied
+    converted = {}
+    ramp = None
+    for name, value in changed.items():
+        if name not in known:
+            print(f"[config] ignoring unknown setting {name}")
+            continue
+        if name in CONFIG_LAYOUT and not allow_resize:
+            print(f"[config] {name} change needs a restart while recording")
+            continue
+        try:
+            if name == "DIFFICULTY_RAMP":
+                if value is not None and not isinstance(value, dict):
+                    raise TypeError(f"expected an object of curves, not {type(value).__name__}")
+                value = value or {}
+                ramp = DifficultyRamp(value)
+            else:
+                # keep the type of the built-in default (ints stay ints for randint and pixel maths)
+                if value is None or isinstance(value, (dict, list)):
+                    raise TypeError(f"expected {type(g[name]).__name__}, not {type(value).__name__}")
+                value = type(g[name])(value)
+                if name in CONFIG_POSITIVE and not value > 0:
+                    raise ValueError("must be greater than 0")
+        except (ValueError, KeyError, TypeError, OverflowError) as e:
+            print(f"[config] {name}: bad value {value!r} ignored ({e})")
+            continue
+        converted[name] = value
+
+    applied = []
+    for name, value in converted.items():
+        if g[name] != value:
+            print(f"[config] {name}: {g[name]} -> {value}")
+            g[name] = value
+            applied.append(name)
+    if not applied:
+        return False
+
+    resized = any(name in CONFIG_LAYOUT for name in applied)
+    if resized:
+        # same formulas as at the definitions above
+        PLATFORM_Y_MIN = int(HEIGHT * 0.66)
+        PLATFORM_Y_MAX = int(HEIGHT * 0.82)
+        START_GROUND_PIXELS = max(GROUND_WIDTH * 3, int(WIDTH * 0.6))
+        LEVEL_LENGTH_PIXELS = int(WIDTH * 6)
+        safe_area_segments = int(WIDTH // GROUND_WIDTH) + 1
+        GEN_BUFFER = WIDTH
+        render_graph.view_w, render_graph.view_h = WIDTH, HEIGHT
+        if _window:
+            screen = pygame.display.set_mode((WIDTH, HEIGHT))
+            background = create_background()
+            scale_menu_background()
+            print(f"[config] rebuilt screen, background and menu for {WIDTH}x{HEIGHT}")
+
+    assets = sorted({CONFIG_ASSETS[name] for name in applied if name in CONFIG_ASSETS})
+    if assets:
+        rescale_assets(assets)
+        print(f"[config] rescaled {', '.join(assets)}")
+
+    if resized or any(name in CONFIG_PHYSICS for name in applied):
+        if resized or "gravity" in applied or "jump_power" in applied:
+            JUMP_AIRTIME_SINGLE = _jump_airtimes(False)
+            JUMP_AIRTIME_DOUBLE = _jump_airtimes(True)
+        _jump_envelopes.clear()
+
+    if "DIFFICULTY_RAMP" in applied:
+        difficulty = ramp
+        print(f"[config] difficulty curves: {', '.join(sorted(difficulty.curves)) or 'none'}")
+    return resized
+
+_window = False  # set once setup() opened the window
+
+def setup(window=True):
+    """Start pygame and load what the game needs; call before creating sessions.
+
+    window=False is for headless users of the simulation (runner_env workers, tests): only the
+    display module starts, on a 1x1 mode so images can still be converted, and the window,
+    fonts, backgrounds, particles, score store and audio are skipped. A later call with
+    window=True adds them. Calling it again for what is already set up does nothing.
+    """
+    global screen, pacer, assets, player_sprites, player_clips, _raw_menu_bg, background, GROUND_TILE_IMG
+    global _ARROW_SRC, _GOLD_SRC, _DIAMOND_SRC, font, title_font, button_font
+    global JUMP_AIRTIME_SINGLE, JUMP_AIRTIME_DOUBLE, score_store, audio, particles, _window
+    if window and not _window:
+        with startup.phase("pygame.init"):
+            # small mixer buffer: effects start within a frame of their trigger
+            pygame.mixer.pre_init(44100, -16, 2, 512)
+            pygame.init()
+        with startup.phase("set_mode"):
+            screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Endless Runner")
+        pacer = FramePacer(1000.0 / FPS, QUALITY_LEVELS)
+    elif pygame.display.get_surface() is None:
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+
+    if player_sprites is None:
+        # what the simulation reads: platform and arrow/gold sizes, the player's foot offset
+        with startup.phase("asset manifest"):
+            assets = AssetManifest(os.path.dirname(os.path.abspath(__file__)))
+        with startup.phase("PlayerSprites()"):
+            player_sprites = PlayerSprites()
+        with startup.phase("player clips"):
+            player_clips = build_player_clips(player_sprites)
+        with startup.phase("load_ground_tile"):
+            GROUND_TILE_IMG = load_ground_tile()
+        with startup.phase("load arrow image"):
+            _ARROW_SRC = _load_arrow_image()
+        with startup.phase("load gold image"):
+            _GOLD_SRC = _load_gold_image()
+        with startup.phase("load diamond image"):
+            _DIAMOND_SRC = _load_diamond_image()
+        for asset in ("arrow", "gold", "diamond", "platform"):
+            with startup.phase(f"scale {asset}"):
+                rescale_assets((asset,))
+        with startup.phase("jump airtimes"):
+            JUMP_AIRTIME_SINGLE = _jump_airtimes(False)
+            JUMP_AIRTIME_DOUBLE = _jump_airtimes(True)
+
+    if window and not _window:
+        with startup.phase("load menu background"):
+            try:
+                _raw_menu_bg = _load_menu_background_image()
+            except Exception:
+                _raw_menu_bg = None
+        with startup.phase("scale menu background"):
+            scale_menu_background()
+        with startup.phase("create_background"):
+            background = create_background()
+        with startup.phase("get_font"):
+            font = get_font()
+        with startup.phase("get_title_font"):
+            title_font = get_title_font(56)
+        with startup.phase("button font"):
+            button_font = pygame.font.SysFont(None, 36)
+        with startup.phase("score store"):
+            score_store = ScoreStore(BEST_SCORE_FILE, LEADERBOARD_FILE, top_n=LEADERBOARD_SIZE)
+        with startup.phase("audio"):
+            audio = AudioEngine(assets)
+        particles = ParticleSystem() if ParticleSystem.available else None
+        _window = True
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Endless Runner")
+    parser.add_argument("--record", metavar="DIR", help="record frames into DIR (encoded in a separate process)")
+    parser.add_argument("--record-format", choices=("raw", "png"), default="raw", help="frame file format for --record")
+    parser.add_argument("--record-every", type=int, default=1, metavar="N", help="record every Nth frame")
+    parser.add_argument("--autopilot", action="store_true", help="let the rule-based bot play (skips menus, restarts on death)")
+    parser.add_argument("--soak-minutes", type=float, default=0, metavar="M", help="with --autopilot: quit after M minutes")
+    parser.add_argument("--soak-report", type=float, default=60.0, metavar="S", help="seconds between soak reports")
+    parser.add_argument("--profile", default="default", metavar="NAME",
+                        help="tuning profile from the config file (default, low-end, stress); edits hot-reload")
+    parser.add_argument("--config", default=CONFIG_FILE, metavar="FILE", help="JSON file with the tuning profiles")
+    parser.add_argument("--bots", type=int, default=0, metavar="N",
+                        help="race N autopilot sessions on the same seed (implies --autopilot); the leader is followed")
+    parser.add_argument("--bench-sessions", type=int, default=0, metavar="N",
+                        help="measure headless simulation throughput for 1..N sessions in one process and exit")
+    parser.add_argument("--startup-profile", nargs="?", const="", default=None, metavar="FILE",
+                        help="print the start-up phase timings when the menu is reached (or write them to FILE as JSON)")
+    parser.add_argument("--surface-audit", action="store_true",
+                        help="log the format and measured blit cost of every loaded surface at startup")
+    parser.add_argument("--memprofile", type=float, nargs="?", const=60.0, default=None, metavar="S",
+                        help="sample tracemalloc/GC/Surface counts every S seconds and report at exit")
+    parser.add_argument("--telemetry", default=TELEMETRY_FILE, metavar="FILE",
+                        help="append binary run telemetry to FILE (read it with telemetry_analyze.py)")
+    parser.add_argument("--no-telemetry", action="store_true", help="do not write run telemetry")
+    parser.add_argument("--no-ghost", action="store_true", help="neither show nor record the best run's ghost")
+    parser.add_argument("--threaded", action="store_true",
+                        help="simulate on a separate thread and draw interpolated snapshots (single session)")
+    # parse_known_args: menu.py calls main() without arguments, so sys.argv is the menu's
+    args, _unknown = parser.parse_known_args(argv)
+    return args
+
+def shutdown(exporter=None, memprof=None, telemetry=None):
+    """Flush background writers and close pygame before exiting."""
+    if telemetry is not None:
+        telemetry.close()
+    if memprof is not None:
+        memprof.close()
+    if exporter is not None:
+        exporter.close()
+    score_store.close()
+    pygame.quit()
+
+def bench_sessions(max_sessions, seconds=2.0):
+    """Print simulation throughput (autopilot + step, no drawing) for 1..max_sessions sessions."""
+    import time
+    from autopilot import Autopilot
+    game = sys.modules[__name__]
+    pilot = Autopilot(game)
+    base = None
+    for count in range(1, max_sessions + 1):
+        sessions = [GameSession(seed=i) for i in range(count)]
+        steps = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            for session in sessions:
+                jump, move = pilot.decide(session)
+                if jump:
+                    session.apply_jump()
+                if session.step(SIM_STEP_MS, move):
+                    session.reset_run()
+            steps += count
+        rate = steps / (time.perf_counter() - start)
+        base = base or rate
+        print(f"[bench] {count} session(s): {rate:9.0f} session-steps/s, "
+              f"{rate / count:8.0f} per session, scaling {rate / base:.2f}x")
+
+def main(argv=None):
+    """Show the start menu, then run the game loop until the player quits."""
+    args = parse_args(argv)
+    setup()
+    config = None
+    if os.path.exists(args.config) or args.profile != "default":
+        with startup.phase("config profile"):
+            from config import ConfigProfiles
+            config = ConfigProfiles(args.config, args.profile)
+            apply_config(config.values)
+    if args.surface_audit:
+        from surfaces import audit
+        audit((WIDTH, HEIGHT))
+
+    exporter = None
+    if args.record:
+        from frame_export import FrameExporter
+        exporter = FrameExporter((WIDTH, HEIGHT), args.record, fmt=args.record_format, every=args.record_every)
+
+    memprof = None
+    if args.memprofile is not None:
+        from memprofile import MemoryProfiler
+        memprof = MemoryProfiler(args.memprofile)
+
+    if args.bench_sessions > 0:
+        bench_sessions(args.bench_sessions)
+        shutdown(exporter, memprof)
+        sys.exit()
+
+    telemetry = None
+    if not args.no_telemetry:
+        from telemetry import TelemetryWriter
+        telemetry = TelemetryWriter(args.telemetry)
+
+    bots = max(args.bots, 1 if args.autopilot else 0)
+    # One session normally; with --bots every racer gets its own session on a shared seed
+    with startup.phase("GameSession() / reset_ground"):
+        sessions = [GameSession() for _ in range(max(1, bots))]
+        for session in sessions[1:]:
+            session.reset_run(sessions[0].run_seed)
+
+    # Start-up ends where the menu (or the unattended run) begins
+    startup.finish("menu" if not bots else "first frame")
+    if args.startup_profile is not None:
+        if args.startup_profile:
+            startup.write_json(args.startup_profile)
+            print(f"[startup] wrote {args.startup_profile} ({startup.total_ms:.1f} ms to {startup.finished_at})")
+        else:
+            startup.report()
+
+    pilots = soak = None
+    if bots:
+        from autopilot import Autopilot, SoakMonitor
+        game = sys.modules[__name__]
+        # spread the preferred screen position so racers on the same level take different lines
+        pilots = [Autopilot(game, home_frac=0.3 + 0.1 * (i % 3) - 0.05 * (i // 3)) for i in range(bots)]
+        soak = SoakMonitor(args.soak_report, render_stats=lambda: render_graph.last_stats)
+        soak_end_ms = args.soak_minutes * 60000.0 if args.soak_minutes > 0 else None
+    else:
+        start = show_menu()
+        if not start:
+            shutdown(exporter, memprof, telemetry)
+            sys.exit()
+
+    inputs = [InputState(JUMP_BUFFER_MS) for _ in sessions]
+    # With --threaded one session is simulated on its own thread (see sim_thread.py)
+    threaded = args.threaded and len(sessions) == 1 and exporter is None
+    if args.threaded and not threaded:
+        print("[threaded] needs a single session and no --record; running serially")
+    # Sound and particles follow the run the camera follows: the player's, or the leading
+    # bot's. The simulation thread only queues the events; they are played and emitted on
+    # the render thread.
+    effects = []
+    if audio.enabled:
+        effects.append(lambda event, x, y: audio.play(event))
+    if particles is not None:
+        effects.append(particles.emit)
+    pending_effects = deque()
+    followed = sessions[0]
+
+    def effects_of(source):
+        def listener(event, x, y):
+            if source is followed:
+                for effect in effects:
+                    effect(event, x, y)
+        return listener
+
+    if threaded:
+        sessions[0].listeners.append(lambda event, x, y: pending_effects.append((event, x, y)))
+    else:
+        for session in sessions:
+            session.listeners.append(effects_of(session))
+    # Every session records its run; a run that beats the ghost's score becomes the new ghost
+    ghost = None
+    recorders = [None] * len(sessions)
+    if not args.no_ghost:
+        ghost = GhostPlayer.load(GHOST_FILE)
+        recorders = [GhostRecorder(list(player_clips), SIM_STEP_MS) for _ in sessions]
+    input_state = inputs[0]
+
+    def run_tick(session, inp, recorder, tick_end):
+        """One simulation tick of one session: input, step, telemetry, ghost. Returns the death cause."""
+        nonlocal ghost
+        inp.apply_until(tick_end)
+        if inp.buffered_jump(tick_end) is not None and session.apply_jump():
+            inp.consume_jump()
+        cause = session.step(SIM_STEP_MS, inp.move_dir())
+        if telemetry is not None:
+            if cause:
+                telemetry.run_ended(session, cause)
+            else:
+                telemetry.tick(session)
+        if recorder is not None:
+            if cause:
+                ghost = save_ghost(session, recorder, ghost)
+            else:
+                anim = session.anim
+                recorder.sample(session.player_x, session.player_y, anim.current_animation,
+                                session.scheduler.now - anim.started_ms)
+        if cause:
+            inp.clear()
+            if pilots is not None:
+                soak.death(session.score)
+                record_run_score(session)
+        return cause
+
+    sim = None
+    sim_paused = contextlib.nullcontext()
+    if threaded:
+        from sim_thread import SimThread
+
+        def sim_tick(tick_end):
+            session = sessions[0]
+            if session.alive:
+                if pilots is not None:
+                    # the bot reads the world, so it decides on this thread, once per tick
+                    inputs[0].push_virtual(tick_end - SIM_STEP_MS, *pilots[0].decide(session))
+                run_tick(session, inputs[0], recorders[0], tick_end)
+            return session_snapshot(session, tick_end)
+
+        sim = SimThread(sim_tick, SIM_STEP_MS, MAX_SIM_STEPS_PER_FRAME, clock=pygame.time.get_ticks)
+        sim.start(session_snapshot(sessions[0], float(pygame.time.get_ticks())))
+        # holding the lock pauses the simulation between two ticks
+        sim_paused = sim.lock
+        print("[threaded] simulation runs on its own thread")
+    # Wall-clock time (pygame ticks) the simulation has caught up to
+    sim_wall = float(pygame.time.get_ticks())
+    running = True
+    while running:
+        dt = clock.tick(FPS)  # milliseconds since last frame
+        # Work time of the previous frame (without the tick delay) drives the quality level
+        pacer.record(clock.get_rawtime())
+        now = pygame.time.get_ticks()
+        if now - sim_wall > MAX_SIM_STEPS_PER_FRAME * SIM_STEP_MS:
+            sim_wall = now - MAX_SIM_STEPS_PER_FRAME * SIM_STEP_MS
+        # Events without an SDL timestamp count as pressed at the start of this frame's ticks
+        # (threaded: at pump time, the simulation thread applies them at its next tick)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            input_state.push_event(event, sim_wall if sim is None else now)
+
+        # The bots replace the keyboard but feed the same input queue
+        if pilots is not None:
+            if sim is None:
+                for pilot, session, inp in zip(pilots, sessions, inputs):
+                    if session.alive:
+                        inp.push_virtual(sim_wall, *pilot.decide(session))
+            soak.frame(clock.get_rawtime())
+            if soak_end_ms is not None and now >= soak_end_ms:
+                running = False
+        if memprof is not None:
+            memprof.tick()
+        if telemetry is not None:
+            telemetry.frame(clock.get_rawtime())
+        audio.frame()
+
+        death = None
+        if sim is None:
+            # Fixed-step simulation: run every whole tick up to now, applying input at its tick
+            while sim_wall + SIM_STEP_MS <= now:
+                tick_end = sim_wall + SIM_STEP_MS
+                for session, inp, recorder in zip(sessions, inputs, recorders):
+                    if session.alive:
+                        run_tick(session, inp, recorder, tick_end)
+                sim_wall = tick_end
+                death = not any(session.alive for session in sessions)
+                if death:
+                    break
+        else:
+            prev, cur = sim.latest()
+            death = not cur.alive
+            while pending_effects:
+                event, x, y = pending_effects.popleft()
+                for effect in effects:
+                    effect(event, x, y)
+        if pilots is None:
+            input_state.sync_held(pygame.key.get_pressed())
+
+        if death:
+            with sim_paused:
+                if pilots is not None:
+                    # unattended: start over without menus, every racer on a fresh shared seed
+                    if len(sessions) > 1:
+                        standings = sorted(range(len(sessions)), key=lambda i: -sessions[i].score)
+                        print("[bots] seed %d: " % sessions[0].run_seed +
+                              ", ".join(f"#{i} {sessions[i].score}" for i in standings))
+                    sessions[0].reset_run()
+                    for session in sessions[1:]:
+                        session.reset_run(sessions[0].run_seed)
+                    act = 'continue'
+                else:
+                    act = handle_death(sessions[0])
+                # the menus took wall time; do not simulate it
+                sim_wall = float(pygame.time.get_ticks())
+                if sim is not None:
+                    pending_effects.clear()
+                    sim.resync(session_snapshot(sessions[0], sim_wall))
+            if particles is not None:
+                particles.clear()
+            if act == 'continue':
+                # start next loop iteration cleanly
+                continue
+            else:
+                running = False
+                break
 
-    pygame.display.flip()
+        # Safe point for config reloads: between simulation ticks, before drawing
+        if config is not None:
+            changed = config.poll()
+            if changed:
+                with sim_paused:
+                    if apply_config(changed, allow_resize=exporter is None):
+                        if telemetry is not None:
+                            for session in sessions:
+                                telemetry.run_ended(session, "quit")
+                        for recorder in recorders:
+                            if recorder is not None:
+                                recorder.reset()
+                        sessions[0].reset_run()
+                        for session in sessions[1:]:
+                            session.reset_run(sessions[0].run_seed)
+                    else:
+                        # new base values or curves apply now instead of at the next score change
+                        for session in sessions:
+                            session.update_difficulty()
+                    if sim is not None:
+                        sim.resync(session_snapshot(sessions[0], float(pygame.time.get_ticks())))
+
+        if sim is None:
+            # Follow the leading racer; the others are drawn translucent
+            live = [session for session in sessions if session.alive]
+            followed = max(live, key=lambda session: session.score)
+            draw_frame(followed, dt, [session for session in live if session is not followed], ghost)
+        else:
+            # Draw one tick behind the simulation, blending the two latest snapshots
+            prev, cur = sim.latest()
+            span = cur.wall - prev.wall
+            alpha = min(1.0, max(0.0, (now - SIM_STEP_MS - prev.wall) / span)) if span > 0 else 1.0
+            draw_frame(SessionView(prev, cur, alpha), dt, (), ghost)
+        if exporter is not None:
+            exporter.submit(screen)
+        pygame.display.flip()
+        input_state.frame_presented(pygame.time.get_ticks())
+
+    if sim is not None:
+        sim.stop()
+    if soak is not None:
+        soak.report()
+    stats = input_state.latency_stats()
+    if stats:
+        print("[input] jump press-to-flip latency: %d samples, avg %.1f ms, p95 %.1f ms, max %.1f ms" % stats)
+    shutdown(exporter, memprof, telemetry)
+    sys.exit()
 
-pygame.quit()
-sys.exit()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Record gameplay frames without stalling the game loop.
+
+The game copies each frame from the screen's pixel view straight into a slot of a
+shared-memory ring; a separate encoder process writes the slots to disk and hands them back.
+When every slot is still busy the frame is dropped (and counted) instead of waiting.
+
+The encoder is this file run as a script, so the child never imports the game (whose
+module-level setup would otherwise run a second time): filled slots go to its stdin as
+"slot frame_no" lines and it answers with the slot number on stdout once it is free again.
+"""
+import os
+import queue
+import subprocess
+import sys
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pygame
+
+
+def _attach(shm_name):
+    """Open the game's shared block without letting this process's resource tracker unlink it."""
+    try:
+        return shared_memory.SharedMemory(name=shm_name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _encoder_main(shm_name, slots, size, out_dir, fmt, inp, out):
+    w, h = size
+    shm = _attach(shm_name)
+    frames = np.ndarray((slots, w, h, 3), dtype=np.uint8, buffer=shm.buf)
+    os.makedirs(out_dir, exist_ok=True)
+    try:
+        for line in inp:
+            slot, frame_no = (int(v) for v in line.split())
+            if fmt == "png":
+                surf = pygame.surfarray.make_surface(frames[slot])
+                pygame.image.save(surf, os.path.join(out_dir, f"frame_{frame_no:06d}.png"))
+            else:
+                # raw RGB24, row-major (height, width, 3)
+                with open(os.path.join(out_dir, f"frame_{frame_no:06d}.rgb"), "wb") as f:
+                    f.write(frames[slot].transpose(1, 0, 2).tobytes())
+            out.write(f"{slot}\n")
+            out.flush()
+    finally:
+        del frames
+        shm.close()
+
+
+class FrameExporter:
+    """Shared-memory frame ring plus an encoder process writing raw or PNG sequences."""
+
+    def __init__(self, size, out_dir, fmt="raw", slots=8, every=1):
+        w, h = size
+        self.size = (w, h)
+        self.every = max(1, int(every))
+        self.frame_no = 0
+        self.written = 0
+        self.dropped = 0
+        self._shm = shared_memory.SharedMemory(create=True, size=slots * w * h * 3)
+        self._frames = np.ndarray((slots, w, h, 3), dtype=np.uint8, buffer=self._shm.buf)
+        self._free = queue.Queue()
+        for i in range(slots):
+            self._free.put(i)
+        env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+        self._proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), self._shm.name, str(slots),
+                                       str(w), str(h), out_dir, fmt],
+                                      stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1, env=env)
+        # hands the slots the encoder is done with back to submit()
+        self._returns = threading.Thread(target=self._collect, name="record", daemon=True)
+        self._returns.start()
+        print(f"[record] Writing {fmt} frames to {out_dir} ({slots} slots)")
+
+    def _collect(self):
+        for line in self._proc.stdout:
+            self._free.put(int(line))
+
+    def submit(self, surface):
+        """Queue the surface's current pixels; never blocks. Returns False if the frame was dropped."""
+        self.frame_no += 1
+        if self.frame_no % self.every:
+            return False
+        try:
+            slot = self._free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        # pixels3d is a view into the surface (no intermediate copy); it locks until released
+        view = pygame.surfarray.pixels3d(surface)
+        self._frames[slot][...] = view
+        del view
+        try:
+            self._proc.stdin.write(f"{slot} {self.frame_no}\n")
+        except OSError:
+            # the encoder is gone; keep playing without it
+            self.dropped += 1
+            return False
+        self.written += 1
+        return True
+
+    def close(self):
+        try:
+            self._proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self._proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+        self._returns.join(timeout=1)
+        del self._frames
+        self._shm.close()
+        self._shm.unlink()
+        print(f"[record] {self.written} frames recorded, {self.dropped} dropped")
+
+
+if __name__ == "__main__":
+    # encoder process: frame_export.py SHM_NAME SLOTS WIDTH HEIGHT OUT_DIR FORMAT
+    _name, _slots, _w, _h, _out_dir, _fmt = sys.argv[1:7]
+    _encoder_main(_name, int(_slots), (int(_w), int(_h)), _out_dir, _fmt, sys.stdin, sys.stdout)
@@ -0,0 +1,162 @@
+"""Ghost runs: the best run's player trajectory, stored compactly and replayed in later runs.
+
+One sample (x, y, animation id, animation time) is taken per simulation tick. The frame index
+is kept as the clip time in ticks, which the clip turns back into the exact frame, and which
+simply counts up by one between animation switches. Samples are stored as deltas from the
+previous one, with y as a second difference (change of the per-tick y step, which is constant
+under gravity), and runs of identical deltas are collapsed into one record:
+
+    record = varint(count - 1 << 1 | anim_changed) [varint(anim id)] zz(dx) zz(ddy) zz(dtime)
+
+zz() is a zigzag varint. Running along a platform or flying one jump arc is a handful of
+records, so a ten-minute run takes a few kilobytes. GhostPlayer decodes the stream forward in
+place as the run's tick advances; it keeps only integers and the byte offset it has reached.
+"""
+import struct
+
+MAGIC = b"ERGH"
+VERSION = 1
+# magic, version, score, seed, samples, tick (ms), length of the animation names
+HEADER = struct.Struct("<4sHIIIdH")
+
+
+def _put_varint(out, v):
+    while v >= 0x80:
+        out.append((v & 0x7F) | 0x80)
+        v >>= 7
+    out.append(v)
+
+
+def _put_zigzag(out, v):
+    _put_varint(out, (v << 1) if v >= 0 else ((-v << 1) - 1))
+
+
+class GhostRecorder:
+    """Collect one run's samples; finish() returns the encoded ghost."""
+
+    def __init__(self, anim_names, tick_ms):
+        self.anim_names = list(anim_names)
+        self._anim_ids = {name: i for i, name in enumerate(self.anim_names)}
+        self.tick_ms = tick_ms
+        self.reset()
+
+    def reset(self):
+        self.samples = 0
+        self._out = bytearray()
+        self._x = self._y = self._dy = self._time = 0
+        self._anim = -1
+        # pending record: (anim id or -1, dx, ddy, dtime) and how many samples it covers
+        self._pending = None
+        self._count = 0
+
+    def _flush(self):
+        if self._pending is None:
+            return
+        anim, dx, ddy, dtime = self._pending
+        _put_varint(self._out, ((self._count - 1) << 1) | (anim >= 0))
+        if anim >= 0:
+            _put_varint(self._out, anim)
+        _put_zigzag(self._out, dx)
+        _put_zigzag(self._out, ddy)
+        _put_zigzag(self._out, dtime)
+        self._pending = None
+        self._count = 0
+
+    def sample(self, x, y, anim_name, anim_ms):
+        """Record one tick: player position and the animation shown, anim_ms into its clip."""
+        x, y = int(round(x)), int(round(y))
+        anim = self._anim_ids.get(anim_name, 0)
+        t = int(round(anim_ms / self.tick_ms))
+        dy = y - self._y
+        rec = (anim if anim != self._anim else -1, x - self._x, dy - self._dy, t - self._time)
+        # identical deltas extend the pending record; an animation switch starts a new one
+        if rec[0] < 0 and self._pending is not None and rec[1:] == self._pending[1:]:
+            self._count += 1
+        else:
+            self._flush()
+            self._pending = rec
+            self._count = 1
+        self._x, self._y, self._dy, self._time, self._anim = x, y, dy, t, anim
+        self.samples += 1
+
+    def finish(self, score, seed):
+        self._flush()
+        names = ",".join(self.anim_names).encode("ascii")
+        header = HEADER.pack(MAGIC, VERSION, int(score), int(seed or 0) & 0xFFFFFFFF, self.samples,
+                             self.tick_ms, len(names))
+        return header + names + bytes(self._out)
+
+
+class GhostPlayer:
+    """Replay an encoded ghost: seek(tick) moves x, y, anim and anim_ms to that sample."""
+
+    def __init__(self, data):
+        magic, version, self.score, self.seed, self.samples, self.tick_ms, names_len = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a ghost file")
+        start = HEADER.size + names_len
+        self.anim_names = bytes(data[HEADER.size:start]).decode("ascii").split(",")
+        self.data = bytes(data)
+        self._start = start
+        self.rewind()
+
+    @classmethod
+    def load(cls, path):
+        """The ghost stored at path, or None if there is none (or it is unreadable)."""
+        try:
+            with open(path, "rb") as f:
+                return cls(f.read())
+        except (OSError, ValueError, struct.error, UnicodeDecodeError):
+            return None
+
+    def rewind(self):
+        self.tick = -1
+        self.x = self.y = self._dy = self._time = 0
+        self.anim_ms = 0.0
+        self.anim = self.anim_names[0]
+        self._pos = self._start
+        self._left = 0
+        self._dx = self._ddy = self._dtime = 0
+
+    def _varint(self):
+        data, pos = self.data, self._pos
+        shift = v = 0
+        while True:
+            b = data[pos]
+            pos += 1
+            v |= (b & 0x7F) << shift
+            if b < 0x80:
+                self._pos = pos
+                return v
+            shift += 7
+
+    def _zigzag(self):
+        v = self._varint()
+        return (v >> 1) ^ -(v & 1)
+
+    def _next(self):
+        if not self._left:
+            head = self._varint()
+            self._left = (head >> 1) + 1
+            if head & 1:
+                self.anim = self.anim_names[self._varint()]
+            self._dx = self._zigzag()
+            self._ddy = self._zigzag()
+            self._dtime = self._zigzag()
+        self._left -= 1
+        self.x += self._dx
+        self._dy += self._ddy
+        self.y += self._dy
+        self._time += self._dtime
+        self.tick += 1
+
+    def seek(self, tick):
+        """Advance to sample `tick` (0-based); returns False once the ghost's run has ended."""
+        if tick >= self.samples:
+            return False
+        if tick < self.tick:
+            self.rewind()
+        while self.tick < tick:
+            self._next()
+        self.anim_ms = self._time * self.tick_ms
+        return tick >= 0
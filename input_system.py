@@ -0,0 +1,109 @@
+"""Timestamped input for the fixed-step simulation.
+
+Key events are stamped when they are pumped (or with the SDL timestamp when pygame exposes
+one) and queued. The fixed-step loop then applies each event before the first simulation
+tick that ends after it, instead of applying everything at the start of the next frame.
+Space presses stay buffered for a short window, so a press made just before landing still
+jumps. The time from a press to the flip that first shows its jump is recorded as latency.
+"""
+from collections import deque
+
+import pygame
+
+
+class InputState:
+    def __init__(self, jump_buffer_ms=120.0, latency_samples=512):
+        self.jump_buffer_ms = jump_buffer_ms
+        self._events = deque()          # (timestamp_ms, kind, value) not yet applied
+        self.left_held = False
+        self.right_held = False
+        self.jump_pressed_at = None     # timestamp of the buffered Space press
+        self._shown_pending = []        # press timestamps whose jump has not been flipped yet
+        self.latencies = deque(maxlen=latency_samples)
+
+    @staticmethod
+    def _stamp(event, now_ms):
+        # pygame-ce exposes the SDL event time; plain pygame does not, so use pump time
+        return float(getattr(event, "timestamp", now_ms) or now_ms)
+
+    def push_event(self, event, now_ms):
+        """Queue a KEYDOWN/KEYUP event that matters to the game."""
+        if event.type not in (pygame.KEYDOWN, pygame.KEYUP):
+            return
+        down = event.type == pygame.KEYDOWN
+        t = self._stamp(event, now_ms)
+        if event.key == pygame.K_SPACE and down:
+            self._events.append((t, "jump", True))
+        elif event.key == pygame.K_a:
+            self._events.append((t, "left", down))
+        elif event.key == pygame.K_d:
+            self._events.append((t, "right", down))
+
+    def push_virtual(self, now_ms, jump, move_dir):
+        """Feed input from a bot (autopilot) through the same queue as the keyboard."""
+        if jump:
+            self._events.append((now_ms, "jump", True))
+        self._events.append((now_ms, "left", move_dir < 0))
+        self._events.append((now_ms, "right", move_dir > 0))
+
+    def apply_until(self, t_ms):
+        """Apply queued events stamped at or before t_ms (the end of the tick about to run)."""
+        events = self._events
+        while events and events[0][0] <= t_ms:
+            t, kind, value = events.popleft()
+            if kind == "jump":
+                self.jump_pressed_at = t
+            elif kind == "left":
+                self.left_held = value
+            else:
+                self.right_held = value
+
+    def move_dir(self):
+        # D wins over A, as in the original get_pressed() handling
+        if self.right_held:
+            return 1
+        if self.left_held:
+            return -1
+        return 0
+
+    def buffered_jump(self, t_ms):
+        """Timestamp of a Space press still inside the buffer window at t_ms, else None."""
+        if self.jump_pressed_at is None:
+            return None
+        if t_ms - self.jump_pressed_at > self.jump_buffer_ms:
+            self.jump_pressed_at = None
+            return None
+        return self.jump_pressed_at
+
+    def consume_jump(self):
+        """The buffered press turned into a jump; remember it for latency measurement."""
+        if self.jump_pressed_at is not None:
+            self._shown_pending.append(self.jump_pressed_at)
+        self.jump_pressed_at = None
+
+    def sync_held(self, keys):
+        """Reconcile held A/D with pygame.key.get_pressed() in case a KEYUP was missed (focus loss)."""
+        if not self._events:
+            self.left_held = bool(keys[pygame.K_a])
+            self.right_held = bool(keys[pygame.K_d])
+
+    def frame_presented(self, now_ms):
+        """Call right after display.flip(); records press-to-photon latency for applied jumps."""
+        if self._shown_pending:
+            # swap rather than clear: with a simulation thread, consume_jump() may append meanwhile
+            shown, self._shown_pending = self._shown_pending, []
+            for t in shown:
+                self.latencies.append(now_ms - t)
+
+    def clear(self):
+        self._events.clear()
+        self.jump_pressed_at = None
+        self._shown_pending.clear()
+
+    def latency_stats(self):
+        """(count, average, p95, max) of recorded jump latencies in ms, or None without samples."""
+        if not self.latencies:
+            return None
+        data = sorted(self.latencies)
+        p95 = data[min(len(data) - 1, int(len(data) * 0.95))]
+        return len(data), sum(data) / len(data), p95, data[-1]
@@ -0,0 +1,132 @@
+"""Opt-in memory instrumentation for long sessions.
+
+Samples tracemalloc snapshots, GC generation counts and the number of reachable pygame
+Surfaces, and reports the top allocating subsystems (the function a line belongs to) both
+periodically and at exit, so a multi-hour run can be checked for a flat footprint.
+"""
+import ast
+import gc
+import os
+import time
+import tracemalloc
+
+import pygame
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class _FunctionIndex:
+    """Map (filename, lineno) of project files to the innermost enclosing function name."""
+
+    def __init__(self):
+        self._spans = {}
+
+    def _load(self, filename):
+        spans = []
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                tree = ast.parse(f.read(), filename)
+        except (OSError, SyntaxError, ValueError):
+            self._spans[filename] = spans
+            return spans
+
+        def visit(node, prefix):
+            for child in ast.iter_child_nodes(node):
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                    name = prefix + child.name
+                    spans.append((child.lineno, child.end_lineno, name))
+                    visit(child, name + ".")
+        visit(tree, "")
+        # innermost spans last so the final match wins
+        spans.sort(key=lambda s: (s[0], -s[1]))
+        self._spans[filename] = spans
+        return spans
+
+    def subsystem(self, filename, lineno):
+        if not filename.startswith(PROJECT_DIR):
+            # third-party / stdlib allocations are grouped by top-level package
+            parts = filename.replace("\\", "/").split("/site-packages/")
+            return parts[-1].split("/")[0] if len(parts) > 1 else os.path.basename(filename)
+        spans = self._spans.get(filename)
+        if spans is None:
+            spans = self._load(filename)
+        name = "<module>"
+        for start, end, qual in spans:
+            if start > lineno:
+                break
+            if lineno <= end:
+                name = qual
+        return f"{os.path.basename(filename)}:{name}"
+
+
+def count_surfaces():
+    """Number of distinct pygame.Surface objects reachable from GC-tracked containers and frames."""
+    seen = set()
+    for obj in gc.get_objects():
+        for ref in gc.get_referents(obj):
+            if isinstance(ref, pygame.Surface):
+                seen.add(id(ref))
+    return len(seen)
+
+
+class MemoryProfiler:
+    def __init__(self, interval_s=60.0, top=8, log=print):
+        self.interval_s = interval_s
+        self.top = top
+        self._log = log
+        self._index = _FunctionIndex()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(1)
+        self._filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            # the profiler's own bookkeeping (ast index of project files)
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, ast.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ]
+        self._first = None
+        self._prev = None
+        self._last = time.perf_counter()
+        self.samples = 0
+        self.sample()
+
+    def tick(self):
+        """Call once per frame; takes a sample when the interval has passed."""
+        now = time.perf_counter()
+        if now - self._last >= self.interval_s:
+            self._last = now
+            self.sample()
+
+    def _by_subsystem(self, stats):
+        totals = {}
+        for stat in stats:
+            frame = stat.traceback[0]
+            key = self._index.subsystem(frame.filename, frame.lineno)
+            size, count = totals.get(key, (0, 0))
+            totals[key] = (size + stat.size_diff, count + stat.count_diff)
+        return sorted(totals.items(), key=lambda kv: abs(kv[1][0]), reverse=True)
+
+    def sample(self, final=False):
+        snap = tracemalloc.take_snapshot().filter_traces(self._filters)
+        current, peak = tracemalloc.get_traced_memory()
+        self.samples += 1
+        gen_counts = gc.get_count()
+        collections = [s["collections"] for s in gc.get_stats()]
+        label = "exit" if final else f"sample {self.samples}"
+        self._log(f"[mem] {label}: traced {current / 1024:.0f} KiB (peak {peak / 1024:.0f} KiB), "
+                  f"gc counts {gen_counts}, collections {collections}, surfaces {count_surfaces()}")
+        base = self._first if final else self._prev
+        if base is not None:
+            what = "since start" if final else "since last sample"
+            self._log(f"[mem] top allocators {what}:")
+            for key, (size, count) in self._by_subsystem(snap.compare_to(base, "lineno"))[:self.top]:
+                self._log(f"[mem]   {size / 1024:+9.1f} KiB {count:+7d} blocks  {key}")
+        if self._first is None:
+            self._first = snap
+        self._prev = snap
+
+    def close(self):
+        self.sample(final=True)
+        tracemalloc.stop()
@@ -28,6 +28,7 @@ while running:
             if start_button_rect.collidepoint(mouse_pos):
                 # Start the game
                 import endlessrunner
+                endlessrunner.main()
                 sys.exit()
             if quit_button_rect.collidepoint(mouse_pos):
                 running = False
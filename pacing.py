@@ -0,0 +1,56 @@
+from collections import deque
+
+
+class FramePacer:
+    """Watch rolling frame work times and step render quality down under sustained overload.
+
+    record() takes the time spent on a frame (excluding the clock.tick sleep). When the rolling
+    average stays above budget * degrade_ratio the level goes up by one (less quality); when it
+    stays below budget * recover_ratio the level comes back down. After every change the window
+    is cleared so one decision is based on a full window of fresh samples.
+    """
+
+    def __init__(self, budget_ms, levels, window=90, degrade_ratio=1.1, recover_ratio=0.6, log=print):
+        self.budget_ms = float(budget_ms)
+        self.levels = list(levels)
+        self.window = window
+        self.degrade_ms = self.budget_ms * degrade_ratio
+        self.recover_ms = self.budget_ms * recover_ratio
+        self.level = 0
+        self._samples = deque(maxlen=window)
+        self._total = 0.0
+        self._log = log
+        if self._log:
+            self._log(f"[pacing] budget {self.budget_ms:.1f} ms, degrade above {self.degrade_ms:.1f} ms, "
+                      f"recover below {self.recover_ms:.1f} ms (window {window} frames)")
+
+    @property
+    def level_name(self):
+        return self.levels[self.level]
+
+    def average_ms(self):
+        return self._total / len(self._samples) if self._samples else 0.0
+
+    def record(self, frame_ms):
+        """Add one frame's work time; returns True when the quality level changed."""
+        if len(self._samples) == self._samples.maxlen:
+            self._total -= self._samples[0]
+        self._samples.append(frame_ms)
+        self._total += frame_ms
+        if len(self._samples) < self.window:
+            return False
+        avg = self._total / len(self._samples)
+        if avg > self.degrade_ms and self.level < len(self.levels) - 1:
+            return self._set_level(self.level + 1, avg)
+        if avg < self.recover_ms and self.level > 0:
+            return self._set_level(self.level - 1, avg)
+        return False
+
+    def _set_level(self, level, avg):
+        old = self.levels[self.level]
+        self.level = level
+        self._samples.clear()
+        self._total = 0.0
+        if self._log:
+            self._log(f"[pacing] avg frame {avg:.1f} ms: quality {old} -> {self.levels[level]}")
+        return True
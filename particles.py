@@ -0,0 +1,115 @@
+"""Particle effects (coin sparks, double-jump dust, diamond and death bursts) on NumPy arrays.
+
+Particles live in fixed-size structure-of-arrays storage used as a ring: a burst is written at
+the ring head, so when the budget is full the oldest particles are the ones overwritten. One
+vectorized pass per frame moves and ages all of them; drawing picks, per live on-screen
+particle, one of a few pre-rendered sprites (kind x fade step) and hands the batch to the
+render graph, which submits it with a single blits() call.
+
+NumPy is optional for the game: without it ParticleSystem.available is False and the game
+runs without effects.
+"""
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # effects are cosmetic; the game runs without them
+    np = None
+
+DEFAULT_BUDGET = 768
+FADE_STEPS = 4
+# event -> (colour, radius, count, speed px/s (min, max), life ms (min, max), gravity px/s^2, angle deg (from, to))
+EFFECTS = {
+    "gold": ((255, 215, 64), 3, 10, (80, 220), (250, 450), 500.0, (0, 360)),
+    "diamond": ((90, 200, 255), 4, 28, (120, 320), (350, 700), 300.0, (0, 360)),
+    "double_jump": ((235, 235, 235), 3, 14, (60, 180), (200, 380), 0.0, (200, 340)),
+    "death": ((220, 40, 40), 4, 40, (100, 420), (400, 800), 900.0, (0, 360)),
+}
+
+
+def _sprite(colour, radius, alpha):
+    size = radius * 2 + 1
+    surf = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.circle(surf, colour + (alpha,), (radius, radius), radius)
+    return surf.convert_alpha() if pygame.display.get_surface() else surf
+
+
+class ParticleSystem:
+    available = np is not None
+
+    def __init__(self, budget=DEFAULT_BUDGET, effects=EFFECTS, seed=0):
+        self.budget = budget
+        self.effects = effects
+        self.kinds = {name: i for i, name in enumerate(effects)}
+        self.rng = np.random.default_rng(seed)
+        self.x = np.zeros(budget, np.float32)
+        self.y = np.zeros(budget, np.float32)
+        self.vx = np.zeros(budget, np.float32)
+        self.vy = np.zeros(budget, np.float32)
+        self.age = np.zeros(budget, np.float32)
+        self.life = np.zeros(budget, np.float32)  # 0 = free slot
+        self.gravity = np.zeros(budget, np.float32)
+        self.kind = np.zeros(budget, np.int32)
+        self.head = 0
+        self.evicted = 0
+        # sprite index = kind * FADE_STEPS + fade step; offsets centre the sprite on the particle
+        self.sprites = []
+        self.offsets = np.zeros(len(effects) * FADE_STEPS, np.float32)
+        for k, (colour, radius, *_rest) in enumerate(effects.values()):
+            for step in range(FADE_STEPS):
+                self.sprites.append(_sprite(colour, radius, 255 - step * 255 // FADE_STEPS))
+                self.offsets[k * FADE_STEPS + step] = radius
+
+    def emit(self, event, x, y):
+        """Start the burst for event at (x, y); unknown events are ignored."""
+        spec = self.effects.get(event)
+        if spec is None:
+            return
+        _colour, _radius, count, speed, life, gravity, angle = spec
+        count = min(count, self.budget)
+        idx = (self.head + np.arange(count)) % self.budget
+        self.head = (self.head + count) % self.budget
+        self.evicted += int(np.count_nonzero(self.age[idx] < self.life[idx]))
+        rng = self.rng
+        theta = np.radians(rng.uniform(angle[0], angle[1], count))
+        v = rng.uniform(speed[0], speed[1], count)
+        self.x[idx] = x
+        self.y[idx] = y
+        self.vx[idx] = np.cos(theta) * v
+        self.vy[idx] = -np.sin(theta) * v
+        self.age[idx] = 0.0
+        self.life[idx] = rng.uniform(life[0], life[1], count)
+        self.gravity[idx] = gravity
+        self.kind[idx] = self.kinds[event]
+
+    def clear(self):
+        self.life[:] = 0.0
+        self.age[:] = 0.0
+
+    def update(self, dt_ms, scroll_pps=0.0):
+        """Move and age every particle; world particles drift left with the ground."""
+        if dt_ms <= 0:
+            return
+        dt = dt_ms / 1000.0
+        self.vy += self.gravity * dt
+        self.x += self.vx * dt - scroll_pps * dt
+        self.y += self.vy * dt
+        self.age += dt_ms
+
+    def live_count(self):
+        return int(np.count_nonzero(self.age < self.life))
+
+    def draw(self, graph, layer):
+        """Queue every live, on-screen particle on the render graph as one batch."""
+        live = np.flatnonzero((self.age < self.life)
+                              & (self.x > -8) & (self.x < graph.view_w + 8)
+                              & (self.y > -8) & (self.y < graph.view_h + 8))
+        if not len(live):
+            return
+        fade = np.minimum((self.age[live] / self.life[live] * FADE_STEPS).astype(np.int32), FADE_STEPS - 1)
+        sprite = self.kind[live] * FADE_STEPS + fade
+        off = self.offsets[sprite]
+        sprites = self.sprites
+        xs = (self.x[live] - off).astype(np.int32).tolist()
+        ys = (self.y[live] - off).astype(np.int32).tolist()
+        graph.add_batch(layer, [(sprites[s], (x, y)) for s, x, y in zip(sprite.tolist(), xs, ys)])
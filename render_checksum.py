@@ -0,0 +1,119 @@
+"""Deterministic render checksums, to prove a renderer change draws exactly the same pixels.
+
+    python render_checksum.py --out golden.txt                    # before the change
+    python render_checksum.py --out after.txt --golden golden.txt  # after it
+
+Runs the game under the SDL dummy drivers with a fixed seed, a fixed frame time and the
+autopilot playing, draws every frame with draw_frame() and hashes the screen's pixel buffer
+(through get_buffer(), no copy) every N frames. The hash sequence is written one
+"frame hash" line per checksum. With --golden the run stops at the first checksum that
+differs, saves that frame as a PNG next to --out and exits with status 1.
+"""
+import argparse
+import hashlib
+import importlib
+import os
+import sys
+
+
+def _load_game():
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    game = importlib.import_module("endlessrunner")
+    game.setup()
+    return game
+
+
+def screen_hash(surface):
+    """Hash of the surface's pixel bytes, read in place."""
+    buf = surface.get_buffer()
+    try:
+        with memoryview(buf) as view:
+            return hashlib.blake2b(view, digest_size=16).hexdigest()
+    finally:
+        del buf  # releases the surface lock
+
+
+def read_checksums(path):
+    sums = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip() and not line.startswith("#"):
+                frame, digest = line.split()
+                sums.append((int(frame), digest))
+    return sums
+
+
+def run(frames=1800, every=10, seed=1, profile="default", golden=None, out=None, log=print):
+    """Play `frames` frames and checksum every `every`th. Returns (checksums, first divergent frame or None)."""
+    game = _load_game()
+    if profile is not None and os.path.exists(game.CONFIG_FILE):
+        from config import ConfigProfiles
+        game.apply_config(ConfigProfiles(game.CONFIG_FILE, profile).values)
+    from autopilot import Autopilot
+
+    expected = dict(read_checksums(golden)) if golden else None
+    session = game.GameSession(seed)
+    if game.particles is not None:
+        session.listeners.append(game.particles.emit)
+    pilot = Autopilot(game)
+    dt = game.SIM_STEP_MS
+    runs = 0
+    sums = []
+    diverged = None
+    for frame in range(frames):
+        jump, move = pilot.decide(session)
+        if jump:
+            session.apply_jump()
+        if session.step(dt, move):
+            # deterministic restart: the next run's seed follows from the first
+            runs += 1
+            session.reset_run(seed + runs)
+            if game.particles is not None:
+                game.particles.clear()
+        game.draw_frame(session, dt)
+        if frame % every:
+            continue
+        digest = screen_hash(game.screen)
+        sums.append((frame, digest))
+        if expected is not None and frame in expected and expected[frame] != digest:
+            diverged = frame
+            if out:
+                shot = os.path.splitext(out)[0] + f"_frame{frame}.png"
+                game.pygame.image.save(game.screen, shot)
+                log(f"[checksum] saved the divergent frame as {shot}")
+            break
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            f.write(f"# seed {seed} profile {profile} every {every} size {game.WIDTH}x{game.HEIGHT}\n")
+            f.writelines(f"{frame} {digest}\n" for frame, digest in sums)
+    return sums, diverged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hash rendered frames of a seeded autopilot run")
+    parser.add_argument("--out", default="render_checksums.txt", help="file for the frame hashes")
+    parser.add_argument("--golden", help="compare against this earlier --out file")
+    parser.add_argument("--frames", type=int, default=1800, help="frames to render (default 30 s at 60 FPS)")
+    parser.add_argument("--every", type=int, default=10, metavar="N", help="hash every Nth frame")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--profile", default="default", help="tuning profile from profiles.json")
+    args = parser.parse_args(argv)
+
+    sums, diverged = run(args.frames, args.every, args.seed, args.profile, args.golden, args.out)
+    print(f"[checksum] {len(sums)} checksums written to {args.out}")
+    if args.golden is None:
+        return 0
+    if diverged is not None:
+        print(f"[checksum] first divergent frame: {diverged}")
+        return 1
+    golden_frames = len(read_checksums(args.golden))
+    if golden_frames != len(sums):
+        print(f"[checksum] frames match, but the golden run has {golden_frames} checksums and this one {len(sums)}")
+        return 1
+    print(f"[checksum] identical to {args.golden}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""Gym-style environment around the endlessrunner simulation, for training and stress-test bots.
+
+    env = RunnerEnv()
+    obs, info = env.reset(seed=1)
+    obs, reward, terminated, truncated, info = env.step(action)
+
+Actions are ints 0..5: (move, jump) = divmod(action, 2) with move 0/1/2 for left/none/right.
+Nothing is drawn; the game runs under the SDL dummy video driver. Pass profile= to run with a
+tuning profile from profiles.json (including its difficulty ramp).
+"""
+import importlib
+import multiprocessing as mp
+import os
+
+import numpy as np
+
+NUM_ACTIONS = 6
+K_PLATFORMS = 4   # upcoming platforms in the observation
+K_ARROWS = 3      # nearest arrows
+K_GOLDS = 3       # nearest golds
+PLAYER_FEATURES = 7
+OBS_SIZE = PLAYER_FEATURES + K_PLATFORMS * 3 + K_ARROWS * 4 + K_GOLDS * 2 + 3
+DEATH_REWARD = -10.0
+
+
+def _load_game():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    game = importlib.import_module("endlessrunner")
+    # the simulation only: no window, audio or score store in each worker
+    game.setup(window=False)
+    return game
+
+
+class RunnerEnv:
+    """One headless game session.
+
+    Each env owns a GameSession, so several can share a process (and its loaded assets);
+    use VectorEnv to spread them over CPU cores.
+    """
+
+    def __init__(self, max_steps=None, frame_ms=None, profile=None):
+        self.game = _load_game()
+        if profile is not None:
+            from config import ConfigProfiles
+            self.game.apply_config(ConfigProfiles(self.game.CONFIG_FILE, profile).values)
+        self.session = self.game.GameSession()
+        self.frame_ms = frame_ms if frame_ms is not None else 1000.0 / self.game.FPS
+        self.max_steps = max_steps
+        self.steps = 0
+        self.obs = np.zeros(OBS_SIZE, dtype=np.float32)
+
+    def reset(self, seed=None):
+        self.session.reset_run(seed)
+        self.steps = 0
+        self.observe(self.obs)
+        return self.obs, {"seed": self.session.run_seed}
+
+    def step(self, action):
+        s = self.session
+        move, jump = divmod(int(action), 2)
+        if jump:
+            s.apply_jump()
+        before = s.score
+        death = s.step(self.frame_ms, move - 1)
+        self.steps += 1
+        reward = float(s.score - before)
+        terminated = death is not None
+        if terminated:
+            reward += DEATH_REWARD
+        truncated = self.max_steps is not None and self.steps >= self.max_steps
+        self.observe(self.obs)
+        return self.obs, reward, terminated, truncated, {"score": s.score, "death": death}
+
+    def observe(self, out):
+        """Write the observation into `out` (float32 array of OBS_SIZE) in place."""
+        g = self.game
+        s = self.session
+        w, h = float(g.WIDTH), float(g.HEIGHT)
+        out[:] = 0.0
+        px = s.player_x + g.player_width / 2
+        py = s.player_y + g.player_height / 2
+        out[0:PLAYER_FEATURES] = (px / w, py / h, s.player_vel_x / 10.0, s.player_vel_y / 20.0,
+                                  s.on_ground, s.double_jump_available, s.double_jump_used)
+        i = PLAYER_FEATURES
+        # next platforms whose right edge is still ahead of the player
+        n = 0
+        for seg in s.ground_segments:
+            if n == K_PLATFORMS:
+                break
+            if seg[0] + seg[2] < s.player_x:
+                continue
+            out[i:i + 3] = ((seg[0] - px) / w, seg[1] / h, seg[2] / w)
+            i += 3
+            n += 1
+        i = PLAYER_FEATURES + K_PLATFORMS * 3
+        near = sorted(s.arrows, key=lambda a: (a['x'] - px) ** 2 + (a['y'] - py) ** 2)[:K_ARROWS]
+        for a in near:
+            out[i:i + 4] = ((a['x'] - px) / w, (a['y'] - py) / h, a['vx'] / g.ARROW_SPEED, a['vy'] / g.ARROW_SPEED)
+            i += 4
+        i = PLAYER_FEATURES + K_PLATFORMS * 3 + K_ARROWS * 4
+        near = sorted(s.golds, key=lambda c: abs(c['x'] - px))[:K_GOLDS]
+        for c in near:
+            out[i:i + 2] = ((c['x'] - px) / w, (c['y'] - py) / h)
+            i += 2
+        i = OBS_SIZE - 3
+        if s.pickup_spawned:
+            out[i:i + 3] = (1.0, (s.pickup_x - px) / w, (s.pickup_y - py) / h)
+        return out
+
+
+def _worker(remote, shm_name, num_envs, index, max_steps, profile, batch):
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(name=shm_name)
+    obs, traj, rewards, dones, actions = (view[index] for view in _shared_views(shm.buf, num_envs, batch))
+    env = RunnerEnv(max_steps=max_steps, profile=profile)
+    try:
+        while True:
+            cmd, arg = remote.recv()
+            if cmd == "reset":
+                env.reset(arg)
+                obs[:] = env.obs
+                remote.send(env.session.run_seed)
+            elif cmd == "step":
+                total = 0.0
+                done = False
+                info = None
+                # arg is a list of actions applied back to back (batched stepping)
+                for action in arg:
+                    _o, reward, terminated, truncated, info = env.step(action)
+                    total += reward
+                    if terminated or truncated:
+                        done = True
+                        info["final_score"] = info["score"]
+                        # auto-reset like gym vector envs; the next observation starts a new run
+                        env.reset(None)
+                        break
+                obs[:] = env.obs
+                remote.send((total, done, info))
+            elif cmd == "steps":
+                # arg steps with the actions in shared memory, every transition written back there;
+                # only the scores of the runs that ended go through the pipe
+                final_scores = []
+                for j in range(arg):
+                    _o, reward, terminated, truncated, info = env.step(actions[j])
+                    rewards[j] = reward
+                    dones[j] = terminated or truncated
+                    if dones[j]:
+                        final_scores.append(info["score"])
+                        env.reset(None)
+                    traj[j] = env.obs
+                obs[:] = env.obs
+                remote.send(final_scores)
+            elif cmd == "close":
+                break
+    finally:
+        del obs, traj, rewards, dones, actions
+        shm.close()
+        remote.close()
+
+
+def _shared_views(buf, num_envs, batch):
+    """Arrays over the VectorEnv shared block: latest obs, step_many observations, rewards,
+    done flags and actions."""
+    shapes = [((num_envs, OBS_SIZE), np.float32), ((num_envs, batch, OBS_SIZE), np.float32),
+              ((num_envs, batch), np.float32), ((num_envs, batch), np.bool_), ((num_envs, batch), np.uint8)]
+    views = []
+    offset = 0
+    for shape, dtype in shapes:
+        views.append(np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset))
+        offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+    return views
+
+
+def _shared_size(num_envs, batch):
+    return num_envs * (OBS_SIZE * 4 + batch * (OBS_SIZE * 4 + 4 + 1 + 1))
+
+
+class VectorEnv:
+    """Steps many RunnerEnv instances in worker processes.
+
+    Observations live in one shared-memory block (num_envs x OBS_SIZE float32), so workers write
+    them in place and only rewards/done flags go through the pipes. step() accepts one action per
+    env, or a sequence of actions per env to run several frames per round trip.
+
+    A pipe round trip costs far more than one simulation step, so step() with single actions is
+    slower than a plain RunnerEnv in one process. The workers only pay off with several cores
+    and several steps per round trip: step_many() runs up to `batch` steps per env per round
+    trip and returns every transition through shared memory. `python runner_env.py` compares
+    the three on this machine.
+    """
+
+    def __init__(self, num_envs, max_steps=None, profile=None, batch=32):
+        from multiprocessing import shared_memory
+        ctx = mp.get_context("spawn")
+        self.num_envs = num_envs
+        self.batch = batch
+        self._shm = shared_memory.SharedMemory(create=True, size=_shared_size(num_envs, batch))
+        self.obs, self._traj, self._rewards, self._dones, self._actions = _shared_views(self._shm.buf, num_envs, batch)
+        self._remotes = []
+        self._procs = []
+        for i in range(num_envs):
+            parent, child = ctx.Pipe()
+            p = ctx.Process(target=_worker, args=(child, self._shm.name, num_envs, i, max_steps, profile, batch),
+                            daemon=True)
+            p.start()
+            child.close()
+            self._remotes.append(parent)
+            self._procs.append(p)
+
+    def reset(self, seed=None):
+        for i, r in enumerate(self._remotes):
+            r.send(("reset", None if seed is None else seed + i))
+        seeds = [r.recv() for r in self._remotes]
+        return self.obs, {"seed": seeds}
+
+    def step(self, actions):
+        for r, a in zip(self._remotes, actions):
+            r.send(("step", list(a) if np.ndim(a) else [a]))
+        results = [r.recv() for r in self._remotes]
+        rewards = np.array([res[0] for res in results], dtype=np.float32)
+        dones = np.array([res[1] for res in results], dtype=bool)
+        infos = [res[2] for res in results]
+        return self.obs, rewards, dones, infos
+
+    def step_many(self, actions):
+        """Run k steps in every env with one round trip per worker; actions is (num_envs, k),
+        k <= batch. Returns (observations (num_envs, k, OBS_SIZE), rewards (num_envs, k),
+        dones (num_envs, k), final scores of the runs that ended, per env). A run that ends is
+        reset at once, so the observation at a done step is the first of the next run.
+        The arrays are views of shared memory, overwritten by the next call.
+        """
+        actions = np.asarray(actions)
+        k = actions.shape[1]
+        if k > self.batch:
+            raise ValueError(f"{k} steps per call, but the env was created with batch={self.batch}")
+        self._actions[:, :k] = actions
+        for r in self._remotes:
+            r.send(("steps", k))
+        scores = [r.recv() for r in self._remotes]
+        return self._traj[:, :k], self._rewards[:, :k], self._dones[:, :k], scores
+
+    def close(self):
+        for r in self._remotes:
+            try:
+                r.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for p in self._procs:
+            p.join(timeout=5)
+        del self.obs, self._traj, self._rewards, self._dones, self._actions
+        self._shm.close()
+        self._shm.unlink()
+
+
+def _benchmark(num_envs=4, rounds=200, k=32):
+    import time
+    rng = np.random.default_rng(0)
+    env = RunnerEnv()
+    env.reset(seed=0)
+    actions = rng.integers(NUM_ACTIONS, size=num_envs * rounds * 4).tolist()
+    t0 = time.perf_counter()
+    for action in actions:
+        _obs, _r, term, trunc, _info = env.step(action)
+        if term or trunc:
+            env.reset()
+    single = len(actions) / (time.perf_counter() - t0)
+    print(f"[env] {single:.0f} steps/s (single process)")
+
+    vec = VectorEnv(num_envs, batch=k)
+    try:
+        vec.reset(seed=0)
+        actions = rng.integers(NUM_ACTIONS, size=(rounds, num_envs))
+        t0 = time.perf_counter()
+        for a in actions:
+            vec.step(a)
+        per_step = num_envs * rounds / (time.perf_counter() - t0)
+        print(f"[env] {per_step:.0f} steps/s ({num_envs} workers, one step per round trip)")
+        actions = rng.integers(NUM_ACTIONS, size=(rounds, num_envs, k))
+        t0 = time.perf_counter()
+        for a in actions:
+            vec.step_many(a)
+        batched = num_envs * rounds * k / (time.perf_counter() - t0)
+        print(f"[env] {batched:.0f} steps/s ({num_envs} workers, {k} steps per round trip): "
+              f"{batched / per_step:.1f}x per-step, {batched / single:.2f}x single process "
+              f"on {os.cpu_count()} CPUs")
+    finally:
+        vec.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark RunnerEnv against VectorEnv")
+    parser.add_argument("--envs", type=int, default=4, help="VectorEnv workers")
+    parser.add_argument("--rounds", type=int, default=200, help="round trips per VectorEnv mode")
+    parser.add_argument("--batch", type=int, default=32, help="steps per round trip for step_many")
+    args = parser.parse_args()
+    _benchmark(args.envs, args.rounds, args.batch)
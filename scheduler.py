@@ -0,0 +1,47 @@
+import heapq
+import itertools
+
+
+class TimerScheduler:
+    """Run callbacks at simulation timestamps (milliseconds) from a priority queue.
+
+    Instead of bumping a counter every frame and comparing it to a threshold, code schedules
+    a callback for the time it should happen; advance(dt) then runs everything that became due.
+    Callbacks see `now` set to their own due time, so re-scheduling from inside a callback
+    does not accumulate frame jitter.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self._queue = []
+        # tie-breaker so events due at the same time run in scheduling order
+        self._seq = itertools.count()
+        # bumped by clear() so advance() stops if a callback resets the scheduler
+        self._generation = 0
+
+    def schedule_at(self, when, callback, *args):
+        """Schedule callback(*args) at absolute simulation time `when`."""
+        heapq.heappush(self._queue, (float(when), next(self._seq), callback, args))
+
+    def schedule_in(self, delay, callback, *args):
+        """Schedule callback(*args) `delay` milliseconds after the current simulation time."""
+        self.schedule_at(self.now + delay, callback, *args)
+
+    def clear(self, now=0.0):
+        """Drop all pending events and reset the clock."""
+        self._queue = []
+        self.now = float(now)
+        self._generation += 1
+
+    def advance(self, dt):
+        """Move the clock forward by dt milliseconds, running every event that becomes due."""
+        target = self.now + dt
+        generation = self._generation
+        queue = self._queue
+        while queue and queue[0][0] <= target:
+            when, _seq, callback, args = heapq.heappop(queue)
+            self.now = when
+            callback(*args)
+            if self._generation != generation:
+                return
+        self.now = target
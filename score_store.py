@@ -0,0 +1,102 @@
+import json
+import queue
+import threading
+import time
+
+from atomic_file import atomic_write_text
+
+
+class ScoreStore:
+    """Best score and a local top-N leaderboard kept in memory and persisted on a background thread.
+
+    - best_score.txt keeps its old format (a single integer) and is rewritten atomically.
+    - Every finished run is appended as one JSON line to the leaderboard log; once the log has
+      grown by `compact_every` lines it is rewritten (atomically) with only the top N runs.
+    Callers never touch the disk: record_run() only updates memory and queues the writes.
+    """
+
+    def __init__(self, best_path, log_path, top_n=10, compact_every=50):
+        self.best_path = best_path
+        self.log_path = log_path
+        self.top_n = top_n
+        self.compact_every = compact_every
+        self.best_score = self._read_best()
+        self.runs = []
+        self._log_lines = 0
+        self._load_log()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._writer, name="score-store", daemon=True)
+        self._thread.start()
+
+    def _read_best(self):
+        try:
+            with open(self.best_path, "r") as f:
+                return int(f.read().strip())
+        except Exception:
+            return 0
+
+    def _load_log(self):
+        try:
+            with open(self.log_path, "r") as f:
+                for line in f:
+                    try:
+                        self.runs.append(json.loads(line))
+                    except ValueError:
+                        # skip a torn last line from an interrupted append
+                        continue
+                    self._log_lines += 1
+        except OSError:
+            return
+        self.runs.sort(key=lambda r: r.get("score", 0), reverse=True)
+        del self.runs[self.top_n:]
+        if self.runs:
+            self.best_score = max(self.best_score, self.runs[0].get("score", 0))
+
+    def leaderboard(self):
+        """Top runs, best first (list of dicts with score, seed, duration_ms, time)."""
+        return list(self.runs)
+
+    def record_run(self, score, seed=None, duration_ms=0):
+        """Record a finished run and return the (possibly updated) best score. Never blocks on disk."""
+        run = {"score": int(score), "seed": seed, "duration_ms": int(duration_ms), "time": int(time.time())}
+        self.runs.append(run)
+        self.runs.sort(key=lambda r: r["score"], reverse=True)
+        del self.runs[self.top_n:]
+        self._queue.put(("append", json.dumps(run)))
+        self._log_lines += 1
+        if self._log_lines >= self.top_n + self.compact_every:
+            self._queue.put(("compact", [json.dumps(r) for r in self.runs]))
+            self._log_lines = len(self.runs)
+        if score > self.best_score:
+            self.best_score = int(score)
+            self._queue.put(("best", self.best_score))
+        return self.best_score
+
+    def write_file(self, path, data):
+        """Atomically replace path with data (str or bytes) on the writer thread."""
+        self._queue.put(("file", (path, data)))
+
+    def _writer(self):
+        while True:
+            op, arg = self._queue.get()
+            try:
+                if op == "stop":
+                    return
+                if op == "append":
+                    with open(self.log_path, "a") as f:
+                        f.write(arg + "\n")
+                elif op == "compact":
+                    atomic_write_text(self.log_path, "".join(line + "\n" for line in arg))
+                elif op == "best":
+                    atomic_write_text(self.best_path, str(arg))
+                elif op == "file":
+                    atomic_write_text(*arg)
+            except Exception as e:
+                print(f"[scores] Write failed ({op}): {e}")
+            finally:
+                self._queue.task_done()
+
+    def close(self, timeout=2.0):
+        """Flush pending writes and stop the writer thread (call once at exit)."""
+        self._queue.put(("stop", None))
+        self._thread.join(timeout)
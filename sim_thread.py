@@ -0,0 +1,69 @@
+"""Fixed-tick simulation on its own thread, publishing double-buffered snapshots.
+
+    sim = SimThread(tick, step_ms, clock=pygame.time.get_ticks)
+    sim.start(first_snapshot)
+    prev, cur = sim.latest()      # render thread: interpolate between the two
+    with sim.lock:                # anything else that touches the simulation
+        ...
+
+tick(tick_end_ms) advances the simulation by one step and returns an immutable snapshot of
+it. The thread keeps the two latest snapshots as one (previous, current) tuple and replaces
+that tuple with a single reference swap, so the renderer never sees a torn pair. The lock is
+held for the whole of each tick; the renderer only takes it to pause the simulation (death
+menus, config reloads). Blits release the GIL, so rendering overlaps the simulation; on a
+free-threaded build both threads run on their own core.
+"""
+import threading
+import time
+
+
+class SimThread:
+    def __init__(self, tick, step_ms, max_steps_behind=5, clock=None, name="simulation"):
+        self.tick = tick
+        self.step_ms = step_ms
+        self.max_steps_behind = max_steps_behind
+        self.clock = clock or (lambda: time.perf_counter() * 1000.0)
+        self.lock = threading.Lock()
+        self.ticks = 0
+        self._pair = (None, None)
+        self._next = 0.0  # wall time the simulation has caught up to
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self, snapshot):
+        self.resync(snapshot)
+        self._thread.start()
+
+    def latest(self):
+        """(previous, current) snapshots; previous is current right after a resync."""
+        return self._pair
+
+    def resync(self, snapshot):
+        """Restart from snapshot at the current wall time, without catching up on a pause.
+        Call with the lock held (or before start()).
+        """
+        self._next = float(self.clock())
+        self._pair = (snapshot, snapshot)
+
+    def _run(self):
+        step = self.step_ms
+        while not self._stop.is_set():
+            wait = self._next + step - self.clock()
+            if wait > 0:
+                time.sleep(wait / 1000.0)
+                continue
+            with self.lock:
+                now = self.clock()
+                # after a stall, drop the backlog instead of running many ticks back to back
+                if now - self._next > self.max_steps_behind * step:
+                    self._next = now - self.max_steps_behind * step
+                tick_end = self._next + step
+                snapshot = self.tick(tick_end)
+                self._next = tick_end
+                # published under the lock so a resync() can never be overwritten by a stale tick
+                self._pair = (self._pair[1], snapshot)
+                self.ticks += 1
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        self._thread.join(timeout)
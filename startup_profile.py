@@ -0,0 +1,58 @@
+"""Wall-time breakdown of game start-up, to track and budget time-to-menu.
+
+    startup = StartupProfiler()
+    with startup.phase("set_mode"):
+        screen = pygame.display.set_mode(...)
+    ...
+    startup.finish("menu")   # stops recording; later phase() calls are free
+    startup.report() / startup.write_json(path)
+
+Phases are recorded unconditionally (two perf_counter calls each); only printing the
+report is behind the --startup-profile flag.
+"""
+import json
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.phases = []  # (name, ms) in the order they ran
+        self.total_ms = None
+        self.finished_at = None
+
+    @contextmanager
+    def phase(self, name):
+        if self.finished_at is not None:
+            yield
+            return
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, (time.perf_counter() - t) * 1000.0))
+
+    def finish(self, label="menu"):
+        """Mark the end of start-up (e.g. the first menu frame) and stop recording."""
+        if self.finished_at is None:
+            self.finished_at = label
+            self.total_ms = (time.perf_counter() - self.started) * 1000.0
+        return self.total_ms
+
+    def report(self, log=print):
+        total = self.total_ms if self.total_ms is not None else (time.perf_counter() - self.started) * 1000.0
+        measured = sum(ms for _name, ms in self.phases)
+        log(f"[startup] time to {self.finished_at or 'now'}: {total:.1f} ms ({len(self.phases)} phases)")
+        for name, ms in sorted(self.phases, key=lambda p: p[1], reverse=True):
+            log(f"[startup] {ms:9.2f} ms {100.0 * ms / max(total, 1e-9):5.1f}%  {name}")
+        log(f"[startup] {total - measured:9.2f} ms {100.0 * (total - measured) / max(total, 1e-9):5.1f}%  (not in a phase)")
+
+    def write_json(self, path):
+        data = {
+            "until": self.finished_at,
+            "total_ms": self.total_ms,
+            "phases": [{"name": name, "ms": round(ms, 3)} for name, ms in self.phases],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
@@ -0,0 +1,103 @@
+"""Surface format normalization and blit-cost audit.
+
+Images are loaded with convert_alpha(), but per-pixel alpha blending is only needed where an
+image really has partial transparency. normalize() inspects the alpha channel once (with
+pygame.mask) and picks the cheapest blit path that draws the same pixels:
+
+- opaque: every pixel has alpha 255 -> convert(), a plain copy blit
+- colorkey: alpha is only ever 0 or 255 -> convert() onto an unused key colour, RLEACCEL
+- alpha: real partial transparency (smoothscaled edges, glows) -> kept as convert_alpha()
+
+Every normalized surface is registered under a name so audit() can log its final format and
+the measured cost of blitting it, next to what the per-pixel-alpha version would cost.
+"""
+import time
+
+import pygame
+
+# Key colours tried in order; the first one no opaque pixel uses is taken
+KEY_CANDIDATES = [(255, 0, 255), (0, 255, 255), (1, 254, 3), (254, 1, 253)]
+
+_registry = {}  # name -> (surface, kind)
+
+
+def classify(surf):
+    """'opaque', 'colorkey' (binary alpha) or 'alpha' for a surface with per-pixel alpha."""
+    if not surf.get_flags() & pygame.SRCALPHA:
+        return "colorkey" if surf.get_colorkey() is not None else "opaque"
+    w, h = surf.get_size()
+    solid = pygame.mask.from_surface(surf, 254).count()  # alpha == 255
+    if solid == w * h:
+        return "opaque"
+    visible = pygame.mask.from_surface(surf, 0).count()  # alpha > 0
+    return "colorkey" if visible == solid else "alpha"
+
+
+def _unused_key(surf):
+    solid = pygame.mask.from_surface(surf, 254)
+    for key in KEY_CANDIDATES:
+        same = pygame.mask.from_threshold(surf, key + (255,), (1, 1, 1, 255))
+        if not same.overlap_area(solid, (0, 0)):
+            return key
+    return None
+
+
+def normalize(surf, name=None):
+    """Return surf converted to the cheapest format that looks the same; registers it under name."""
+    if surf is None:
+        return None
+    kind = classify(surf)
+    out = surf
+    if kind == "opaque" and surf.get_flags() & pygame.SRCALPHA:
+        out = surf.convert()
+    elif kind == "colorkey" and surf.get_flags() & pygame.SRCALPHA:
+        key = _unused_key(surf)
+        if key is None:
+            kind = "alpha"
+        else:
+            out = pygame.Surface(surf.get_size()).convert()
+            out.fill(key)
+            out.blit(surf, (0, 0))
+            out.set_colorkey(key, pygame.RLEACCEL)
+    if name is not None:
+        _registry[name] = (out, kind)
+    return out
+
+
+def describe(surf):
+    flags = surf.get_flags()
+    parts = [f"{surf.get_bitsize()}bpp"]
+    if flags & pygame.SRCALPHA:
+        parts.append("per-pixel alpha")
+    if surf.get_colorkey() is not None:
+        parts.append("colorkey")
+    if flags & pygame.RLEACCEL:
+        parts.append("RLE")
+    elif flags & pygame.RLEACCELOK:
+        parts.append("RLE requested")
+    return ", ".join(parts)
+
+
+def _blit_us(surf, target, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        target.blit(surf, (0, 0))
+    return (time.perf_counter() - start) * 1e6 / repeat
+
+
+def audit(target_size, log=print, repeat=20):
+    """Log every registered surface's format and blit cost onto a display-format surface."""
+    target = pygame.Surface(target_size).convert()
+    total = total_alpha = 0.0
+    log(f"[surfaces] {'name':<28} {'kind':<8} {'size':>11}  {'format':<32} {'blit us':>8} {'as alpha':>9}")
+    for name, (surf, kind) in sorted(_registry.items()):
+        # warm-up blit: RLE surfaces are encoded on first use
+        target.blit(surf, (0, 0))
+        cost = _blit_us(surf, target, repeat)
+        alpha = surf.convert_alpha()
+        cost_alpha = _blit_us(alpha, target, repeat)
+        total += cost
+        total_alpha += cost_alpha
+        w, h = surf.get_size()
+        log(f"[surfaces] {name:<28} {kind:<8} {w:>5}x{h:<5}  {describe(surf):<32} {cost:8.1f} {cost_alpha:9.1f}")
+    log(f"[surfaces] {len(_registry)} surfaces: {total:.0f} us per blit of each, {total_alpha:.0f} us with per-pixel alpha")
@@ -0,0 +1,158 @@
+"""Compact binary run telemetry.
+
+The log is a 16-byte header followed by fixed-size 32-byte little-endian records, so an
+analyzer can memory-map it and index records directly (see telemetry_analyze.py):
+
+    RUN     one per finished run: cause of death, score, duration, golds, pickups,
+            where the player died and the frame-time stats of the run
+    SAMPLE  one per simulated second of a run: score, position, velocity, flags,
+            arrows/golds on screen and the frame-time stats of that second
+
+The game thread only packs records into a bytearray; full buffers and the tail at the end
+of each run are handed to a writer thread, so the game loop never touches the disk.
+"""
+import os
+import queue
+import struct
+import threading
+
+MAGIC = b"ERTL"
+VERSION = 1
+RECORD_SIZE = 32
+HEADER = struct.Struct("<4sHH8x")
+
+KIND_RUN = 1
+KIND_SAMPLE = 2
+CAUSES = ["quit", "arrow", "fall"]
+
+# kind, cause, score, run id, seed, duration ms, golds, pickups, death x, death y,
+# avg frame (1/100 ms), max frame (1/100 ms)
+RUN = struct.Struct("<BBHIIIHHhhHH4x")
+# kind, flags, score, run id, t ms, x, y, vel_y, arrows, golds, avg frame, max frame
+SAMPLE = struct.Struct("<BBHIIhhhBBHH8x")
+SAMPLE_ON_GROUND = 1
+SAMPLE_DOUBLE_JUMP = 2
+
+FLUSH_BYTES = 64 * RECORD_SIZE
+SAMPLE_MS = 1000
+
+
+def _clamp(v, lo, hi):
+    return lo if v < lo else hi if v > hi else int(v)
+
+
+def _centi_ms(ms):
+    return _clamp(round(ms * 100), 0, 0xFFFF)
+
+
+class _RunState:
+    __slots__ = ("run_id", "next_sample", "frames", "frame_sum", "frame_max", "win_frames", "win_sum", "win_max")
+
+    def __init__(self, run_id):
+        self.run_id = run_id
+        self.next_sample = SAMPLE_MS
+        self.frames = 0
+        self.frame_sum = 0.0
+        self.frame_max = 0.0
+        self.win_frames = 0
+        self.win_sum = 0.0
+        self.win_max = 0.0
+
+
+class TelemetryWriter:
+    """Append RUN and SAMPLE records for any number of sessions to one log file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.records = 0
+        self._buf = bytearray()
+        self._runs = {}  # session -> _RunState
+        self._next_run_id = 1
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._writer, name="telemetry", daemon=True)
+        self._thread.start()
+
+    # -- game thread -------------------------------------------------------------------
+    def _put(self, record):
+        self._buf += record
+        self.records += 1
+        if len(self._buf) >= FLUSH_BYTES:
+            self.flush()
+
+    def flush(self):
+        if self._buf:
+            self._queue.put(bytes(self._buf))
+            self._buf.clear()
+
+    def frame(self, work_ms):
+        """Frame time of the last rendered frame; counted for every running session."""
+        # a copy: with --threaded, runs are opened and closed on the simulation thread
+        for st in list(self._runs.values()):
+            st.frames += 1
+            st.frame_sum += work_ms
+            st.win_frames += 1
+            st.win_sum += work_ms
+            if work_ms > st.frame_max:
+                st.frame_max = work_ms
+            if work_ms > st.win_max:
+                st.win_max = work_ms
+
+    def tick(self, session):
+        """Call after each simulation tick; the first tick of a run opens it, and a SAMPLE is
+        written for every whole second of run time passed."""
+        st = self._runs.get(session)
+        if st is None:
+            st = self._runs[session] = _RunState(self._next_run_id)
+            self._next_run_id += 1
+        if session.scheduler.now < st.next_sample:
+            return
+        st.next_sample = session.scheduler.now - session.scheduler.now % SAMPLE_MS + SAMPLE_MS
+        flags = (SAMPLE_ON_GROUND if session.on_ground else 0) | (SAMPLE_DOUBLE_JUMP if session.double_jump_available else 0)
+        avg = st.win_sum / st.win_frames if st.win_frames else 0.0
+        self._put(SAMPLE.pack(KIND_SAMPLE, flags, _clamp(session.score, 0, 0xFFFF), st.run_id,
+                              _clamp(session.scheduler.now, 0, 0xFFFFFFFF),
+                              _clamp(session.player_x, -32768, 32767), _clamp(session.player_y, -32768, 32767),
+                              _clamp(session.player_vel_y, -32768, 32767),
+                              _clamp(len(session.arrows), 0, 255), _clamp(len(session.golds), 0, 255),
+                              _centi_ms(avg), _centi_ms(st.win_max)))
+        st.win_frames = 0
+        st.win_sum = 0.0
+        st.win_max = 0.0
+
+    def run_ended(self, session, cause):
+        """Write the RUN record ('arrow', 'fall' or 'quit') and hand the buffer to the writer."""
+        st = self._runs.pop(session, None)
+        if st is None:
+            return
+        avg = st.frame_sum / st.frames if st.frames else 0.0
+        self._put(RUN.pack(KIND_RUN, CAUSES.index(cause), _clamp(session.score, 0, 0xFFFF), st.run_id,
+                           session.run_seed & 0xFFFFFFFF, _clamp(session.scheduler.now, 0, 0xFFFFFFFF),
+                           _clamp(session.golds_collected, 0, 0xFFFF), _clamp(session.pickups_collected, 0, 0xFFFF),
+                           _clamp(session.player_x, -32768, 32767), _clamp(session.player_y, -32768, 32767),
+                           _centi_ms(avg), _centi_ms(st.frame_max)))
+        self.flush()
+
+    # -- writer thread -----------------------------------------------------------------
+    def _writer(self):
+        while True:
+            chunk = self._queue.get()
+            try:
+                if chunk is None:
+                    return
+                with open(self.path, "ab") as f:
+                    if f.tell() == 0:
+                        f.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE))
+                    f.write(chunk)
+            except OSError as e:
+                print(f"[telemetry] Write failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def close(self, timeout=2.0):
+        """End open runs as 'quit', flush and stop the writer thread."""
+        for session in list(self._runs):
+            self.run_ended(session, "quit")
+        self.flush()
+        self._queue.put(None)
+        self._thread.join(timeout)
+        print(f"[telemetry] {self.records} records appended to {os.path.basename(self.path)}")
@@ -0,0 +1,112 @@
+"""Aggregate a telemetry log written by telemetry.TelemetryWriter.
+
+    python telemetry_analyze.py [telemetry.bin] [--band 10] [--columns 12]
+
+The log is memory-mapped and viewed as numpy structured arrays, so thousands of runs are
+summarised without reading the file into Python objects: runs per cause of death, score
+distribution, deaths by score band, where on screen players die, and frame-time stats.
+"""
+import argparse
+import mmap
+import sys
+
+import numpy as np
+
+from telemetry import CAUSES, HEADER, KIND_RUN, KIND_SAMPLE, MAGIC, RECORD_SIZE, SAMPLE_ON_GROUND
+
+RUN_DTYPE = np.dtype([
+    ("kind", "u1"), ("cause", "u1"), ("score", "<u2"), ("run_id", "<u4"), ("seed", "<u4"),
+    ("duration_ms", "<u4"), ("golds", "<u2"), ("pickups", "<u2"), ("x", "<i2"), ("y", "<i2"),
+    ("frame_avg", "<u2"), ("frame_max", "<u2"), ("pad", "V4"),
+])
+SAMPLE_DTYPE = np.dtype([
+    ("kind", "u1"), ("flags", "u1"), ("score", "<u2"), ("run_id", "<u4"), ("t_ms", "<u4"),
+    ("x", "<i2"), ("y", "<i2"), ("vel_y", "<i2"), ("arrows", "u1"), ("golds", "u1"),
+    ("frame_avg", "<u2"), ("frame_max", "<u2"), ("pad", "V8"),
+])
+assert RUN_DTYPE.itemsize == SAMPLE_DTYPE.itemsize == RECORD_SIZE
+
+
+def load(path):
+    """(runs, samples) structured arrays backed by a read-only mapping of the log."""
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            raise SystemExit(f"{path}: empty telemetry log")
+    magic, version, record_size = HEADER.unpack_from(mm, 0)
+    if magic != MAGIC or record_size != RECORD_SIZE:
+        raise SystemExit(f"{path}: not a telemetry log (version {version}, record size {record_size})")
+    # a writer killed mid-chunk can leave a partial record at the end; ignore it
+    count = (len(mm) - HEADER.size) // RECORD_SIZE
+    kinds = np.frombuffer(mm, dtype="u1", count=count * RECORD_SIZE, offset=HEADER.size)[::RECORD_SIZE]
+    runs = np.frombuffer(mm, dtype=RUN_DTYPE, count=count, offset=HEADER.size)[kinds == KIND_RUN]
+    samples = np.frombuffer(mm, dtype=SAMPLE_DTYPE, count=count, offset=HEADER.size)[kinds == KIND_SAMPLE]
+    return runs, samples
+
+
+def _histogram(label, values, edges, width=40):
+    counts, _ = np.histogram(values, bins=edges)
+    top = max(int(counts.max()), 1) if len(counts) else 1
+    for lo, hi, n in zip(edges[:-1], edges[1:], counts):
+        print(f"  {label} {int(lo):>6}-{int(hi) - 1:<6} {int(n):>7}  {'#' * int(round(width * n / top))}")
+
+
+def report(runs, samples, band=10, columns=12, width=1920):
+    print(f"[telemetry] {len(runs)} runs, {len(samples)} per-second samples")
+    if not len(runs):
+        return
+    scores = runs["score"].astype(np.int64)
+    seconds = runs["duration_ms"] / 1000.0
+    print(f"score: mean {scores.mean():.1f}, median {np.median(scores):.0f}, "
+          f"p90 {np.percentile(scores, 90):.0f}, max {scores.max()}")
+    print(f"run length: mean {seconds.mean():.1f} s, max {seconds.max():.1f} s, {seconds.sum() / 3600:.2f} h in total")
+    print(f"golds: {runs['golds'].mean():.2f} per run; double-jump pickups: {runs['pickups'].mean():.2f} per run")
+
+    print("cause of death:")
+    for code, name in enumerate(CAUSES):
+        n = int((runs["cause"] == code).sum())
+        if n:
+            print(f"  {name:<6} {n:>7}  {100.0 * n / len(runs):5.1f}%  mean score {scores[runs['cause'] == code].mean():.1f}")
+
+    died = runs[runs["cause"] != CAUSES.index("quit")]
+    if len(died):
+        top = int(died["score"].max()) // band * band + band
+        edges = np.arange(0, top + band, band)
+        for code, name in enumerate(CAUSES):
+            sel = died[died["cause"] == code]
+            if len(sel):
+                print(f"deaths by score band ({name}):")
+                _histogram("score", sel["score"], edges)
+        # where the player was when the run ended, across the screen width
+        print("death x position (screen columns):")
+        _histogram("x", died["x"], np.linspace(0, width, columns + 1))
+
+    frame_avg = runs["frame_avg"] / 100.0
+    frame_max = runs["frame_max"] / 100.0
+    print(f"frame time per run: avg {frame_avg.mean():.2f} ms, worst run avg {frame_avg.max():.2f} ms, "
+          f"p99 of run max {np.percentile(frame_max, 99):.2f} ms, max {frame_max.max():.2f} ms")
+    if len(samples):
+        airborne = np.mean((samples["flags"] & SAMPLE_ON_GROUND) == 0) * 100
+        print(f"samples: {airborne:.0f}% airborne, arrows on screen mean {samples['arrows'].mean():.2f}, "
+              f"slowest second max frame {samples['frame_max'].max() / 100.0:.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarise a binary run telemetry log")
+    parser.add_argument("path", nargs="?", default="telemetry.bin")
+    parser.add_argument("--band", type=int, default=10, help="score band width for the death histograms")
+    parser.add_argument("--columns", type=int, default=12, help="screen columns for the death position histogram")
+    parser.add_argument("--width", type=int, default=1920, help="screen width the runs were played at")
+    args = parser.parse_args(argv)
+    try:
+        runs, samples = load(args.path)
+    except OSError as e:
+        print(f"[telemetry] {e}")
+        return 1
+    report(runs, samples, band=args.band, columns=args.columns, width=args.width)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
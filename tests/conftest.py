@@ -0,0 +1,30 @@
+import os
+import sys
+
+# headless: no real window or sound device for the game's setup()
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def game_assets():
+    """Load the game's assets once, without a window, before any test creates a session."""
+    import endlessrunner as game
+    game.setup(window=False)
+
+
+@pytest.fixture
+def restore_config():
+    """Put the game's tunables (and its difficulty ramp) back after a test that applies config."""
+    import endlessrunner as game
+    names = game.CONFIG_PHYSICS + game.CONFIG_TUNING + ("DIFFICULTY_RAMP",)
+    saved = {name: getattr(game, name) for name in names}
+    difficulty = game.difficulty
+    yield
+    for name, value in saved.items():
+        setattr(game, name, value)
+    game.difficulty = difficulty
+    game._jump_envelopes.clear()
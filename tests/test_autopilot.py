@@ -0,0 +1,25 @@
+import pytest
+
+import endlessrunner as game
+from autopilot import Autopilot
+from config import ConfigProfiles
+
+TARGET_SCORE = 100  # well past the arrows, which start at score 30 in the default profile
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3, 4])
+def test_seeded_run_reaches_target_score(restore_config, seed):
+    game.apply_config(ConfigProfiles(game.CONFIG_FILE, "default").values)
+    session = game.GameSession(seed)
+    pilot = Autopilot(game)
+    death = None
+    for _ in range(3 * 60 * game.FPS):
+        if session.score >= TARGET_SCORE:
+            break
+        jump, move = pilot.decide(session)
+        if jump:
+            session.apply_jump()
+        death = session.step(game.SIM_STEP_MS, move)
+        if death:
+            break
+    assert session.score >= TARGET_SCORE, f"seed {seed}: died by {death} at score {session.score}"
@@ -0,0 +1,66 @@
+import pytest
+
+import endlessrunner as game
+
+
+def test_wrong_type_value_is_skipped(restore_config):
+    gap_min = game.GAP_MIN
+    assert game.apply_config({"GAP_MIN": "abc"}) is False
+    assert game.GAP_MIN == gap_min
+
+
+def test_null_value_is_skipped(restore_config):
+    gold_max = game.GOLD_MAX_ACTIVE
+    assert game.apply_config({"GOLD_MAX_ACTIVE": None}) is False
+    assert game.GOLD_MAX_ACTIVE == gold_max
+
+
+def test_good_keys_apply_next_to_bad_ones(restore_config):
+    gap_min, arrow_speed = game.GAP_MIN, game.ARROW_SPEED
+    game.apply_config({"GAP_MIN": "abc", "ARROW_SPEED": arrow_speed + 1, "GOLD_MAX_ACTIVE": "7"})
+    assert game.GAP_MIN == gap_min
+    assert game.ARROW_SPEED == arrow_speed + 1
+    assert game.GOLD_MAX_ACTIVE == 7 and isinstance(game.GOLD_MAX_ACTIVE, int)
+
+
+@pytest.mark.parametrize("name, value", [
+    ("SCORE_TICK_MS", 0),
+    ("SCORE_TICK_MS", -5),
+    ("ARROW_SPAWN_MIN_MS", 0),
+    ("GOLD_SPAWN_MAX_MS", -100),
+    ("WIDTH", 0),
+    ("HEIGHT", -1080),
+    ("GOLD_TARGET_LONG", 0),
+])
+def test_out_of_range_value_is_skipped(restore_config, name, value):
+    before = getattr(game, name)
+    assert game.apply_config({name: value}) is False
+    assert getattr(game, name) == before
+
+
+def test_session_still_steps_after_a_zero_tick_is_rejected(restore_config):
+    game.apply_config({"SCORE_TICK_MS": 0})
+    session = game.GameSession(seed=1)
+    for _ in range(3):
+        session.step(game.SIM_STEP_MS)
+    assert game.SCORE_TICK_MS > 0
+
+
+@pytest.mark.parametrize("ramp", [
+    [[0, 1.0]],
+    {"GROUND_SCROLL_PPS": 5},
+    {"GROUND_SCROLL_PPS": [[0]]},
+    {"GROUND_SCROLL_PPS": {"by": "laps", "points": [[0, 1.0]]}},
+    {"GROUND_SCROLL_PPS": {"by": "score"}},
+    {"ARROW_SPAWN_MIN_MS": [[0, 1.0], [100, 0.0]]},
+])
+def test_bad_difficulty_ramp_keeps_the_old_one(restore_config, ramp):
+    before, difficulty = game.DIFFICULTY_RAMP, game.difficulty
+    game.apply_config({"DIFFICULTY_RAMP": ramp})
+    assert game.DIFFICULTY_RAMP is before
+    assert game.difficulty is difficulty
+
+
+def test_difficulty_ramp_applies(restore_config):
+    game.apply_config({"DIFFICULTY_RAMP": {"GROUND_SCROLL_PPS": [[0, 1.0], [10, 2.0]]}})
+    assert game.difficulty.factor("GROUND_SCROLL_PPS", 10, 0) == 2.0
@@ -0,0 +1,36 @@
+import numpy as np
+
+from runner_env import NUM_ACTIONS, OBS_SIZE, RunnerEnv, VectorEnv
+
+
+def test_step_many_matches_a_single_env():
+    actions = np.random.default_rng(3).integers(NUM_ACTIONS, size=(1, 400))
+    env = RunnerEnv()
+    env.reset(seed=5)
+    expected_obs, expected_rewards, expected_dones = [], [], []
+    for action in actions[0]:
+        obs, reward, terminated, truncated, _info = env.step(action)
+        if terminated or truncated:
+            obs, _info = env.reset(None)
+        expected_obs.append(obs.copy())
+        expected_rewards.append(reward)
+        expected_dones.append(terminated or truncated)
+
+    vec = VectorEnv(1, batch=100)
+    try:
+        vec.reset(seed=5)
+        got_obs, got_rewards, got_dones = [], [], []
+        for chunk in np.split(actions, 4, axis=1):
+            obs, rewards, dones, _scores = vec.step_many(chunk)
+            assert obs.shape == (1, 100, OBS_SIZE)
+            got_obs.append(obs[0].copy())
+            got_rewards.append(rewards[0].copy())
+            got_dones.append(dones[0].copy())
+        # the run after a death starts from a random seed in each process: compare up to it
+        end = expected_dones.index(True) + 1 if True in expected_dones else len(expected_dones)
+        np.testing.assert_array_equal(np.concatenate(got_dones)[:end], expected_dones[:end])
+        np.testing.assert_allclose(np.concatenate(got_rewards)[:end], expected_rewards[:end])
+        np.testing.assert_allclose(np.concatenate(got_obs)[:end - 1], np.array(expected_obs)[:end - 1])
+        np.testing.assert_array_equal(vec.obs[0], got_obs[-1][-1])
+    finally:
+        vec.close()